@@ -6,6 +6,8 @@ from logging.config import fileConfig
 from alembic import context
 from flask import current_app
 
+from techlock.compass.orm.tenancy import maintenance_engine
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -70,7 +72,8 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
-    connectable = current_app.extensions['migrate'].db.engine
+    # Once enabled, the row level security policies hide every row from the service's own role outside of requests.
+    connectable = maintenance_engine() or current_app.extensions['migrate'].db.engine
 
     with connectable.connect() as connection:
         context.configure(
@@ -0,0 +1,29 @@
+"""add compliance period schedule index
+
+Revision ID: 2f8d6c4a0e51
+Revises: 9a4e7b2c1d36
+Create Date: 2026-10-19 15:21:09.630284
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '2f8d6c4a0e51'
+down_revision = '9a4e7b2c1d36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ux_compliance_periods_schedule',
+        'compliance_periods',
+        ['compliance_id', 'task_id', 'start_date'],
+        unique=True,
+        postgresql_where=sa.text('is_active IS true'),
+    )
+
+
+def downgrade():
+    op.drop_index('ux_compliance_periods_schedule', table_name='compliance_periods')
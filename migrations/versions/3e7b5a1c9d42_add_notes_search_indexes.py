@@ -0,0 +1,47 @@
+"""add notes search indexes
+
+Revision ID: 3e7b5a1c9d42
+Revises: 6c1a9d3e8f24
+Create Date: 2026-10-19 19:48:21.604377
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3e7b5a1c9d42'
+down_revision = '6c1a9d3e8f24'
+branch_labels = None
+depends_on = None
+
+TABLES = ['comments', 'journals', 'summary_notes']
+
+# Has to stay the exact expression of `techlock.compass.services.search.note_document`.
+DOCUMENT = "to_tsvector('english'::regconfig, coalesce(name, '') || ' ' || coalesce(description, ''))"
+
+SCOPE_INDEXES = [
+    ('ix_comments_compliance_id', 'comments', 'compliance_id'),
+    ('ix_journals_compliance_id', 'journals', 'compliance_id'),
+    ('ix_summary_notes_audit_id', 'summary_notes', 'audit_id'),
+    ('ix_summary_notes_compliance_id', 'summary_notes', 'compliance_id'),
+]
+
+
+def upgrade():
+    for table in TABLES:
+        op.create_index(
+            f'ix_{table}_search',
+            table,
+            [sa.text(DOCUMENT)],
+            postgresql_using='gin',
+            postgresql_where=sa.text('is_active IS true'),
+        )
+    for name, table, column in SCOPE_INDEXES:
+        op.create_index(name, table, [column], postgresql_where=sa.text('is_active IS true'))
+
+
+def downgrade():
+    for name, table, _ in SCOPE_INDEXES:
+        op.drop_index(name, table_name=table)
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_search', table_name=table)
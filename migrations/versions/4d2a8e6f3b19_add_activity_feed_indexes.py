@@ -0,0 +1,40 @@
+"""add activity feed indexes
+
+Revision ID: 4d2a8e6f3b19
+Revises: 7b3e9f1d5a28
+Create Date: 2026-10-19 18:05:33.208164
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '4d2a8e6f3b19'
+down_revision = '7b3e9f1d5a28'
+branch_labels = None
+depends_on = None
+
+# Table and the column its activity is ordered by.
+TABLES = [
+    ('events', 'timestamp'),
+    ('comments', 'timestamp'),
+    ('journals', 'created_on'),
+    ('uploads', 'timestamp'),
+]
+
+
+def upgrade():
+    for table, timestamp in TABLES:
+        for scope in ('audit_id', 'compliance_period_id'):
+            op.create_index(
+                f'ix_{table}_{scope}_{timestamp}',
+                table,
+                [scope, timestamp, 'id'],
+                postgresql_where=sa.text('is_active IS true'),
+            )
+
+
+def downgrade():
+    for table, timestamp in TABLES:
+        for scope in ('audit_id', 'compliance_period_id'):
+            op.drop_index(f'ix_{table}_{scope}_{timestamp}', table_name=table)
@@ -0,0 +1,67 @@
+"""add tenant row level security
+
+Revision ID: 5c1f0e2a9b7d
+Revises: e808c2f17373
+Create Date: 2026-10-19 10:12:41.118503
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '5c1f0e2a9b7d'
+down_revision = 'e808c2f17373'
+branch_labels = None
+depends_on = None
+
+TABLES = [
+    'audits',
+    'audits_history',
+    'audits_timeline',
+    'audit_responses',
+    'audit_responses_history',
+    'comments',
+    'compliances',
+    'compliances_history',
+    'compliances_timeline',
+    'compliance_periods',
+    'compliance_responses',
+    'compliance_responses_history',
+    'compliance_tasks',
+    'details',
+    'events',
+    'journals',
+    'reports',
+    'report_instructions',
+    'report_nodes',
+    'report_versions',
+    'summary_notes',
+    'uploads',
+]
+
+# Rows of all tenants are visible while `app.tenant_id` is not set, for migrations and background jobs.
+TENANT_PREDICATE = (
+    "coalesce(current_setting('app.tenant_id', true), '') = '' "
+    "OR tenant_id = current_setting('app.tenant_id', true)"
+)
+
+
+def upgrade():
+    conn = op.get_bind()
+    for table in TABLES:
+        op.create_index(f'ix_{table}_tenant_id', table, ['tenant_id'])
+        conn.execute(f'ALTER TABLE {table} ENABLE ROW LEVEL SECURITY;')
+        # Apply the policy to the table owner as well, which is the role the service connects with.
+        conn.execute(f'ALTER TABLE {table} FORCE ROW LEVEL SECURITY;')
+        conn.execute(
+            f'CREATE POLICY tenant_isolation ON {table} '
+            f'USING ({TENANT_PREDICATE}) WITH CHECK ({TENANT_PREDICATE});',
+        )
+
+
+def downgrade():
+    conn = op.get_bind()
+    for table in TABLES:
+        conn.execute(f'DROP POLICY IF EXISTS tenant_isolation ON {table};')
+        conn.execute(f'ALTER TABLE {table} NO FORCE ROW LEVEL SECURITY;')
+        conn.execute(f'ALTER TABLE {table} DISABLE ROW LEVEL SECURITY;')
+        op.drop_index(f'ix_{table}_tenant_id', table_name=table)
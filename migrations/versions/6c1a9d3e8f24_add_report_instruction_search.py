@@ -0,0 +1,56 @@
+"""add report instruction search
+
+Revision ID: 6c1a9d3e8f24
+Revises: 4d2a8e6f3b19
+Create Date: 2026-10-19 19:12:47.530918
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '6c1a9d3e8f24'
+down_revision = '4d2a8e6f3b19'
+branch_labels = None
+depends_on = None
+
+# Postgres 11 has no generated columns, a trigger keeps `search_vector` up to date instead.
+# Number and name weigh more than the text, markdown characters are not part of any word.
+CREATE_FUNCTION = r"""
+CREATE FUNCTION report_instructions_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english'::regconfig, coalesce(NEW.number, '') || ' ' || coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, regexp_replace(coalesce(NEW.text, ''), '[*_`#>|]+', ' ', 'g')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+CREATE_TRIGGER = """
+CREATE TRIGGER report_instructions_search_vector
+BEFORE INSERT OR UPDATE OF number, name, text ON report_instructions
+FOR EACH ROW EXECUTE PROCEDURE report_instructions_search_vector()
+"""
+
+
+def upgrade():
+    op.add_column('report_instructions', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(CREATE_FUNCTION)
+    op.execute(CREATE_TRIGGER)
+    # Fires the trigger for the existing instructions.
+    op.execute('UPDATE report_instructions SET number = number')
+    op.create_index(
+        'ix_report_instructions_search_vector',
+        'report_instructions',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade():
+    op.drop_index('ix_report_instructions_search_vector', table_name='report_instructions')
+    op.execute('DROP TRIGGER report_instructions_search_vector ON report_instructions')
+    op.execute('DROP FUNCTION report_instructions_search_vector()')
+    op.drop_column('report_instructions', 'search_vector')
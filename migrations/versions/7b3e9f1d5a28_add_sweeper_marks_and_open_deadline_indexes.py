@@ -0,0 +1,51 @@
+"""add sweeper marks and open deadline indexes
+
+Revision ID: 7b3e9f1d5a28
+Revises: 2f8d6c4a0e51
+Create Date: 2026-10-19 16:47:52.915370
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '7b3e9f1d5a28'
+down_revision = '2f8d6c4a0e51'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'sweeper_marks',
+        sa.Column('sweep', sa.String(), nullable=False),
+        sa.Column('tenant_id', sa.String(), nullable=False),
+        sa.Column('high_water_mark', sa.Date(), nullable=False),
+        sa.Column('changed_on', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('sweep', 'tenant_id'),
+    )
+    op.create_index(
+        'ix_compliance_periods_open_end_date',
+        'compliance_periods',
+        ['tenant_id', 'end_date'],
+        postgresql_where=sa.text('is_active IS true'),
+    )
+    op.create_index(
+        'ix_compliance_responses_passed_period_id',
+        'compliance_responses',
+        ['period_id'],
+        postgresql_where=sa.text("is_active IS true AND status = 'passed'"),
+    )
+    op.create_index(
+        'ix_details_compliant_until',
+        'details',
+        ['tenant_id', 'compliant_until'],
+        postgresql_where=sa.text('is_active IS true AND compliant_until IS NOT NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_details_compliant_until', table_name='details')
+    op.drop_index('ix_compliance_responses_passed_period_id', table_name='compliance_responses')
+    op.drop_index('ix_compliance_periods_open_end_date', table_name='compliance_periods')
+    op.drop_table('sweeper_marks')
@@ -0,0 +1,59 @@
+"""add name trigram indexes
+
+Revision ID: 8f2c4d6a1b73
+Revises: 3e7b5a1c9d42
+Create Date: 2026-10-19 20:21:09.117482
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '8f2c4d6a1b73'
+down_revision = '3e7b5a1c9d42'
+branch_labels = None
+depends_on = None
+
+TABLES = [
+    'audit_responses',
+    'audit_responses_history',
+    'audits',
+    'audits_history',
+    'audits_timeline',
+    'comments',
+    'compliance_periods',
+    'compliance_responses',
+    'compliance_responses_history',
+    'compliance_tasks',
+    'compliances',
+    'compliances_history',
+    'compliances_timeline',
+    'details',
+    'events',
+    'journals',
+    'report_instructions',
+    'report_nodes',
+    'report_versions',
+    'reports',
+    'summary_notes',
+    'uploads',
+]
+
+
+def upgrade():
+    conn = op.get_bind()
+    conn.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm;')
+
+    for table in TABLES:
+        op.create_index(
+            f'ix_{table}_name_trgm',
+            table,
+            ['name'],
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+        )
+
+
+def downgrade():
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_name_trgm', table_name=table)
+    # The extension is left in place, other database objects may depend on it.
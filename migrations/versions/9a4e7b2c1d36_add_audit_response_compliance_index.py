@@ -0,0 +1,28 @@
+"""add audit response compliance index
+
+Revision ID: 9a4e7b2c1d36
+Revises: 5c1f0e2a9b7d
+Create Date: 2026-10-19 14:03:27.482917
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '9a4e7b2c1d36'
+down_revision = '5c1f0e2a9b7d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_audit_responses_audit_id_compliance',
+        'audit_responses',
+        ['audit_id', 'compliance'],
+        postgresql_where=sa.text('is_active IS true'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_audit_responses_audit_id_compliance', table_name='audit_responses')
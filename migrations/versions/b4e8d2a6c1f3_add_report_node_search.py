@@ -0,0 +1,55 @@
+"""add report node search
+
+Revision ID: b4e8d2a6c1f3
+Revises: 8f2c4d6a1b73
+Create Date: 2026-10-19 22:41:36.204117
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'b4e8d2a6c1f3'
+down_revision = '8f2c4d6a1b73'
+branch_labels = None
+depends_on = None
+
+# Same document as `report_instructions_search_vector`, nodes are searched together with instructions.
+CREATE_FUNCTION = r"""
+CREATE FUNCTION report_nodes_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english'::regconfig, coalesce(NEW.number, '') || ' ' || coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, regexp_replace(coalesce(NEW.text, ''), '[*_`#>|]+', ' ', 'g')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+CREATE_TRIGGER = """
+CREATE TRIGGER report_nodes_search_vector
+BEFORE INSERT OR UPDATE OF number, name, text ON report_nodes
+FOR EACH ROW EXECUTE PROCEDURE report_nodes_search_vector()
+"""
+
+
+def upgrade():
+    op.add_column('report_nodes', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(CREATE_FUNCTION)
+    op.execute(CREATE_TRIGGER)
+    # Fires the trigger for the existing nodes.
+    op.execute('UPDATE report_nodes SET number = number')
+    op.create_index(
+        'ix_report_nodes_search_vector',
+        'report_nodes',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade():
+    op.drop_index('ix_report_nodes_search_vector', table_name='report_nodes')
+    op.execute('DROP TRIGGER report_nodes_search_vector ON report_nodes')
+    op.execute('DROP FUNCTION report_nodes_search_vector()')
+    op.drop_column('report_nodes', 'search_vector')
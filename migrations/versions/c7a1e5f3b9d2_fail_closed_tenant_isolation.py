@@ -0,0 +1,67 @@
+"""fail closed tenant isolation
+
+Revision ID: c7a1e5f3b9d2
+Revises: b4e8d2a6c1f3
+Create Date: 2026-10-19 23:05:12.640291
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c7a1e5f3b9d2'
+down_revision = 'b4e8d2a6c1f3'
+branch_labels = None
+depends_on = None
+
+TABLES = [
+    'audits',
+    'audits_history',
+    'audits_timeline',
+    'audit_responses',
+    'audit_responses_history',
+    'comments',
+    'compliances',
+    'compliances_history',
+    'compliances_timeline',
+    'compliance_periods',
+    'compliance_responses',
+    'compliance_responses_history',
+    'compliance_tasks',
+    'details',
+    'events',
+    'journals',
+    'reports',
+    'report_instructions',
+    'report_nodes',
+    'report_versions',
+    'summary_notes',
+    'uploads',
+]
+
+# No rows are visible while `app.tenant_id` is not set.
+# Migrations and background jobs that work across tenants connect as a role with BYPASSRLS instead.
+TENANT_PREDICATE = "tenant_id = current_setting('app.tenant_id', true)"
+
+# The predicate of migration 5c1f0e2a9b7d, which allowed all rows without a tenant.
+PREVIOUS_TENANT_PREDICATE = (
+    "coalesce(current_setting('app.tenant_id', true), '') = '' "
+    "OR tenant_id = current_setting('app.tenant_id', true)"
+)
+
+
+def _replace_policies(predicate: str):
+    conn = op.get_bind()
+    for table in TABLES:
+        conn.execute(f'DROP POLICY tenant_isolation ON {table};')
+        conn.execute(
+            f'CREATE POLICY tenant_isolation ON {table} '
+            f'USING ({predicate}) WITH CHECK ({predicate});',
+        )
+
+
+def upgrade():
+    _replace_policies(TENANT_PREDICATE)
+
+
+def downgrade():
+    _replace_policies(PREVIOUS_TENANT_PREDICATE)
@@ -0,0 +1,54 @@
+"""make row level security opt in
+
+Revision ID: d5e2a8c4f1b6
+Revises: c7a1e5f3b9d2
+Create Date: 2026-10-20 09:14:52.318840
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd5e2a8c4f1b6'
+down_revision = 'c7a1e5f3b9d2'
+branch_labels = None
+depends_on = None
+
+TABLES = [
+    'audits',
+    'audits_history',
+    'audits_timeline',
+    'audit_responses',
+    'audit_responses_history',
+    'comments',
+    'compliances',
+    'compliances_history',
+    'compliances_timeline',
+    'compliance_periods',
+    'compliance_responses',
+    'compliance_responses_history',
+    'compliance_tasks',
+    'details',
+    'events',
+    'journals',
+    'reports',
+    'report_instructions',
+    'report_nodes',
+    'report_versions',
+    'summary_notes',
+    'uploads',
+]
+
+
+def upgrade():
+    # The policies stay defined, `flask row-level-security on` enables them for deployments with `ROW_LEVEL_SECURITY`.
+    conn = op.get_bind()
+    for table in TABLES:
+        conn.execute(f'ALTER TABLE {table} NO FORCE ROW LEVEL SECURITY;')
+        conn.execute(f'ALTER TABLE {table} DISABLE ROW LEVEL SECURITY;')
+
+
+def downgrade():
+    conn = op.get_bind()
+    for table in TABLES:
+        conn.execute(f'ALTER TABLE {table} ENABLE ROW LEVEL SECURITY;')
+        conn.execute(f'ALTER TABLE {table} FORCE ROW LEVEL SECURITY;')
@@ -0,0 +1,57 @@
+"""
+Compare response compression CPU time with the bandwidth it saves.
+
+    python scripts/bench_compression.py --rows 1000 --repeat 10
+
+Compresses a page of report instructions, built in memory, with every available encoding and a few levels.
+Transfer times assume the given link speeds, the total is compression plus transfer of the compressed body.
+"""
+import argparse
+import timeit
+
+from bench_serializers import build
+
+from techlock.compass.api import compile_schema, dumps
+from techlock.compass.api.compression import available_encodings, compressor
+from techlock.compass.models import ReportInstruction, ReportInstructionSchema
+
+LEVELS = {
+    'gzip': (1, 6, 9),
+    'br': (1, 4, 7),
+    'zstd': (1, 3, 9),
+}
+LINKS_MBIT = (10, 100, 1000)
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    c = compressor(encoding, level)
+    return c.compress(data) + c.finish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    rows = [build(ReportInstruction, index) for index in range(args.rows)]
+    body = dumps(compile_schema(ReportInstructionSchema(many=True))(rows))
+
+    links = ''.join(f'{f"{mbit} Mbit/s":>12}' for mbit in LINKS_MBIT)
+    print(f'{args.rows} report instructions, {len(body) / 1024:.0f} KiB of JSON')
+    print(f'{"encoding":<10} {"level":>5} {"size":>10} {"ratio":>6} {"cpu":>9}{links}')
+
+    def report(name, level, size, seconds):
+        totals = ''.join(f'{(seconds + size * 8 / (mbit * 1e6)) * 1000:>10.1f}ms' for mbit in LINKS_MBIT)
+        print(f'{name:<10} {level:>5} {size / 1024:>7.0f}KiB {len(body) / size:>6.1f} {seconds * 1000:>7.1f}ms{totals}')
+
+    report('identity', '-', len(body), 0.0)
+    for encoding in available_encodings():
+        for level in LEVELS[encoding]:
+            size = len(compress(body, encoding, level))
+            seconds = timeit.timeit(lambda: compress(body, encoding, level), number=args.repeat) / args.repeat
+            report(encoding, level, size, seconds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare Flask's default JSON encoding of a page of events with the compiled serializer and orjson.
+
+    python scripts/bench_json.py --rows 1000 --repeat 20
+
+Rows are built in memory, no database is needed.
+"""
+import argparse
+import json
+import timeit
+
+from bench_serializers import build
+from flask import Flask
+
+import techlock.compass.api.encoding as encoding
+from techlock.compass.api import compile_schema
+from techlock.compass.models import Event, EventSchema
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rows = [build(Event, index) for index in range(args.rows)]
+    schema = EventSchema(many=True)
+
+    app = Flask(__name__)
+    with app.app_context():
+        # What Flask's default jsonify does.
+        cases = {
+            'Schema.dump + json': lambda: app.response_class(
+                json.dumps(schema.dump(rows), sort_keys=True),
+                mimetype='application/json',
+            ),
+        }
+        if encoding.orjson is None:
+            print('orjson is not installed, only the json backend is measured.')
+
+        for backend in encoding.BACKENDS:
+            if backend == 'orjson' and encoding.orjson is None:
+                continue
+
+            encoding.init_json(app, backend=backend)
+            native = encoding.is_native()
+            cases[f'compiled + {backend}'] = (
+                lambda native=native: encoding.json_response(compile_schema(schema, native=native)(rows))
+            )
+
+        expected = json.loads(cases['Schema.dump + json']().get_data())
+        print(f'{args.rows} events, mean of {args.repeat} runs')
+        for name, case in cases.items():
+            assert json.loads(case().get_data()) == expected, name
+            seconds = timeit.timeit(case, number=args.repeat) / args.repeat
+            print(f'{name:<30} {seconds * 1000:>8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
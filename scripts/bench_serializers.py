@@ -0,0 +1,79 @@
+"""
+Compare marshmallow `Schema.dump` with the precompiled serializers.
+
+    python scripts/bench_serializers.py --rows 1000 --repeat 20
+
+Rows are built in memory, no database is needed.
+"""
+import argparse
+import datetime
+import timeit
+import uuid
+
+import sqlalchemy as sa
+import sqlalchemy.sql.sqltypes as st  # Prevent class name overlap.
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+import techlock.compass.models as models
+from techlock.compass.api import compile_schema
+
+
+def sample_value(column: sa.Column, index: int):
+    column_type = column.type
+    if isinstance(column_type, st.Enum) and column_type.enum_class is not None:
+        members = list(column_type.enum_class)
+        return members[index % len(members)]
+    if isinstance(column_type, UUID):
+        return str(uuid.UUID(int=index + 1))
+    if isinstance(column_type, JSONB):
+        return {'key': f'value-{index}'}
+    if isinstance(column_type, st.ARRAY):
+        return [f'item-{index}']
+    if isinstance(column_type, st.Boolean):
+        return index % 2 == 0
+    if isinstance(column_type, st.Integer):
+        return index
+    if isinstance(column_type, st.DateTime):
+        return datetime.datetime(2021, 1, 1) + datetime.timedelta(minutes=index)
+    if isinstance(column_type, st.Date):
+        return datetime.date(2021, 1, 1) + datetime.timedelta(days=index)
+    if isinstance(column_type, st.String):
+        return f'{column.key}-{index}'
+
+    return None
+
+
+def build(model, index: int, depth: int = 1):
+    obj = model()
+    for column in sa.inspect(model).columns:
+        setattr(obj, column.key, sample_value(column, index))
+
+    if depth > 0:
+        for relationship in sa.inspect(model).relationships:
+            related = build(relationship.mapper.class_, index, depth - 1)
+            setattr(obj, relationship.key, [related] if relationship.uselist else related)
+
+    return obj
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f'{"schema":<28} {"marshmallow":>12} {"compiled":>12} {"speedup":>8}')
+    for name in ('AuditResponse', 'Event', 'ReportInstruction', 'ReportNode'):
+        model = getattr(models, name)
+        schema = getattr(models, f'{name}Schema')(many=True)
+        rows = [build(model, index) for index in range(args.rows)]
+
+        assert compile_schema(schema)(rows) == schema.dump(rows)
+
+        baseline = timeit.timeit(lambda: schema.dump(rows), number=args.repeat) / args.repeat
+        compiled = timeit.timeit(lambda: compile_schema(schema)(rows), number=args.repeat) / args.repeat
+        print(f'{name + "Schema":<28} {baseline * 1000:>10.1f}ms {compiled * 1000:>10.1f}ms {baseline / compiled:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+from .batch import MAX_BATCH_GET_IDS, BatchGetResult, BatchGetSchema, batch_get, batch_get_schema
+from .caching import cache_control
+from .claims import CachedClaimSet, access_required, claim_criteria, resolve_claims, token_hash
+from .compression import DecompressRequestMiddleware, init_compression
+from .cursors import decode_cursor, encode_cursor
+from .encoding import JSONEncoder, dumps, init_json, is_native, isoformat, json_response
+from .etags import check_if_match, collection_etag, not_modified, resource_etag
+from .export import ExportQueryParametersSchema, export_response
+from .fieldsets import FieldSelectionSchema, field_selection_schema, fieldsets
+from .filters import (
+    FILTER_OPERATORS,
+    NAME_MATCH_MODES,
+    FilterParams,
+    FilterSchema,
+    NameMatchParams,
+    NameMatchSchema,
+    compile_filters,
+    escape_like,
+    ids_filter,
+    name_filter,
+)
+from .jwks import CachedRSAAlgorithm, JWKSCache, init_jwks_cache, token_expires_at
+from .serializers import compile_schema, dump
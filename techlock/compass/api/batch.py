@@ -0,0 +1,80 @@
+"""
+Batch reads by id.
+
+    GET /audits?ids=<id>,<id>,<id>
+    POST /report_instructions/batch_get  {"ids": ["<id>", "<id>", ...]}
+
+Both read all objects with a single `WHERE id = ANY(:ids)` query, filtered by tenant and claims like the list
+endpoints, instead of one request per object. GET is limited by the length of the URL, POST takes up to
+`MAX_BATCH_GET_IDS` ids. `batch_get` returns the objects in the order of the ids, ids that don't exist,
+or that the caller may not read, are returned as `missing`.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, List, Sequence, Type
+
+import marshmallow as ma
+import marshmallow.fields as mf
+from techlock.common.api.auth.claim import ClaimSet
+from techlock.common.config import AuthInfo
+
+from ..orm.scoping import scoped_query
+from .filters import ids_filter
+
+__all__ = [
+    'MAX_BATCH_GET_IDS',
+    'BatchGetResult',
+    'BatchGetSchema',
+    'batch_get',
+    'batch_get_schema',
+]
+
+MAX_BATCH_GET_IDS = 1000
+
+
+class BatchGetSchema(ma.Schema):
+    ids = mf.List(
+        mf.UUID(),
+        required=True,
+        validate=ma.validate.Length(min=1, max=MAX_BATCH_GET_IDS),
+        description='Ids of the objects to return.',
+    )
+
+
+@dataclass
+class BatchGetResult:
+    items: List[Any]
+    missing: List[str]
+
+
+@lru_cache(maxsize=None)
+def batch_get_schema(schema_cls: Type[ma.Schema]) -> Type[ma.Schema]:
+    """
+    Generate the response schema of a batch get of `schema_cls` objects.
+    """
+    name = schema_cls.__name__.replace('Schema', 'BatchGetResultSchema')
+
+    return type(name, (ma.Schema,), {
+        'items': mf.Nested(schema_cls, many=True, dump_only=True),
+        'missing': mf.List(
+            mf.String(),
+            dump_only=True,
+            description='Requested ids that do not exist or can not be read.',
+        ),
+    })
+
+
+def batch_get(model, current_user: AuthInfo, claims: ClaimSet, ids: Sequence) -> BatchGetResult:
+    """
+    Returns the `model` objects with `ids` that `current_user` may read, in the order of `ids`.
+    """
+    ids = list(dict.fromkeys(str(id) for id in ids))
+    found = {
+        str(obj.id): obj
+        for obj in scoped_query(model, current_user, claims, additional_filters=[ids_filter(model, ids)])
+    }
+
+    return BatchGetResult(
+        items=[found[id] for id in ids if id in found],
+        missing=[id for id in ids if id not in found],
+    )
@@ -0,0 +1,69 @@
+"""
+HTTP cache headers.
+
+Framework content, reports, report versions, report nodes and report instructions,
+rarely changes after a version is imported. Their read routes can be cached by browsers and reverse proxies for
+`FRAMEWORK_CACHE_MAX_AGE`, and are revalidated with their ETags afterwards.
+
+Responses depend on the caller's token, so they are `private` by default.
+Set `CACHE_CONTROL_SCOPE=public` when a shared cache in front of the service keys on the Authorization header,
+`Vary: Authorization` is always sent.
+"""
+import functools
+
+from environs import Env
+from flask import Response, after_this_request
+
+__all__ = [
+    'SCOPES',
+    'cache_control',
+]
+
+SCOPES = ('private', 'public')
+
+
+def _scope() -> str:
+    scope = Env().str('CACHE_CONTROL_SCOPE', 'private').lower()
+    if scope not in SCOPES:
+        raise ValueError(f'Invalid CACHE_CONTROL_SCOPE: {scope}. Allowed values: {SCOPES}')
+
+    return scope
+
+
+def _framework_max_age() -> int:
+    return Env().int('FRAMEWORK_CACHE_MAX_AGE', 3600)
+
+
+def cache_control(max_age: int = None):
+    """
+    Add Cache-Control headers to successful responses of the decorated view.
+
+    Args:
+        max_age: Seconds the response may be reused for, defaults to `FRAMEWORK_CACHE_MAX_AGE`.
+
+    Example:
+        @access_required('read', claim_spec=claim_spec)
+        @blp.response(status_code=200)
+        @cache_control()
+        def get(self, version_uuid: UUID, current_user: AuthInfo, claims: ClaimSet):
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            @after_this_request
+            def add_cache_control(response: Response):
+                if response.status_code not in (200, 304):
+                    return response
+
+                seconds = max_age if max_age is not None else _framework_max_age()
+
+                response.headers['Cache-Control'] = f'{_scope()}, max-age={seconds}'
+                response.vary.add('Authorization')
+
+                return response
+
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
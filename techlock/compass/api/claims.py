@@ -0,0 +1,197 @@
+"""
+Cached claim evaluation.
+
+`access_required` wraps `techlock.common.api.auth.access_required`.
+The ClaimSet it passes to the view remembers the results of `filter_by_action`,
+for the rest of the request and, keyed by a hash of the token, for later requests with the same token.
+Claims only depend on the token, which can not change, cached results expire with the token,
+or after `CLAIM_CACHE_TTL` seconds, whichever comes first.
+Views that read other resources than their own get the claims for those with `resolve_claims`,
+and the criteria of every kind they read with `claim_criteria`.
+
+The time spent authenticating and resolving claims is exported as `compass_claim_resolution_seconds`.
+"""
+import copy
+import functools
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Union
+
+from flask import g, has_request_context, request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt import InvalidTokenError
+from prometheus_client import Counter, Histogram
+from techlock.common.api.auth import access_required as _access_required
+from techlock.common.api.auth.claim import ClaimSet
+from techlock.common.config import AuthInfo
+from techlock.common.orm.sqlalchemy import db
+from werkzeug.exceptions import HTTPException
+
+from ..cache import LRUCache
+from ..orm.scoping import scope_criteria
+from ..orm.tenancy import tenant_context
+from .jwks import token_expires_at
+
+__all__ = [
+    'CachedClaimSet',
+    'access_required',
+    'claim_criteria',
+    'resolve_claims',
+    'token_hash',
+]
+
+logger = logging.getLogger(__name__)
+
+CLAIM_RESOLUTION_SECONDS = Histogram(
+    'compass_claim_resolution_seconds',
+    'Time spent authenticating the request and resolving its claims.',
+    ['resource'],
+)
+CLAIM_CACHE = Counter(
+    'compass_claim_cache_total',
+    'Lookups of filtered ClaimSets in the per token cache.',
+    ['result'],
+)
+
+# Upper bound on how long filtered claims are cached, tokens without `exp` are cached this long.
+CLAIM_CACHE_TTL = 300
+
+_filtered_claims = LRUCache(maxsize=4096)
+
+
+def token_hash() -> Optional[str]:
+    """
+    Returns a hash of the request's Authorization header, `None` outside of requests or without a header.
+    """
+    if not has_request_context():
+        return None
+
+    authorization = request.headers.get('Authorization')
+    if not authorization:
+        return None
+
+    return hashlib.sha256(authorization.encode('utf-8')).hexdigest()
+
+
+def _cache_expires_at() -> float:
+    expires_at = time.time() + CLAIM_CACHE_TTL
+    if not has_request_context():
+        return expires_at
+
+    token = request.headers.get('Authorization', '').rpartition(' ')[2]
+    exp = token_expires_at(token.encode('utf-8'))
+    return min(expires_at, exp) if exp is not None else expires_at
+
+
+class CachedClaimSet(ClaimSet):
+    """
+    ClaimSet that caches the result of `filter_by_action`.
+    `cache_key` identifies the token, the resource and the filters applied so far.
+    """
+    cache_key: Optional[Hashable] = None
+
+    @classmethod
+    def wrap(cls, claims: ClaimSet, cache_key: Optional[Hashable]) -> ClaimSet:
+        try:
+            cached = copy.copy(claims)
+            cached.__class__ = cls
+            cached.cache_key = cache_key
+        except (TypeError, AttributeError):
+            logger.debug('ClaimSet can not be cached', exc_info=True)
+            return claims
+
+        cached._filtered = {}
+        return cached
+
+    def filter_by_action(self, action):
+        action_key = tuple(action) if isinstance(action, (list, tuple)) else action
+        filtered = self._filtered.get(action_key)
+        if filtered is not None:
+            return filtered
+
+        key = None if self.cache_key is None else (self.cache_key, action_key)
+        filtered = _filtered_claims.get(key) if key is not None else None
+        if filtered is None:
+            if key is not None:
+                CLAIM_CACHE.labels('miss').inc()
+            filtered = CachedClaimSet.wrap(super().filter_by_action(action), key)
+            if key is not None:
+                _filtered_claims.set(key, filtered, expires_at=_cache_expires_at())
+        else:
+            CLAIM_CACHE.labels('hit').inc()
+
+        self._filtered[action_key] = filtered
+        return filtered
+
+
+def access_required(actions: Union[str, List[str]], claim_spec=None, **kwargs):
+    """
+    Same as `techlock.common.api.auth.access_required`, the `claims` passed to the view cache `filter_by_action`.
+    Queries of the view are scoped to the user's tenant in row level security mode.
+    """
+    resource = getattr(claim_spec, 'resource_name', None) or ''
+    actions_key = tuple(actions) if isinstance(actions, (list, tuple)) else actions
+
+    def decorator(func):
+        @functools.wraps(func)
+        def resolved(*args, claims: ClaimSet, **view_kwargs):
+            started = g.pop('compass_access_started', None)
+            if started is not None:
+                CLAIM_RESOLUTION_SECONDS.labels(resource).observe(time.perf_counter() - started)
+
+            token = token_hash()
+            cache_key = None if token is None else (token, resource, actions_key)
+            tenant_id = getattr(view_kwargs.get('current_user'), 'tenant_id', None)
+            with tenant_context(tenant_id, db.session):
+                return func(*args, claims=CachedClaimSet.wrap(claims, cache_key), **view_kwargs)
+
+        protected = _access_required(actions, claim_spec=claim_spec, **kwargs)(resolved)
+
+        @functools.wraps(protected)
+        def wrapper(*args, **view_kwargs):
+            g.compass_access_started = time.perf_counter()
+            return protected(*args, **view_kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def resolve_claims(claim_spec, actions: Union[str, List[str]] = 'read') -> Optional[ClaimSet]:
+    """
+    The request token's claims for `claim_spec`, checked and cached like `access_required` does for a view.
+    For views that read other resources than their own. Returns `None` when the token has no access,
+    any other error is raised.
+    """
+    @access_required(actions, claim_spec=claim_spec)
+    def resolve(current_user: AuthInfo, claims: ClaimSet):
+        return claims
+
+    try:
+        return resolve()
+    except (HTTPException, JWTExtendedException, InvalidTokenError):
+        # Denied access is aborted with a 401 or 403, invalid tokens raise their own errors.
+        logger.info('No access', extra={'resource': claim_spec.resource_name, 'actions': actions}, exc_info=True)
+        return None
+
+
+def claim_criteria(
+    current_user: AuthInfo,
+    models: Dict[str, Any],
+    claim_specs: Dict[str, Any],
+    kinds: Iterable[str] = None,
+    actions: Union[str, List[str]] = 'read',
+) -> Dict[str, Any]:
+    """
+    Claim criteria, see `scope_criteria`, of every kind of `models` the user has access to, all kinds by default.
+    Each kind is filtered like its own list endpoint, with the claims of its spec in `claim_specs`.
+    Kinds the user has no access to are left out.
+    """
+    criteria = {}
+    for kind in models if kinds is None else kinds:
+        claims = resolve_claims(claim_specs[kind], actions)
+        if claims is not None:
+            criteria[kind] = scope_criteria(models[kind], current_user, claims)
+
+    return criteria
@@ -0,0 +1,247 @@
+"""
+Compression of response and request bodies.
+
+Responses are compressed with the best encoding the client accepts, zstd, br or gzip,
+once they are larger than `COMPRESSION_MIN_SIZE` bytes. Streamed responses, like exports, are compressed chunk by chunk.
+brotli and zstd are only offered when the `brotli` and `zstandard` packages are installed.
+
+Request bodies sent with `Content-Encoding: gzip` are decompressed before they reach the views,
+up to `MAX_DECOMPRESSED_REQUEST_SIZE` bytes.
+
+Bytes in and out, and the time spent compressing, are exported as prometheus metrics per encoding,
+`scripts/bench_compression.py` compares the encodings offline.
+"""
+import gzip
+import io
+import logging
+import time
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+
+from environs import Env
+from flask import Flask, Response, request
+from prometheus_client import Counter, Histogram
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+__all__ = [
+    'DecompressRequestMiddleware',
+    'available_encodings',
+    'compressor',
+    'init_compression',
+]
+
+logger = logging.getLogger(__name__)
+
+# Default compression levels, chosen for throughput over ratio.
+LEVELS = {
+    'zstd': 3,
+    'br': 4,
+    'gzip': 6,
+}
+
+COMPRESSION_BYTES = Counter(
+    'compass_compression_bytes_total',
+    'Response bytes before (in) and after (out) compression.',
+    ['encoding', 'direction'],
+)
+COMPRESSION_SECONDS = Histogram(
+    'compass_compression_seconds',
+    'Time spent compressing a response.',
+    ['encoding'],
+)
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_encodings() -> Dict[str, Callable]:
+    """
+    Returns the supported encodings, in order of preference.
+    """
+    encodings = {}
+    if zstandard is not None:
+        encodings['zstd'] = _ZstdCompressor
+    if brotli is not None:
+        encodings['br'] = _BrotliCompressor
+    encodings['gzip'] = _GzipCompressor
+
+    return encodings
+
+
+def compressor(encoding: str, level: int = None):
+    """
+    Returns an incremental compressor for `encoding`, with `compress(data)`, `flush()` and `finish()` methods.
+    """
+    return available_encodings()[encoding](level if level is not None else LEVELS[encoding])
+
+
+def _compress_stream(chunks: Iterable[bytes], encoding: str, level: int) -> Iterator[bytes]:
+    compress = compressor(encoding, level)
+    size_in = size_out = 0
+    elapsed = 0.0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            start = time.perf_counter()
+            # Flush after every chunk, so clients receive streamed rows as they are produced.
+            data = compress.compress(chunk) + compress.flush()
+            elapsed += time.perf_counter() - start
+            size_in += len(chunk)
+            size_out += len(data)
+            if data:
+                yield data
+
+        data = compress.finish()
+        size_out += len(data)
+        yield data
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+        COMPRESSION_BYTES.labels(encoding, 'in').inc(size_in)
+        COMPRESSION_BYTES.labels(encoding, 'out').inc(size_out)
+        COMPRESSION_SECONDS.labels(encoding).observe(elapsed)
+
+
+def _compress(data: bytes, encoding: str, level: int) -> bytes:
+    start = time.perf_counter()
+    compress = compressor(encoding, level)
+    compressed = compress.compress(data) + compress.finish()
+    COMPRESSION_SECONDS.labels(encoding).observe(time.perf_counter() - start)
+    COMPRESSION_BYTES.labels(encoding, 'in').inc(len(data))
+    COMPRESSION_BYTES.labels(encoding, 'out').inc(len(compressed))
+
+    return compressed
+
+
+class DecompressRequestMiddleware:
+    """
+    WSGI middleware that decompresses gzip encoded request bodies.
+    """
+
+    def __init__(self, wsgi_app, max_size: int):
+        self.wsgi_app = wsgi_app
+        self.max_size = max_size
+
+    def __call__(self, environ, start_response):
+        if environ.get('HTTP_CONTENT_ENCODING', '').strip().lower() != 'gzip':
+            return self.wsgi_app(environ, start_response)
+
+        try:
+            with gzip.GzipFile(fileobj=environ['wsgi.input'], mode='rb') as f:
+                body = f.read(self.max_size + 1)
+        except (OSError, EOFError, zlib.error):
+            return BadRequest('Invalid gzip request body.')(environ, start_response)
+        if len(body) > self.max_size:
+            return RequestEntityTooLarge(
+                f'Decompressed request body is larger than {self.max_size} bytes.',
+            )(environ, start_response)
+
+        environ['wsgi.input'] = io.BytesIO(body)
+        environ['CONTENT_LENGTH'] = str(len(body))
+        del environ['HTTP_CONTENT_ENCODING']
+
+        return self.wsgi_app(environ, start_response)
+
+
+def _settings() -> Tuple[int, Dict[str, int], int]:
+    env = Env()
+    min_size = env.int('COMPRESSION_MIN_SIZE', 1024)
+    levels = {
+        'zstd': env.int('COMPRESSION_ZSTD_LEVEL', LEVELS['zstd']),
+        'br': env.int('COMPRESSION_BROTLI_LEVEL', LEVELS['br']),
+        'gzip': env.int('COMPRESSION_GZIP_LEVEL', LEVELS['gzip']),
+    }
+    max_request_size = env.int('MAX_DECOMPRESSED_REQUEST_SIZE', 50 * 1024 * 1024)
+
+    return min_size, levels, max_request_size
+
+
+def init_compression(app: Flask, enabled: bool = None):
+    if enabled is None:
+        enabled = Env().bool('COMPRESSION_ENABLED', True)
+    if not enabled:
+        return
+
+    min_size, levels, max_request_size = _settings()
+    encodings = list(available_encodings())
+    logger.info('Compression enabled', extra={'encodings': encodings, 'min_size': min_size})
+
+    app.wsgi_app = DecompressRequestMiddleware(app.wsgi_app, max_request_size)
+
+    @app.after_request
+    def compress_response(response: Response):
+        response.vary.add('Accept-Encoding')
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or 'Content-Encoding' in response.headers
+            or response.direct_passthrough
+            or request.method == 'HEAD'
+        ):
+            return response
+
+        encoding = request.accept_encodings.best_match(encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, encoding, levels[encoding])
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(_compress(data, encoding, levels[encoding]))
+
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,43 @@
+"""
+Keyset pagination cursors.
+
+A cursor holds the sort key of the last item of a page, like its (timestamp, id), the next page continues
+right after it. Cursors are opaque to clients, the values are encoded as URL safe base64 JSON.
+
+    next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+    timestamp, id = decode_cursor(cursor, datetime.fromisoformat, uuid.UUID)
+"""
+import base64
+import datetime
+import json
+from typing import Any, Callable, Tuple
+
+from techlock.common.api import BadRequestException
+
+__all__ = [
+    'decode_cursor',
+    'encode_cursor',
+]
+
+
+def encode_cursor(*values: Any) -> str:
+    data = json.dumps(
+        [value.isoformat() if isinstance(value, datetime.date) else str(value) for value in values],
+        separators=(',', ':'),
+    )
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> Tuple:
+    """
+    Returns the values of `cursor`, each converted by the parser at its position.
+    Raises `BadRequestException` when the cursor was not made by `encode_cursor` with as many values.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError('Unexpected number of values.')
+
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (ValueError, TypeError, ArithmeticError):
+        raise BadRequestException('Invalid cursor.')
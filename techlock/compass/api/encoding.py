@@ -0,0 +1,153 @@
+"""
+JSON encoding of API responses.
+
+Uses orjson when it is installed, which is several times faster than the standard library encoder,
+and falls back to the standard library otherwise.
+Both backends encode date, datetime, UUID and Enum values natively, so serializers don't have to convert them first.
+
+`init_json` makes `jsonify`, and with that every blueprint response, use the selected backend.
+"""
+import datetime
+import enum
+import json
+import logging
+import uuid
+from typing import Any, Dict, Optional, Union
+
+from environs import Env
+from flask import Flask, Response, current_app
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:  # Flask < 2.2
+    DefaultJSONProvider = None
+
+__all__ = [
+    'BACKENDS',
+    'JSONEncoder',
+    'dumps',
+    'init_json',
+    'is_native',
+    'isoformat',
+    'json_response',
+]
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('orjson', 'json')
+
+_backend = 'orjson' if orjson is not None else 'json'
+
+
+def _default(obj):
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        # Same as orjson.
+        return obj.value
+
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class JSONEncoder(json.JSONEncoder):
+    def default(self, obj):
+        return _default(obj)
+
+
+def is_native() -> bool:
+    """
+    Returns true if the active backend is orjson, which encodes dates and datetimes faster than Python can convert them.
+    """
+    return _backend == 'orjson'
+
+
+def isoformat(value: Optional[Union[datetime.date, datetime.datetime]]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    if _backend == 'orjson':
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except orjson.JSONEncodeError:
+            # For example integers larger than 64 bit, the standard library has no such limits.
+            logger.debug('orjson could not encode response, falling back to json', exc_info=True)
+
+    return json.dumps(obj, cls=JSONEncoder, sort_keys=sort_keys, separators=(',', ':')).encode('utf-8')
+
+
+def _sort_keys() -> bool:
+    json_provider = getattr(current_app, 'json', None)
+    if DefaultJSONProvider is not None and isinstance(json_provider, DefaultJSONProvider):
+        return json_provider.sort_keys
+
+    return current_app.config.get('JSON_SORT_KEYS', True)
+
+
+def json_response(data: Any, status: int = 200, headers: Dict[str, str] = None) -> Response:
+    """
+    Like `flask.jsonify`, but always uses the fastest available backend, regardless of the Flask version.
+    """
+    return current_app.response_class(
+        dumps(data, sort_keys=_sort_keys()),
+        status=status,
+        headers=headers,
+        mimetype='application/json',
+    )
+
+
+if DefaultJSONProvider is not None:
+    class JSONProvider(DefaultJSONProvider):
+        default = staticmethod(_default)
+
+        def dumps(self, obj, **kwargs):
+            if kwargs.get('indent') is not None or kwargs.get('cls') is not None:
+                return super().dumps(obj, **kwargs)
+
+            return dumps(obj, sort_keys=kwargs.get('sort_keys', self.sort_keys)).decode('utf-8')
+
+        def response(self, *args, **kwargs):
+            if self.compact is False or (self.compact is None and current_app.debug):
+                # Pretty printed responses
+                return super().response(*args, **kwargs)
+
+            return current_app.response_class(
+                dumps(self._prepare_response_obj(args, kwargs), sort_keys=self.sort_keys),
+                mimetype=self.mimetype,
+            )
+
+
+def init_json(app: Flask, backend: str = None):
+    """
+    Select the JSON backend and use it for all responses of `app`.
+
+    `backend` defaults to the `JSON_BACKEND` environment variable, or orjson when it is installed.
+    """
+    global _backend
+
+    if backend is None:
+        backend = Env().str('JSON_BACKEND', 'orjson' if orjson is not None else 'json').lower()
+    if backend not in BACKENDS:
+        raise ValueError(f'Invalid JSON_BACKEND: {backend}. Allowed values: {BACKENDS}')
+    if backend == 'orjson' and orjson is None:
+        logger.warning('orjson is not installed, falling back to json')
+        backend = 'json'
+
+    _backend = backend
+    logger.info('JSON backend selected', extra={'backend': backend})
+
+    if DefaultJSONProvider is not None:
+        app.json = JSONProvider(app)
+    else:
+        # Older Flask versions only allow replacing the encoder class, `json_response` still uses orjson.
+        app.json_encoder = JSONEncoder
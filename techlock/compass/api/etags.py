@@ -0,0 +1,88 @@
+"""
+Weak ETags and conditional requests.
+
+    GET  with If-None-Match  Returns 304 Not Modified, without serializing, when the ETag still matches.
+    PUT  with If-Match       Returns 412 Precondition Failed when the resource changed since the client read it.
+
+The ETag of a single resource is derived from its `id` and `changed_on`.
+The ETag of a page is derived from the `id` and `changed_on` of its items, so from the max `changed_on` as well,
+and from the paging information, which includes the total count.
+"""
+import hashlib
+from typing import Iterable, Optional
+
+from flask import Response, after_this_request, request
+from werkzeug.exceptions import PreconditionFailed
+from werkzeug.http import quote_etag
+
+__all__ = [
+    'check_if_match',
+    'collection_etag',
+    'not_modified',
+    'resource_etag',
+]
+
+
+def _version(obj) -> str:
+    changed_on = getattr(obj, 'changed_on', None)
+    return f'{obj.id}:{changed_on.isoformat() if changed_on is not None else ""}'
+
+
+def resource_etag(obj) -> Optional[str]:
+    """
+    Returns the (unquoted) ETag of a single resource, `None` if it has no `id`.
+    """
+    if getattr(obj, 'id', None) is None:
+        return None
+
+    return hashlib.sha1(_version(obj).encode('utf-8')).hexdigest()
+
+
+def collection_etag(pageable, items: Iterable, paging_fields: Iterable[str]) -> str:
+    """
+    Returns the (unquoted) ETag of a page of `items`, `paging_fields` are the attributes of `pageable`
+    that describe the page, like its offset and the total count.
+    """
+    digest = hashlib.sha1()
+    for name in sorted(paging_fields):
+        digest.update(f'{name}={getattr(pageable, name, None)};'.encode('utf-8'))
+    for item in items:
+        digest.update(_version(item).encode('utf-8'))
+        digest.update(b';')
+
+    return digest.hexdigest()
+
+
+def not_modified(etag: Optional[str]) -> Optional[Response]:
+    """
+    Returns a 304 response if the request's If-None-Match contains `etag`, `None` otherwise.
+    """
+    if etag is None or not request.if_none_match.contains_weak(etag):
+        return None
+
+    return Response(status=304, headers={'ETag': quote_etag(etag, weak=True)})
+
+
+def check_if_match(obj):
+    """
+    Raises `PreconditionFailed` when the request has an If-Match header that does not contain the ETag of `obj`.
+    Adds the ETag of `obj`, as it is after the request, to the response.
+
+    ETags are weak, so they are compared weakly.
+
+    Example:
+        event = self.get_event(current_user, claims.filter_by_action('read'), event_id)
+        check_if_match(event)
+    """
+    if_match = request.if_match
+    if if_match and not if_match.star_tag and not if_match.contains_weak(resource_etag(obj)):
+        raise PreconditionFailed('The resource was modified, fetch it again and retry.')
+
+    @after_this_request
+    def add_etag(response: Response):
+        if response.status_code < 300:
+            etag = resource_etag(obj)
+            if etag is not None:
+                response.set_etag(etag, weak=True)
+
+        return response
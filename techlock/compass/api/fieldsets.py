@@ -0,0 +1,203 @@
+"""
+Sparse fieldsets and expansion control.
+
+    ?fields=id,name,audit.name  Only return these fields, dotted paths select fields of nested objects.
+    ?expand=audit,instruction   Only return these nested objects, all other nested objects are left out.
+
+Fields that are not returned are neither loaded from the database, nor serialized.
+"""
+import functools
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Set, Type
+
+import marshmallow as ma
+import marshmallow.fields as mf
+from marshmallow import class_registry
+from webargs.fields import DelimitedList
+
+from ..orm.eager_loading import MAX_DEPTH, eager_load, is_expanded, loader_options
+from .encoding import is_native, json_response
+from .etags import collection_etag, not_modified, resource_etag
+from .serializers import dump
+
+__all__ = [
+    'FieldSelectionSchema',
+    'field_selection_schema',
+    'fieldsets',
+]
+
+PAGEABLE_ITEMS_FIELD = 'items'
+
+
+class FieldSelectionSchema(ma.Schema):
+    fields = DelimitedList(
+        mf.String(),
+        allow_none=True,
+        description='Comma separated list of fields to return. Defaults to all fields.',
+    )
+    expand = DelimitedList(
+        mf.String(),
+        allow_none=True,
+        description=(
+            'Comma separated list of nested objects to return, use dotted paths for deeper levels. '
+            'Example: `audit,instruction.version`. Defaults to all nested objects.'
+        ),
+    )
+
+
+def _field_paths(schema: ma.Schema, depth: int = MAX_DEPTH, prefix: str = ''):
+    """
+    Returns the dotted paths of all fields and of all nested fields of `schema`, up to `depth` levels deep.
+    """
+    fields, nested = [], []
+    for name, field in schema.fields.items():
+        if field.load_only:
+            continue
+
+        path = prefix + name
+        fields.append(path)
+        if isinstance(field, mf.Nested) and depth > 0:
+            nested.append(path)
+            child_fields, child_nested = _field_paths(field.schema, depth - 1, path + '.')
+            fields.extend(child_fields)
+            nested.extend(child_nested)
+
+    return fields, nested
+
+
+@lru_cache(maxsize=None)
+def field_selection_schema(schema_cls: Type[ma.Schema]) -> Type[FieldSelectionSchema]:
+    """
+    Generate a `FieldSelectionSchema` that only accepts the fields of `schema_cls`.
+    """
+    fields, nested = _field_paths(schema_cls())
+    name = schema_cls.__name__.replace('Schema', 'FieldSelectionSchema')
+
+    return type(name, (FieldSelectionSchema,), {
+        'fields': DelimitedList(
+            mf.String(validate=ma.validate.OneOf(fields)),
+            allow_none=True,
+            description=FieldSelectionSchema._declared_fields['fields'].metadata['description'],
+        ),
+        'expand': DelimitedList(
+            mf.String(validate=ma.validate.OneOf(nested)),
+            allow_none=True,
+            description=FieldSelectionSchema._declared_fields['expand'].metadata['description'],
+        ),
+    })
+
+
+def _items_schema(schema_cls: Type[ma.Schema]) -> Optional[Type[ma.Schema]]:
+    items = schema_cls._declared_fields.get(PAGEABLE_ITEMS_FIELD)
+    if not isinstance(items, mf.Nested):
+        return None
+
+    nested = items.nested
+    if isinstance(nested, str):
+        return class_registry.get_class(nested)
+
+    return nested if isinstance(nested, type) else type(nested)
+
+
+def _excluded_paths(schema: ma.Schema, expand: FrozenSet[str], depth: int = MAX_DEPTH, prefix: str = '') -> Set[str]:
+    excluded = set()
+    if depth <= 0:
+        return excluded
+
+    for name, field in schema.fields.items():
+        if not isinstance(field, mf.Nested):
+            continue
+
+        path = prefix + name
+        if is_expanded(path, expand):
+            excluded.update(_excluded_paths(field.schema, expand, depth - 1, path + '.'))
+        else:
+            excluded.add(path)
+
+    return excluded
+
+
+@lru_cache(maxsize=1024)
+def _dump_schema(
+    schema_cls: Type[ma.Schema],
+    fields: Optional[FrozenSet[str]],
+    expand: Optional[FrozenSet[str]],
+) -> ma.Schema:
+    items_cls = _items_schema(schema_cls)
+    item_schema = (items_cls or schema_cls)()
+    prefix = PAGEABLE_ITEMS_FIELD + '.' if items_cls else ''
+
+    only = None
+    if fields is not None:
+        only = {prefix + f for f in fields}
+        if items_cls:
+            # Keep the paging information.
+            only.update(name for name in schema_cls._declared_fields if name != PAGEABLE_ITEMS_FIELD)
+
+    exclude = set()
+    if expand is not None:
+        exclude = {prefix + path for path in _excluded_paths(item_schema, expand)}
+        if only is not None:
+            # Marshmallow does not allow excluding fields that are not selected.
+            exclude = {path for path in exclude if any(path == o or path.startswith(o + '.') for o in only)}
+
+    return schema_cls(only=only, exclude=exclude)
+
+
+def _frozen(values: Optional[List[str]]):
+    if values is None:
+        return None
+
+    return frozenset(v.strip() for v in values if v.strip())
+
+
+def fieldsets(model, schema: Type[ma.Schema]):
+    """
+    Applies the `fields` and `expand` query parameters, parsed by `field_selection_schema(...)`, to the response.
+
+    Nested objects that will be returned are eager loaded, columns that will not be returned are not loaded.
+    The response is serialized here, by a serializer precompiled for the selected fields.
+    Responses carry a weak ETag, requests with a matching If-None-Match get a 304 without serializing anything.
+
+    Must be the innermost decorator, directly above the view function.
+    `schema` must be the same schema passed to `blp.response`.
+
+    Example:
+        @access_required('read', claim_spec=claim_spec)
+        @blp.arguments(field_selection_schema(EventSchema), location='query', as_kwargs=True)
+        @blp.response(status_code=200, schema=EventSchema)
+        @fieldsets(Event, EventSchema)
+        def get(self, event_id: str, current_user: AuthInfo, claims: ClaimSet):
+    """
+    item_schema = _items_schema(schema) or schema
+    paging_fields = None
+    if item_schema is not schema:
+        paging_fields = [name for name in schema._declared_fields if name != PAGEABLE_ITEMS_FIELD]
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, fields: List[str] = None, expand: List[str] = None, **kwargs):
+            fields, expand = _frozen(fields), _frozen(expand)
+
+            options = loader_options(model, item_schema, fields=fields, expand=expand)
+            with eager_load(model, options):
+                result = func(*args, **kwargs)
+
+            if paging_fields is None:
+                etag = resource_etag(result)
+            else:
+                etag = collection_etag(result, getattr(result, PAGEABLE_ITEMS_FIELD), paging_fields)
+
+            response = not_modified(etag)
+            if response is not None:
+                return response
+
+            response = json_response(dump(_dump_schema(schema, fields, expand), result, native=is_native()))
+            if etag is not None:
+                response.set_etag(etag, weak=True)
+
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,353 @@
+"""
+Filters of list endpoints.
+
+    ?name=Access                        Names starting with "Access", the default.
+    ?name=access&name_match=iprefix     Names starting with "access", ignoring case.
+    ?name=access&name_match=contains    Names containing "access", ignoring case.
+    ?name=acess&name_match=fuzzy        Names with a word similar to "acess", for typos.
+
+The `name` column of every table has a pg_trgm GIN index, see `name_trgm_index`, it serves all modes,
+so filtering takes about as long on a large table as on a small one.
+
+Any other column is filtered with `filter=<field>:<operator>:<value>`, repeat the parameter to combine filters:
+
+    ?filter=phase:in:audit,remediation&filter=start_date:gte:2026-01-01
+    ?filter=type:eq:custom&filter=timestamp:lt:2026-10-01T12:00:00&filter=audit_id:isnull:false
+
+Fields are the model's columns, values are parsed with the column's type, enums by name.
+Operators: eq, ne, lt, lte, gt, gte, in, nin (comma separated values) and isnull (true or false),
+only eq, ne, in, nin and isnull for enums, booleans and ids.
+Filters on columns no index starts with are still applied, but logged, and answered with a `Warning` header,
+they may scan the whole table.
+
+    ?ids=<id>,<id>,<id>                 Only these objects, all of them on one page, see `techlock.compass.api.batch`.
+"""
+import functools
+import logging
+import operator
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Callable, Dict, FrozenSet, List, Tuple
+
+import marshmallow as ma
+import marshmallow.fields as mf
+import sqlalchemy as sa
+from flask import Response, after_this_request, has_request_context
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from techlock.common.api import BadRequestException
+from webargs.fields import DelimitedList
+
+__all__ = [
+    'FILTER_OPERATORS',
+    'NAME_MATCH_MODES',
+    'FilterField',
+    'FilterParams',
+    'FilterSchema',
+    'NameMatchParams',
+    'NameMatchSchema',
+    'compile_filters',
+    'escape_like',
+    'filterable_fields',
+    'ids_filter',
+    'indexed_columns',
+    'name_filter',
+    'name_trgm_index',
+    'parse_filter',
+]
+
+logger = logging.getLogger(__name__)
+
+NAME_MATCH_MODES = ('prefix', 'iprefix', 'contains', 'fuzzy')
+
+_COMPARISONS = {
+    'eq': operator.eq,
+    'ne': operator.ne,
+    'lt': operator.lt,
+    'lte': operator.le,
+    'gt': operator.gt,
+    'gte': operator.ge,
+}
+FILTER_OPERATORS = (*_COMPARISONS, 'in', 'nin', 'isnull')
+# Operators that need an order, not supported by enums, booleans and ids.
+_ORDERED_OPERATORS = ('lt', 'lte', 'gt', 'gte')
+# Columns that are never filtered on by clients, they are scoped by the server.
+_HIDDEN_COLUMNS = ('tenant_id',)
+MAX_FILTERS = 20
+MAX_FILTER_VALUES = 100
+# Longer lists don't fit in a URL, use `POST /<collection>/batch_get`.
+MAX_QUERY_IDS = 100
+
+LIKE_ESCAPE = '\\'
+
+
+def escape_like(value: str) -> str:
+    """
+    Escape the wildcards of a LIKE pattern, so `value` only matches itself.
+    """
+    return value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace('%', LIKE_ESCAPE + '%').replace('_', LIKE_ESCAPE + '_')
+
+
+def name_filter(column, name: str, mode: str = 'prefix'):
+    if mode == 'fuzzy':
+        # Word similarity, above `pg_trgm.word_similarity_threshold`, 0.6 by default.
+        return sa.literal(name, sa.String).op('<%')(column)
+
+    pattern = escape_like(name) + '%'
+    if mode == 'prefix':
+        return column.like(pattern, escape=LIKE_ESCAPE)
+    if mode == 'contains':
+        pattern = '%' + pattern
+
+    return column.ilike(pattern, escape=LIKE_ESCAPE)
+
+
+def name_trgm_index(model) -> sa.Index:
+    """
+    Declare the pg_trgm GIN index on the `name` column of `model` that serves `name_filter`.
+    """
+    return sa.Index(
+        f'ix_{model.__tablename__}_name_trgm',
+        model.name,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+class NameMatchSchema(ma.Schema):
+    name_match = mf.String(
+        missing='prefix',
+        validate=ma.validate.OneOf(NAME_MATCH_MODES),
+        description=f'How `name` is matched, one of: {", ".join(NAME_MATCH_MODES)}. Defaults to prefix, which is case sensitive.',
+    )
+
+
+@dataclass
+class NameMatchParams:
+    name_match: str = 'prefix'
+
+    def get_filters(self):
+        # The base class filters `name` by prefix, hide it from it and filter with the requested mode instead.
+        name, self.name = self.name, None
+        try:
+            filters = list(super().get_filters())
+        finally:
+            self.name = name
+
+        if name:
+            filters.append(name_filter(self.__db_model__.name, name, self.name_match))
+
+        return filters
+
+
+@dataclass(frozen=True)
+class FilterField:
+    name: str
+    column: sa.Column
+    parse: Callable[[str], object]
+    ordered: bool
+
+
+def _parse_bool(value: str) -> bool:
+    value = value.lower()
+    if value not in ('true', 'false'):
+        raise ValueError(value)
+
+    return value == 'true'
+
+
+def _parse_enum(enum_class):
+    def parse(value: str):
+        try:
+            return enum_class[value]
+        except KeyError:
+            raise ValueError(value)
+
+    return parse
+
+
+def _parse_uuid(as_uuid: bool):
+    def parse(value: str):
+        parsed = uuid.UUID(value)
+        return parsed if as_uuid else str(parsed)
+
+    return parse
+
+
+def _filter_field(column: sa.Column):
+    column_type = column.type
+    if isinstance(column_type, sa.Enum):
+        if column_type.enum_class is None:
+            return FilterField(column.key, column, str, False)
+        return FilterField(column.key, column, _parse_enum(column_type.enum_class), False)
+    if isinstance(column_type, sa.Boolean):
+        return FilterField(column.key, column, _parse_bool, False)
+    if isinstance(column_type, UUID):
+        return FilterField(column.key, column, _parse_uuid(column_type.as_uuid), False)
+    if isinstance(column_type, sa.DateTime):
+        return FilterField(column.key, column, datetime.fromisoformat, True)
+    if isinstance(column_type, sa.Date):
+        return FilterField(column.key, column, date.fromisoformat, True)
+    if isinstance(column_type, sa.Integer):
+        return FilterField(column.key, column, int, True)
+    if isinstance(column_type, (sa.Float, sa.Numeric)):
+        return FilterField(column.key, column, float, True)
+    if isinstance(column_type, sa.String):
+        return FilterField(column.key, column, str, True)
+
+    # JSON, arrays and search vectors can't be filtered with these operators.
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def filterable_fields(model) -> Dict[str, FilterField]:
+    """
+    The fields `model` can be filtered on, by name.
+    """
+    fields = {}
+    for column in model.__table__.columns:
+        if column.key in _HIDDEN_COLUMNS:
+            continue
+        field = _filter_field(column)
+        if field is not None:
+            fields[field.name] = field
+
+    return fields
+
+
+@functools.lru_cache(maxsize=None)
+def indexed_columns(model) -> FrozenSet[str]:
+    """
+    Names of the columns of `model` a btree index starts with, the ones filters can use an index for.
+    """
+    table = model.__table__
+    names = {column.key for column in table.primary_key.columns}
+    for index in table.indexes:
+        using = index.dialect_options['postgresql'].get('using')
+        if using and using != 'btree':
+            continue
+        columns = list(index.columns)
+        if columns:
+            names.add(columns[0].key)
+    for column in table.columns:
+        if column.index or column.unique:
+            names.add(column.key)
+
+    return frozenset(names)
+
+
+def parse_filter(model, expression: str) -> Tuple[FilterField, str, object]:
+    """
+    Parse `<field>:<operator>:<value>` into the field, operator and parsed value, or a list of values for in and nin.
+    """
+    parts = expression.split(':', 2)
+    if len(parts) != 3:
+        raise BadRequestException(f'Invalid filter: {expression}. Expected <field>:<operator>:<value>.')
+
+    name, op, value = parts
+    field = filterable_fields(model).get(name)
+    if field is None:
+        raise BadRequestException(f'Invalid filter: {expression}. Can not filter on: {name}.')
+    if op not in FILTER_OPERATORS or (op in _ORDERED_OPERATORS and not field.ordered):
+        raise BadRequestException(f'Invalid filter: {expression}. Operator {op} is not supported for {name}.')
+
+    try:
+        if op == 'isnull':
+            return field, op, _parse_bool(value)
+        if op in ('in', 'nin'):
+            values = value.split(',')
+            if len(values) > MAX_FILTER_VALUES:
+                raise BadRequestException(f'Invalid filter: {expression}. At most {MAX_FILTER_VALUES} values.')
+            return field, op, [field.parse(v) for v in values]
+        return field, op, field.parse(value)
+    except (ValueError, TypeError):
+        raise BadRequestException(f'Invalid filter: {expression}. Invalid value for {name}.')
+
+
+def _warn_unindexed(model, names: List[str]):
+    logger.warning('Filter without a supporting index', extra={'table': model.__tablename__, 'fields': names})
+    if not has_request_context():
+        return
+
+    @after_this_request
+    def add_warning(response: Response):
+        for name in names:
+            response.headers.add('Warning', f'199 compass "No index supports the filter on {name}, it may be slow."')
+        return response
+
+
+def compile_filters(model, expressions: List[str]) -> List:
+    """
+    Compile filter expressions into SQLAlchemy criteria on `model`.
+    """
+    criteria = []
+    unindexed = []
+    for expression in expressions:
+        field, op, value = parse_filter(model, expression)
+        column = getattr(model, field.name)
+        if op == 'isnull':
+            criteria.append(column.is_(None) if value else column.isnot(None))
+        elif op == 'in':
+            criteria.append(column.in_(value))
+        elif op == 'nin':
+            criteria.append(column.notin_(value))
+        else:
+            criteria.append(_COMPARISONS[op](column, value))
+
+        if field.name not in indexed_columns(model) and field.name not in unindexed:
+            unindexed.append(field.name)
+
+    if unindexed:
+        _warn_unindexed(model, unindexed)
+
+    return criteria
+
+
+def ids_filter(model, ids: List):
+    """
+    `id = ANY(:ids)`, a single array parameter, unlike IN, the statement is the same for any number of ids.
+    """
+    ids = sa.literal([str(id) for id in ids], ARRAY(sa.String))
+    return model.id == sa.any_(sa.cast(ids, ARRAY(UUID)))
+
+
+class FilterSchema(NameMatchSchema):
+    filter = mf.List(
+        mf.String(),
+        validate=ma.validate.Length(max=MAX_FILTERS),
+        allow_none=True,
+        description=(
+            'Filters as `<field>:<operator>:<value>`, repeat to combine them. '
+            f'Operators: {", ".join(FILTER_OPERATORS)}. Example: `phase:in:audit,remediation`.'
+        ),
+    )
+    ids = DelimitedList(
+        mf.UUID(),
+        validate=ma.validate.Length(max=MAX_QUERY_IDS),
+        allow_none=True,
+        description=f'Comma separated ids, at most {MAX_QUERY_IDS}, all of them are returned on one page.',
+    )
+
+
+@dataclass
+class FilterParams(NameMatchParams):
+    filter: List[str] = None
+    ids: List[uuid.UUID] = None
+
+    def __post_init__(self):
+        parent = getattr(super(), '__post_init__', None)
+        if parent is not None:
+            parent()
+        # Every requested object is returned, no matter the page size.
+        if self.ids:
+            self.offset = 0
+            self.limit = max(self.limit or 0, len(self.ids))
+
+    def get_filters(self):
+        filters = super().get_filters()
+        if self.filter:
+            filters.extend(compile_filters(self.__db_model__, self.filter))
+        if self.ids:
+            filters.append(ids_filter(self.__db_model__, self.ids))
+
+        return filters
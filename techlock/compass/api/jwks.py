@@ -0,0 +1,222 @@
+"""
+JWKS and token verification caches.
+
+Keys from `JWKS_URLS` are fetched once at startup, kept in memory and refreshed by a background thread
+every `JWKS_REFRESH_INTERVAL` seconds. Request threads never fetch keys, they use the cached keys even when a refresh
+is due or failed (stale while revalidate), for at most `JWKS_MAX_STALE` seconds.
+A token signed with an unknown key id wakes the refresh thread and is rejected.
+
+RSA signature checks are cached per token, in a bounded LRU, until the token expires.
+Claims, like `exp`, are still validated on every request.
+"""
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+import jwt as pyjwt
+from environs import Env
+from flask import Flask
+from jwt.algorithms import RSAAlgorithm
+from prometheus_client import Counter
+
+from ..cache import LRUCache
+
+__all__ = [
+    'CachedRSAAlgorithm',
+    'JWKSCache',
+    'init_jwks_cache',
+    'token_expires_at',
+]
+
+logger = logging.getLogger(__name__)
+
+JWKS_REFRESHES = Counter(
+    'compass_jwks_refresh_total',
+    'JWKS fetches by the background refresh thread.',
+    ['result'],
+)
+TOKEN_VERIFICATIONS = Counter(
+    'compass_token_verification_total',
+    'Token signature checks, served from the cache (hit) or verified (miss).',
+    ['result'],
+)
+
+# Minimum seconds between refreshes triggered by unknown key ids.
+MIN_REFRESH_INTERVAL = 10
+
+
+class JWKSCache:
+    def __init__(self, urls: List[str], refresh_interval: int = 300, max_stale: int = 86400, timeout: int = 5):
+        self.urls = urls
+        self.refresh_interval = refresh_interval
+        self.max_stale = max_stale
+        self.timeout = timeout
+
+        self._keys: Dict[str, object] = {}
+        self._fetched_at: Optional[float] = None
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _fetch(self) -> Dict[str, object]:
+        keys = {}
+        for url in self.urls:
+            with urllib.request.urlopen(url, timeout=self.timeout) as response:
+                jwks = json.loads(response.read().decode('utf-8'))
+            for jwk in jwks.get('keys', []):
+                if jwk.get('kty') != 'RSA':
+                    continue
+                keys[jwk.get('kid')] = RSAAlgorithm.from_jwk(json.dumps(jwk))
+
+        return keys
+
+    def refresh(self):
+        try:
+            keys = self._fetch()
+        except Exception:
+            JWKS_REFRESHES.labels('error').inc()
+            logger.exception('Failed to refresh JWKS, keeping the cached keys', extra={'urls': self.urls})
+            return
+
+        JWKS_REFRESHES.labels('success').inc()
+        self._keys = keys
+        self._fetched_at = time.time()
+        logger.debug('Refreshed JWKS', extra={'kids': list(keys)})
+
+    def _run(self):
+        # Keys fetched at startup are not fetched again right away.
+        last_refresh = time.monotonic() if self._fetched_at is not None else None
+        while True:
+            if last_refresh is not None:
+                self._wakeup.wait(self.refresh_interval)
+                self._wakeup.clear()
+                # Throttle refreshes triggered by unknown key ids.
+                delay = MIN_REFRESH_INTERVAL - (time.monotonic() - last_refresh)
+                if delay > 0:
+                    time.sleep(delay)
+
+            self.refresh()
+            last_refresh = time.monotonic()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='jwks-refresh', daemon=True)
+                self._thread.start()
+
+    def get_key(self, kid: Optional[str]):
+        """
+        Returns the cached key for `kid`, never blocks on a fetch.
+        Returns `None`, and wakes the refresh thread, when the key is unknown, when the keys were not fetched yet,
+        or when they are older than `max_stale`.
+        """
+        self.start()
+        fetched_at = self._fetched_at
+        if fetched_at is None or time.time() - fetched_at > self.max_stale:
+            self._wakeup.set()
+            return None
+
+        key = self._keys.get(kid)
+        if key is None and kid is None and len(self._keys) == 1:
+            # Tokens without a kid, when there is only one key.
+            key = next(iter(self._keys.values()))
+        if key is None:
+            self._wakeup.set()
+
+        return key
+
+
+def token_expires_at(token: bytes) -> Optional[float]:
+    """
+    The `exp` claim of a token, or of its signing input, without verifying it. `None` when it has none.
+    """
+    try:
+        payload = token.split(b'.')[1]
+        payload += b'=' * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+    except (IndexError, ValueError, AttributeError):
+        return None
+
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+class CachedRSAAlgorithm(RSAAlgorithm):
+    """
+    RSAAlgorithm that remembers valid signatures, keyed by a hash of the signed token, until the token expires.
+    Tokens without `exp` are not cached.
+    """
+
+    def __init__(self, hash_alg, cache: LRUCache):
+        super().__init__(hash_alg)
+        self.cache = cache
+
+    def verify(self, msg, key, sig):
+        token = hashlib.sha256(msg + b'.' + sig).hexdigest()
+        verified_with = self.cache.get(token)
+        if verified_with is not None and verified_with is key:
+            TOKEN_VERIFICATIONS.labels('hit').inc()
+            return True
+
+        TOKEN_VERIFICATIONS.labels('miss').inc()
+        valid = super().verify(msg, key, sig)
+        expires_at = token_expires_at(msg)
+        if valid and expires_at is not None:
+            self.cache.set(token, key, expires_at=expires_at)
+
+        return valid
+
+
+def _register_cached_algorithms(cache: LRUCache):
+    for alg, hash_alg in (
+        ('RS256', RSAAlgorithm.SHA256),
+        ('RS384', RSAAlgorithm.SHA384),
+        ('RS512', RSAAlgorithm.SHA512),
+    ):
+        try:
+            pyjwt.unregister_algorithm(alg)
+        except KeyError:
+            pass
+        pyjwt.register_algorithm(alg, CachedRSAAlgorithm(hash_alg, cache))
+
+
+def init_jwks_cache(app: Flask, jwt_manager) -> Optional[JWKSCache]:
+    """
+    Load JWT verification keys from the JWKS cache and cache RSA signature checks.
+    Does nothing when `JWKS_URLS` is not set, `JWKS_CACHE_ENABLED` is false, or tokens are not signed with RSA.
+    """
+    env = Env()
+    urls = [url for url in env.str('JWKS_URLS', '').replace(',', ' ').split() if url]
+    if not urls or not env.bool('JWKS_CACHE_ENABLED', True):
+        return None
+    if not str(app.config.get('JWT_ALGORITHM') or 'RS256').startswith('RS'):
+        return None
+
+    jwks = JWKSCache(
+        urls,
+        refresh_interval=env.int('JWKS_REFRESH_INTERVAL', 300),
+        max_stale=env.int('JWKS_MAX_STALE', 86400),
+        timeout=env.int('JWKS_FETCH_TIMEOUT', 5),
+    )
+    _register_cached_algorithms(LRUCache(maxsize=env.int('TOKEN_VERIFY_CACHE_SIZE', 10000)))
+
+    @jwt_manager.decode_key_loader
+    def load_key(*args):
+        # flask-jwt-extended passes (claims, headers) in 3.x, and (headers, claims) in 4.x.
+        headers = next((arg for arg in args if isinstance(arg, dict) and 'alg' in arg), {})
+        key = jwks.get_key(headers.get('kid'))
+        if key is None:
+            logger.warning('No key available to verify token', extra={'kid': headers.get('kid')})
+            raise pyjwt.InvalidSignatureError('Unknown signing key.')
+
+        return key
+
+    # The only fetch that blocks, if it fails requests are rejected until the refresh thread succeeds.
+    jwks.refresh()
+    jwks.start()
+    logger.info('JWKS cache enabled', extra={'urls': urls})
+    return jwks
@@ -0,0 +1,179 @@
+"""
+Precompiled marshmallow serializers.
+
+`Schema.dump` dispatches every field of every object through several layers of generic code.
+For large pages that is the dominant cost of a request.
+`compile_schema` generates a dump function specialized for a schema and its field selection (`only` / `exclude`),
+with the serialization of the common field types inlined. Output is identical to `Schema.dump`.
+
+Schemas with `pre_dump` / `post_dump` hooks, and field types that are not inlined, fall back to marshmallow.
+
+With `native=True` date and datetime values are left as is, for JSON encoders that handle them natively.
+"""
+import datetime
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import marshmallow as ma
+import marshmallow.fields as mf
+from marshmallow import missing
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from marshmallow_enum import EnumField
+
+__all__ = [
+    'compile_schema',
+    'dump',
+]
+
+_cache: Dict[Tuple, Callable] = {}
+# Placeholders of the schemas being compiled, only visible to the thread holding the lock.
+_compiling: Dict[Tuple, Callable] = {}
+_lock = threading.RLock()
+
+
+def _schema_key(schema: ma.Schema, native: bool) -> Tuple:
+    return (
+        type(schema),
+        native,
+        schema.many,
+        tuple(sorted(schema.only)) if schema.only is not None else None,
+        tuple(sorted(schema.exclude)),
+    )
+
+
+def _dump_default(field: mf.Field):
+    # `default` was renamed to `dump_default` in marshmallow 3.13
+    if hasattr(field, 'dump_default'):
+        return field.dump_default
+
+    return field.default
+
+
+class _Compiler:
+
+    def __init__(self, native: bool = False):
+        self.native = native
+        self.namespace = {
+            'missing': missing,
+            'date_isoformat': datetime.date.isoformat,
+            'datetime_isoformat': datetime.datetime.isoformat,
+        }
+        self.counter = 0
+
+    def bind(self, value, prefix: str) -> str:
+        self.counter += 1
+        name = f'_{prefix}{self.counter}'
+        self.namespace[name] = value
+
+        return name
+
+    def expression(self, field: mf.Field, value: str, attr: str) -> Optional[str]:
+        """
+        Returns a python expression that serializes `value` like `field` does, or `None` if the field type is not inlined.
+        Types are matched exactly, subclasses may override `_serialize`.
+        """
+        field_type = type(field)
+        if field_type is mf.String:
+            return f'None if {value} is None else str({value})'
+        if field_type is mf.Integer and not field.as_string:
+            return f'None if {value} is None else int({value})'
+        if field_type is mf.Float and not field.as_string:
+            return f'None if {value} is None else float({value})'
+        if field_type is mf.Boolean:
+            # Only real booleans are inlined, marshmallow maps strings like 'false' using its truthy / falsy sets.
+            serialize = self.bind(field._serialize, 'serialize')
+            return f'{value} if {value} is True or {value} is False else {serialize}({value}, {attr!r}, obj)'
+        if field_type in (mf.Date, mf.DateTime) and field.format in (None, 'iso') and self.native:
+            return value
+        if field_type is mf.Date and field.format in (None, 'iso'):
+            return f'None if {value} is None else date_isoformat({value})'
+        if field_type is mf.DateTime and field.format in (None, 'iso'):
+            return f'None if {value} is None else datetime_isoformat({value})'
+        if field_type is EnumField:
+            member = 'value' if field.dump_by == EnumField.VALUE else 'name'
+            return f'None if {value} is None else {value}.{member}'
+        if field_type is mf.List:
+            inner = self.expression(field.inner, 'item', attr)
+            if inner is None:
+                return None
+            return f'None if {value} is None else [{inner} for item in {value}]'
+        if field_type is mf.Nested:
+            nested = self.bind(compile_schema(field.schema, native=self.native), 'dump')
+            many = field.many or field.schema.many
+            return f'None if {value} is None else {nested}({value}, {many!r})'
+
+        return None
+
+    def compile(self, schema: ma.Schema) -> Callable:
+        get_attribute = self.bind(schema.get_attribute, 'get_attribute')
+        lines = [
+            'def dump(obj, many=None):',
+            '    if many is None:',
+            f'        many = {schema.many!r}',
+            '    if many:',
+            '        return [dump(item, False) for item in obj]',
+            # Marshmallow prefers item access over attribute access.
+            '    if hasattr(type(obj), "__getitem__"):',
+            f'        return {self.bind(schema.dump, "schema_dump")}(obj, many=False)',
+            '    out = {}',
+        ]
+        for name, field in schema.dump_fields.items():
+            attr = field.attribute or name
+            key = field.data_key if field.data_key is not None else name
+            expression = None
+            if '.' not in attr and _dump_default(field) is missing:
+                expression = self.expression(field, 'value', attr)
+
+            if expression is None:
+                lines += [
+                    f'    value = {self.bind(field, "field")}.serialize({name!r}, obj, {get_attribute})',
+                    '    if value is not missing:',
+                    f'        out[{key!r}] = value',
+                ]
+            else:
+                lines += [
+                    f'    value = getattr(obj, {attr!r}, missing)',
+                    '    if value is not missing:',
+                    f'        out[{key!r}] = {expression}',
+                ]
+        lines.append('    return out')
+
+        exec('\n'.join(lines), self.namespace)
+        return self.namespace['dump']
+
+
+def compile_schema(schema: ma.Schema, native: bool = False) -> Callable[[Any, Optional[bool]], Any]:
+    """
+    Returns a function `dump(obj, many=None)` equivalent to `schema.dump(obj, many=many)`.
+    Compiled functions are cached per schema class and field selection.
+
+    Args:
+        native: Leave date and datetime values as is, the JSON encoder must be able to encode them.
+    """
+    if schema._has_processors(PRE_DUMP) or schema._has_processors(POST_DUMP):
+        return lambda obj, many=None: schema.dump(obj, many=many)
+
+    key = _schema_key(schema, native)
+    func = _cache.get(key)
+    if func is not None:
+        return func
+
+    with _lock:
+        func = _cache.get(key) or _compiling.get(key)
+        if func is not None:
+            return func
+
+        # Self referencing schemas, like ReportNodeSchema.children, resolve to this placeholder while compiling.
+        compiled = []
+        _compiling[key] = lambda obj, many=None: compiled[0](obj, many)
+        try:
+            compiled.append(_Compiler(native).compile(schema))
+        finally:
+            del _compiling[key]
+        _cache[key] = compiled[0]
+
+        return compiled[0]
+
+
+def dump(schema: ma.Schema, obj, many: bool = None, native: bool = False):
+    return compile_schema(schema, native=native)(obj, many)
@@ -5,7 +5,10 @@ from techlock.common import ConfigManager, init_logging
 from techlock.common.api import dynamically_register_routes
 from techlock.common.api.flask import create_flask
 
+from .api import init_compression, init_json, init_jwks_cache
 from .models import ALL_CLAIM_SPECS
+from .orm import init_query_counter, init_row_level_security
+from .services import init_change_feed, init_sweeper
 
 Env().read_env()  # Load .env file
 init_logging(flask_logger=True)
@@ -24,9 +27,18 @@ migrate = flask_wrapper.migrate
 jwt = flask_wrapper.jwt
 api = flask_wrapper.api
 
+init_jwks_cache(app, jwt)
+
 # Initialize ConfigManager with namespace
 ConfigManager(namespace='compass')
 
+init_json(app)
+init_compression(app)
+init_query_counter(app)
+init_row_level_security(app)
+init_sweeper(app)
+init_change_feed(app)
+
 logger.info('Initializing routes')
 dynamically_register_routes(app, api)
 
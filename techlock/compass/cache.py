@@ -0,0 +1,67 @@
+"""
+Process local caches.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+__all__ = [
+    'LRUCache',
+]
+
+_missing = object()
+
+
+class LRUCache:
+    """
+    Thread safe, bounded, least recently used cache.
+    Entries can expire at a given unix timestamp, expired entries are dropped when they are read.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._data.get(key, _missing)
+            if entry is not _missing:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.time():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value, expires_at: Optional[float] = None):
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any], expires_at: Optional[float] = None):
+        """
+        Returns the cached value of `key`, or caches and returns `factory()`.
+        `factory` is called without holding the lock, concurrent misses may both call it.
+        """
+        value = self.get(key, _missing)
+        if value is _missing:
+            value = factory()
+            self.set(key, value, expires_at=expires_at)
+
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
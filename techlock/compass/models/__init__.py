@@ -1,10 +1,20 @@
+from .activity import (
+    ACTIVITY_CLAIM_SPEC,
+    ACTIVITY_TYPES,
+    ActivityPageableSchema,
+    ActivityQueryParametersSchema,
+    ActivitySchema,
+)
 from .audit import (
     AUDIT_CLAIM_SPEC,
     Audit,
+    AuditChangesQueryParametersSchema,
     AuditListQueryParameters,
     AuditListQueryParametersSchema,
     AuditPageableSchema,
     AuditSchema,
+    AuditSummaryListSchema,
+    AuditSummarySchema,
 )
 from .audit_history import (
     AUDIT_HISTORY_CLAIM_SPEC,
@@ -38,6 +48,13 @@ from .audit_timeline import (
     AuditTimelinePageableSchema,
     AuditTimelineSchema,
 )
+from .batch import (
+    BATCH_CLAIM_SPEC,
+    BATCH_METHODS,
+    BatchOperationResultSchema,
+    BatchOperationSchema,
+    BatchSchema,
+)
 from .comment import (
     COMMENT_CLAIM_SPEC,
     Comment,
@@ -69,6 +86,7 @@ from .compliance_period import (
     CompliancePeriodListQueryParametersSchema,
     CompliancePeriodPageableSchema,
     CompliancePeriodSchema,
+    CompliancePeriodSyncSchema,
 )
 from .compliance_response import (
     COMPLIANCE_RESPONSE_CLAIM_SPEC,
@@ -113,6 +131,7 @@ from .detail import (
 from .event import (
     EVENT_CLAIM_SPEC,
     Event,
+    EventBatchSchema,
     EventListQueryParameters,
     EventListQueryParametersSchema,
     EventPageableSchema,
@@ -135,12 +154,16 @@ from .report import (
     ReportSchema,
 )
 from .report_instruction import (
+    INSTRUCTION_SEARCH_TYPES,
     REPORT_INSTRUCTION_CLAIM_SPEC,
     ReportInstruction,
     ReportInstructionListQueryParameters,
     ReportInstructionListQueryParametersSchema,
     ReportInstructionPageableSchema,
     ReportInstructionSchema,
+    ReportInstructionSearchPageableSchema,
+    ReportInstructionSearchQueryParametersSchema,
+    ReportInstructionSearchResultSchema,
 )
 from .report_node import (
     REPORT_NODE_CLAIM_SPEC,
@@ -158,6 +181,13 @@ from .report_version import (
     ReportVersionPageableSchema,
     ReportVersionSchema,
 )
+from .search import (
+    SEARCH_CLAIM_SPEC,
+    SEARCH_TYPES,
+    SearchPageableSchema,
+    SearchQueryParametersSchema,
+    SearchResultSchema,
+)
 from .summary_note import (
     SUMMARY_NOTE_CLAIM_SPEC,
     SummaryNote,
@@ -176,11 +206,13 @@ from .upload import (
 )
 
 ALL_CLAIM_SPECS = [
+    ACTIVITY_CLAIM_SPEC,
     AUDIT_CLAIM_SPEC,
     AUDIT_HISTORY_CLAIM_SPEC,
     AUDIT_RESPONSE_CLAIM_SPEC,
     AUDIT_RESPONSE_HISTORY_CLAIM_SPEC,
     AUDIT_TIMELINE_CLAIM_SPEC,
+    BATCH_CLAIM_SPEC,
     COMMENT_CLAIM_SPEC,
     COMPLIANCE_CLAIM_SPEC,
     COMPLIANCE_HISTORY_CLAIM_SPEC,
@@ -196,6 +228,7 @@ ALL_CLAIM_SPECS = [
     REPORT_INSTRUCTION_CLAIM_SPEC,
     REPORT_NODE_CLAIM_SPEC,
     REPORT_VERSION_CLAIM_SPEC,
+    SEARCH_CLAIM_SPEC,
     SUMMARY_NOTE_CLAIM_SPEC,
     UPLOAD_CLAIM_SPEC,
 ]
@@ -0,0 +1,75 @@
+import marshmallow as ma
+import marshmallow.fields as mf
+from techlock.common.api import ClaimSpec
+
+__all__ = [
+    'ACTIVITY_TYPES',
+    'ActivitySchema',
+    'ActivityPageableSchema',
+    'ActivityQueryParametersSchema',
+    'ACTIVITY_CLAIM_SPEC',
+]
+
+
+ACTIVITY_CLAIM_SPEC = ClaimSpec(
+    actions=[
+        'read',
+    ],
+    resource_name='activity',
+    filter_fields=[
+        'name',
+        'created_by',
+    ],
+    default_actions=['read'],
+)
+
+ACTIVITY_TYPES = ('event', 'comment', 'journal', 'upload')
+SCOPE_FIELDS = ('audit_id', 'audit_instruction_id', 'compliance_id', 'compliance_period_id')
+
+
+class ActivitySchema(ma.Schema):
+    type = mf.String(dump_only=True, description=f'Kind of activity, one of: {", ".join(ACTIVITY_TYPES)}.')
+    id = mf.String(dump_only=True)
+    name = mf.String(dump_only=True)
+    description = mf.String(dump_only=True)
+    timestamp = mf.DateTime(dump_only=True)
+    created_by = mf.String(dump_only=True)
+
+    audit_id = mf.String(dump_only=True)
+    audit_instruction_id = mf.String(dump_only=True)
+    compliance_id = mf.String(dump_only=True)
+    compliance_period_id = mf.String(dump_only=True)
+
+    event_type = mf.String(dump_only=True, description='Only set for events.')
+    visibility = mf.String(dump_only=True, description='Only set for events.')
+    uuid = mf.String(dump_only=True, description='Only set for uploads.')
+    audit_evidence = mf.Boolean(dump_only=True, description='Only set for uploads.')
+
+
+class ActivityPageableSchema(ma.Schema):
+    items = mf.Nested(ActivitySchema, many=True, dump_only=True)
+    limit = mf.Integer(dump_only=True)
+    next_cursor = mf.String(
+        dump_only=True,
+        allow_none=True,
+        description='Pass as `cursor` to get the next, older, page. Not set on the last page.',
+    )
+
+
+class ActivityQueryParametersSchema(ma.Schema):
+    audit_id = mf.UUID(allow_none=True)
+    audit_instruction_id = mf.UUID(allow_none=True)
+    compliance_id = mf.UUID(allow_none=True)
+    compliance_period_id = mf.UUID(allow_none=True)
+    types = mf.List(
+        mf.String(validate=ma.validate.OneOf(ACTIVITY_TYPES)),
+        missing=list(ACTIVITY_TYPES),
+        description='Kinds of activity to include, all by default.',
+    )
+    cursor = mf.String(allow_none=True, description='`next_cursor` of the previous page.')
+    limit = mf.Integer(missing=50, validate=ma.validate.Range(min=1, max=500))
+
+    @ma.validates_schema
+    def validate_scope(self, data, **kwargs):
+        if not any(data.get(field) for field in SCOPE_FIELDS):
+            raise ma.ValidationError(f'At least one of {", ".join(SCOPE_FIELDS)} is required.')
@@ -15,10 +15,15 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'Audit',
     'AuditSchema',
     'AuditPageableSchema',
+    'AuditSummarySchema',
+    'AuditSummaryListSchema',
+    'AuditChangesQueryParametersSchema',
     'AuditListQueryParameters',
     'AuditListQueryParametersSchema',
     'AUDIT_CLAIM_SPEC',
@@ -67,10 +72,53 @@ class AuditPageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(AuditSchema, many=True, dump_only=True)
 
 
-class AuditListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class AuditSummarySchema(ma.Schema):
+    id = mf.String(dump_only=True)
+    name = mf.String(dump_only=True)
+    phase = EnumField(Phase, dump_only=True)
+    start_date = mf.Date(dump_only=True)
+    estimated_remediation_date = mf.Date(dump_only=True)
+    remediation_date = mf.Date(dump_only=True)
+    estimated_end_date = mf.Date(dump_only=True)
+    end_date = mf.Date(dump_only=True)
+    total_responses = mf.Integer(dump_only=True)
+    compliance = mf.Dict(
+        keys=mf.String(),
+        values=mf.Integer(),
+        dump_only=True,
+        description='Number of active audit responses per compliance value.',
+    )
+
+
+class AuditSummaryListSchema(ma.Schema):
+    items = mf.Nested(AuditSummarySchema, many=True, dump_only=True)
+
+
+class AuditChangesQueryParametersSchema(ma.Schema):
+    mode = mf.String(
+        missing='poll',
+        validate=ma.validate.OneOf(['sse', 'poll']),
+        description=(
+            'Wait for the next changes and return them as JSON (poll), the default, or stream server-sent events (sse). '
+            'Streams are limited per server, 503 when none is available.'
+        ),
+    )
+    wait = mf.Integer(
+        missing=25,
+        validate=ma.validate.Range(min=0, max=30),
+        description='Seconds a poll waits for changes.',
+    )
+    last_event_id = mf.String(
+        allow_none=True,
+        validate=ma.validate.Regexp(r'^\d+-\d+$'),
+        description='Return the changes after this id, same as the `Last-Event-ID` header.',
+    )
+
+
+class AuditListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter audits by name prefix.',
+        description='Used to filter audits by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -91,6 +139,9 @@ class Audit(BaseModel):
     phase = sa.Column(st.Enum(Phase), default=Phase.scoping_and_validation)
 
 
+name_trgm_index(Audit)
+
+
 @dataclass
-class AuditListQueryParameters(BaseOffsetListQueryParams):
+class AuditListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = Audit
@@ -14,6 +14,7 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
 from .audit import Phase
 
 __all__ = [
@@ -58,10 +59,10 @@ class AuditHistoryPageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(AuditHistorySchema, many=True, dump_only=True)
 
 
-class AuditHistoryListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class AuditHistoryListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter audits_history by name prefix.',
+        description='Used to filter audits_history by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -83,6 +84,9 @@ class AuditHistory(BaseModel):
     phase = sa.Column(st.Enum(Phase), default=Phase.scoping_and_validation)
 
 
+name_trgm_index(AuditHistory)
+
+
 @dataclass
-class AuditHistoryListQueryParameters(BaseOffsetListQueryParams):
+class AuditHistoryListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = AuditHistory
@@ -17,6 +17,8 @@ from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
 from techlock.compass.models.report_version import Compliance
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'AuditResponse',
     'AuditResponseSchema',
@@ -56,10 +58,10 @@ class AuditResponsePageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(AuditResponseSchema, many=True, dump_only=True)
 
 
-class AuditResponseListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class AuditResponseListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter audit_responses by name prefix.',
+        description='Used to filter audit_responses by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -78,6 +80,18 @@ class AuditResponse(BaseModel):
     instruction = relationship('ReportInstruction')
 
 
+# Covers the per audit compliance counts of `GET /audits/summary` with an index only scan.
+sa.Index(
+    'ix_audit_responses_audit_id_compliance',
+    AuditResponse.audit_id,
+    AuditResponse.compliance,
+    postgresql_where=AuditResponse.is_active.is_(True),
+)
+
+
+name_trgm_index(AuditResponse)
+
+
 @dataclass
-class AuditResponseListQueryParameters(BaseOffsetListQueryParams):
+class AuditResponseListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = AuditResponse
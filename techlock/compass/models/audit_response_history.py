@@ -17,6 +17,8 @@ from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
 from techlock.compass.models.report_version import Compliance
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'AuditResponseHistory',
     'AuditResponseHistorySchema',
@@ -54,10 +56,10 @@ class AuditResponseHistoryPageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(AuditResponseHistorySchema, many=True, dump_only=True)
 
 
-class AuditResponseHistoryListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class AuditResponseHistoryListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter audit_responses_history by name prefix.',
+        description='Used to filter audit_responses_history by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -77,6 +79,9 @@ class AuditResponseHistory(BaseModel):
     instruction = relationship('ReportInstruction')
 
 
+name_trgm_index(AuditResponseHistory)
+
+
 @dataclass
-class AuditResponseHistoryListQueryParameters(BaseOffsetListQueryParams):
+class AuditResponseHistoryListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = AuditResponseHistory
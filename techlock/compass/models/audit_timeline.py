@@ -14,6 +14,8 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'AuditTimeline',
     'AuditTimelineSchema',
@@ -55,10 +57,10 @@ class AuditTimelinePageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(AuditTimelineSchema, many=True, dump_only=True)
 
 
-class AuditTimelineListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class AuditTimelineListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter audits_timeline by name prefix.',
+        description='Used to filter audits_timeline by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -79,6 +81,9 @@ class AuditTimeline(BaseModel):
     audit = relationship('Audit')
 
 
+name_trgm_index(AuditTimeline)
+
+
 @dataclass
-class AuditTimelineListQueryParameters(BaseOffsetListQueryParams):
+class AuditTimelineListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = AuditTimeline
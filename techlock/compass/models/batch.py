@@ -0,0 +1,66 @@
+import marshmallow as ma
+import marshmallow.fields as mf
+from techlock.common.api import ClaimSpec
+
+__all__ = [
+    'BATCH_METHODS',
+    'BatchOperationSchema',
+    'BatchOperationResultSchema',
+    'BatchSchema',
+    'BATCH_CLAIM_SPEC',
+]
+
+
+BATCH_CLAIM_SPEC = ClaimSpec(
+    actions=[
+        'create',
+    ],
+    resource_name='batch',
+    filter_fields=[
+        'name',
+        'created_by',
+    ],
+    default_actions=['create'],
+)
+
+BATCH_METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+MAX_BATCH_OPERATIONS = 50
+
+
+class BatchOperationSchema(ma.Schema):
+    method = mf.String(required=True, validate=ma.validate.OneOf(BATCH_METHODS))
+    path = mf.String(
+        required=True,
+        validate=ma.validate.Regexp(r'^/'),
+        description='Path of the operation, like `/comments` or `/audit_responses/<id>?fields=id`.',
+    )
+    query = mf.Dict(
+        keys=mf.String(),
+        missing=dict,
+        description='Query parameters, added to the ones in `path`.',
+    )
+    body = mf.Raw(allow_none=True, description='JSON body of POST and PUT operations.')
+    if_match = mf.String(allow_none=True, description='Sent as the If-Match header of the operation.')
+
+
+class BatchOperationResultSchema(ma.Schema):
+    status = mf.Integer(dump_only=True, description='HTTP status of the operation.')
+    body = mf.Raw(dump_only=True, allow_none=True, description='JSON response of the operation.')
+    etag = mf.String(dump_only=True, allow_none=True)
+
+
+class BatchSchema(ma.Schema):
+    operations = mf.Nested(
+        BatchOperationSchema,
+        many=True,
+        required=True,
+        load_only=True,
+        validate=ma.validate.Length(min=1, max=MAX_BATCH_OPERATIONS),
+    )
+    results = mf.Nested(
+        BatchOperationResultSchema,
+        many=True,
+        dump_only=True,
+        description='Result per operation, up to and including the first one that failed.',
+    )
+    committed = mf.Boolean(dump_only=True, description='Whether the changes of all operations were committed.')
@@ -14,6 +14,8 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'Comment',
     'CommentSchema',
@@ -60,10 +62,10 @@ class CommentPageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(CommentSchema, many=True, dump_only=True)
 
 
-class CommentListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class CommentListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter comments by name prefix.',
+        description='Used to filter comments by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -88,6 +90,33 @@ class Comment(BaseModel):
     compliance_period = relationship('CompliancePeriod')
 
 
+# Activity feed pages, newest first, see `techlock.compass.services.activity`.
+sa.Index(
+    'ix_comments_audit_id_timestamp',
+    Comment.audit_id,
+    Comment.timestamp,
+    Comment.id,
+    postgresql_where=Comment.is_active.is_(True),
+)
+sa.Index(
+    'ix_comments_compliance_period_id_timestamp',
+    Comment.compliance_period_id,
+    Comment.timestamp,
+    Comment.id,
+    postgresql_where=Comment.is_active.is_(True),
+)
+
+# Notes search within a compliance, see `techlock.compass.services.search`.
+sa.Index(
+    'ix_comments_compliance_id',
+    Comment.compliance_id,
+    postgresql_where=Comment.is_active.is_(True),
+)
+
+
+name_trgm_index(Comment)
+
+
 @dataclass
-class CommentListQueryParameters(BaseOffsetListQueryParams):
+class CommentListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = Comment
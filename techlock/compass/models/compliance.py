@@ -15,6 +15,8 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'Compliance',
     'ComplianceSchema',
@@ -60,10 +62,10 @@ class CompliancePageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(ComplianceSchema, many=True, dump_only=True)
 
 
-class ComplianceListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class ComplianceListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter compliances by name prefix.',
+        description='Used to filter compliances by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -81,6 +83,9 @@ class Compliance(BaseModel):
     plan = sa.Column(st.Enum(Plan), nullable=False)
 
 
+name_trgm_index(Compliance)
+
+
 @dataclass
-class ComplianceListQueryParameters(BaseOffsetListQueryParams):
+class ComplianceListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = Compliance
@@ -14,6 +14,7 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
 from ..models.compliance import Plan
 
 __all__ = [
@@ -51,10 +52,10 @@ class ComplianceHistoryPageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(ComplianceHistorySchema, many=True, dump_only=True)
 
 
-class ComplianceHistoryListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class ComplianceHistoryListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter compliances_history by name prefix.',
+        description='Used to filter compliances_history by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -72,6 +73,9 @@ class ComplianceHistory(BaseModel):
     plan = sa.Column(st.Enum(Plan), nullable=False)
 
 
+name_trgm_index(ComplianceHistory)
+
+
 @dataclass
-class ComplianceHistoryListQueryParameters(BaseOffsetListQueryParams):
+class ComplianceHistoryListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = ComplianceHistory
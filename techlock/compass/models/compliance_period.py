@@ -14,10 +14,13 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'CompliancePeriod',
     'CompliancePeriodSchema',
     'CompliancePeriodPageableSchema',
+    'CompliancePeriodSyncSchema',
     'CompliancePeriodListQueryParameters',
     'CompliancePeriodListQueryParametersSchema',
     'COMPLIANCE_PERIOD_CLAIM_SPEC',
@@ -54,10 +57,22 @@ class CompliancePeriodPageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(CompliancePeriodSchema, many=True, dump_only=True)
 
 
-class CompliancePeriodListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class CompliancePeriodSyncSchema(ma.Schema):
+    task_ids = mf.List(
+        mf.String(),
+        load_only=True,
+        missing=list,
+        description='Tasks to add to the compliance, in addition to the tasks it already has periods for.',
+    )
+    created = mf.Integer(dump_only=True)
+    updated = mf.Integer(dump_only=True)
+    deactivated = mf.Integer(dump_only=True)
+
+
+class CompliancePeriodListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter compliance_periods by name prefix.',
+        description='Used to filter compliance_periods by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -77,6 +92,29 @@ class CompliancePeriod(BaseModel):
     task = relationship('ComplianceTask')
 
 
+# One active period per task and start date, the conflict target of period generation.
+sa.Index(
+    'ux_compliance_periods_schedule',
+    CompliancePeriod.compliance_id,
+    CompliancePeriod.task_id,
+    CompliancePeriod.start_date,
+    unique=True,
+    postgresql_where=CompliancePeriod.is_active.is_(True),
+)
+
+
+# Open periods by due date, scanned by the overdue and due soon sweeps.
+sa.Index(
+    'ix_compliance_periods_open_end_date',
+    CompliancePeriod.tenant_id,
+    CompliancePeriod.end_date,
+    postgresql_where=CompliancePeriod.is_active.is_(True),
+)
+
+
+name_trgm_index(CompliancePeriod)
+
+
 @dataclass
-class CompliancePeriodListQueryParameters(BaseOffsetListQueryParams):
+class CompliancePeriodListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = CompliancePeriod
@@ -15,6 +15,8 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'ComplianceResponse',
     'ComplianceResponseSchema',
@@ -66,10 +68,10 @@ class ComplianceResponsePageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(ComplianceResponseSchema, many=True, dump_only=True)
 
 
-class ComplianceResponseListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class ComplianceResponseListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter compliance_responses by name prefix.',
+        description='Used to filter compliance_responses by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -86,6 +88,17 @@ class ComplianceResponse(BaseModel):
     status = sa.Column(st.Enum(Status), nullable=False)
 
 
+# Periods with a passed response are closed, checked by the overdue and due soon sweeps.
+sa.Index(
+    'ix_compliance_responses_passed_period_id',
+    ComplianceResponse.period_id,
+    postgresql_where=sa.and_(ComplianceResponse.is_active.is_(True), ComplianceResponse.status == Status.passed),
+)
+
+
+name_trgm_index(ComplianceResponse)
+
+
 @dataclass
-class ComplianceResponseListQueryParameters(BaseOffsetListQueryParams):
+class ComplianceResponseListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = ComplianceResponse
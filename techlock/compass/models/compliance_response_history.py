@@ -16,6 +16,8 @@ from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
 from techlock.compass.models.compliance_response import Phase, Status
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'ComplianceResponseHistory',
     'ComplianceResponseHistorySchema',
@@ -55,10 +57,10 @@ class ComplianceResponseHistoryPageableSchema(OffsetPageableResponseBaseSchema):
     )
 
 
-class ComplianceResponseHistoryListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class ComplianceResponseHistoryListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter compliance_responses_history by name prefix.',
+        description='Used to filter compliance_responses_history by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -76,6 +78,9 @@ class ComplianceResponseHistory(BaseModel):
     status = sa.Column(st.Enum(Status), nullable=False)
 
 
+name_trgm_index(ComplianceResponseHistory)
+
+
 @dataclass
-class ComplianceResponseHistoryListQueryParameters(BaseOffsetListQueryParams):
+class ComplianceResponseHistoryListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = ComplianceResponseHistory
@@ -14,6 +14,8 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'ComplianceTask',
     'ComplianceTaskSchema',
@@ -57,10 +59,10 @@ class ComplianceTaskPageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(ComplianceTaskSchema, many=True, dump_only=True)
 
 
-class ComplianceTaskListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class ComplianceTaskListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter compliance_tasks by name prefix.',
+        description='Used to filter compliance_tasks by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -75,6 +77,9 @@ class ComplianceTask(BaseModel):
     text = sa.Column(st.Text, nullable=False)
 
 
+name_trgm_index(ComplianceTask)
+
+
 @dataclass
-class ComplianceTaskListQueryParameters(BaseOffsetListQueryParams):
+class ComplianceTaskListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = ComplianceTask
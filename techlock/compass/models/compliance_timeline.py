@@ -14,6 +14,8 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'ComplianceTimeline',
     'ComplianceTimelineSchema',
@@ -56,10 +58,10 @@ class ComplianceTimelinePageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(ComplianceTimelineSchema, many=True, dump_only=True)
 
 
-class ComplianceTimelineListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class ComplianceTimelineListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter compliances_timeline by name prefix.',
+        description='Used to filter compliances_timeline by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -81,6 +83,9 @@ class ComplianceTimeline(BaseModel):
     compliance = relationship('Compliance')
 
 
+name_trgm_index(ComplianceTimeline)
+
+
 @dataclass
-class ComplianceTimelineListQueryParameters(BaseOffsetListQueryParams):
+class ComplianceTimelineListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = ComplianceTimeline
@@ -12,6 +12,8 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'Detail',
     'DetailSchema',
@@ -50,10 +52,10 @@ class DetailPageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(DetailSchema, many=True, dump_only=True)
 
 
-class DetailListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class DetailListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter details by name prefix.',
+        description='Used to filter details by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -71,6 +73,18 @@ class Detail(BaseModel):
     timezone = sa.Column(st.String, nullable=False)
 
 
+# Details by expiry, scanned by the expired and expiring sweeps.
+sa.Index(
+    'ix_details_compliant_until',
+    Detail.tenant_id,
+    Detail.compliant_until,
+    postgresql_where=sa.and_(Detail.is_active.is_(True), Detail.compliant_until.isnot(None)),
+)
+
+
+name_trgm_index(Detail)
+
+
 @dataclass
-class DetailListQueryParameters(BaseOffsetListQueryParams):
+class DetailListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = Detail
@@ -16,10 +16,13 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'Event',
     'EventSchema',
     'EventPageableSchema',
+    'EventBatchSchema',
     'EventListQueryParameters',
     'EventListQueryParametersSchema',
     'EVENT_CLAIM_SPEC',
@@ -77,10 +80,21 @@ class EventPageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(EventSchema, many=True, dump_only=True)
 
 
-class EventListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class EventBatchSchema(ma.Schema):
+    items = mf.Nested(
+        EventSchema,
+        many=True,
+        required=True,
+        load_only=True,
+        validate=ma.validate.Length(min=1, max=1000),
+    )
+    created = mf.Integer(dump_only=True)
+
+
+class EventListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter events by name prefix.',
+        description='Used to filter events by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -108,6 +122,26 @@ class Event(BaseModel):
     compliance_period = relationship('CompliancePeriod')
 
 
+# Activity feed pages, newest first, see `techlock.compass.services.activity`.
+sa.Index(
+    'ix_events_audit_id_timestamp',
+    Event.audit_id,
+    Event.timestamp,
+    Event.id,
+    postgresql_where=Event.is_active.is_(True),
+)
+sa.Index(
+    'ix_events_compliance_period_id_timestamp',
+    Event.compliance_period_id,
+    Event.timestamp,
+    Event.id,
+    postgresql_where=Event.is_active.is_(True),
+)
+
+
+name_trgm_index(Event)
+
+
 @dataclass
-class EventListQueryParameters(BaseOffsetListQueryParams):
+class EventListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = Event
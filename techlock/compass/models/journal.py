@@ -13,6 +13,8 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'Journal',
     'JournalSchema',
@@ -57,10 +59,10 @@ class JournalPageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(JournalSchema, many=True, dump_only=True)
 
 
-class JournalListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class JournalListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter journals by name prefix.',
+        description='Used to filter journals by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -84,6 +86,33 @@ class Journal(BaseModel):
     compliance_period = relationship('CompliancePeriod')
 
 
+# Activity feed pages, newest first, see `techlock.compass.services.activity`.
+sa.Index(
+    'ix_journals_audit_id_created_on',
+    Journal.audit_id,
+    Journal.created_on,
+    Journal.id,
+    postgresql_where=Journal.is_active.is_(True),
+)
+sa.Index(
+    'ix_journals_compliance_period_id_created_on',
+    Journal.compliance_period_id,
+    Journal.created_on,
+    Journal.id,
+    postgresql_where=Journal.is_active.is_(True),
+)
+
+# Notes search within a compliance, see `techlock.compass.services.search`.
+sa.Index(
+    'ix_journals_compliance_id',
+    Journal.compliance_id,
+    postgresql_where=Journal.is_active.is_(True),
+)
+
+
+name_trgm_index(Journal)
+
+
 @dataclass
-class JournalListQueryParameters(BaseOffsetListQueryParams):
+class JournalListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = Journal
@@ -11,6 +11,8 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'Report',
     'ReportSchema',
@@ -45,8 +47,8 @@ class ReportPageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(ReportSchema, many=True, dump_only=True)
 
 
-class ReportListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
-    name = mf.String(allow_none=True, description='Used to filter reports by name prefix.')
+class ReportListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
+    name = mf.String(allow_none=True, description='Used to filter reports by name, see `name_match`.')
 
     @ma.post_load
     def make_object(self, data, **kwargs):
@@ -61,6 +63,9 @@ class Report(BaseModel):
     )
 
 
+name_trgm_index(Report)
+
+
 @dataclass
-class ReportListQueryParameters(BaseOffsetListQueryParams):
+class ReportListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = Report
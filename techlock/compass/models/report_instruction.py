@@ -5,8 +5,8 @@ import marshmallow.fields as mf
 import sqlalchemy as sa
 import sqlalchemy.sql.sqltypes as st  # Prevent class name overlap.
 from marshmallow_enum import EnumField
-from sqlalchemy.dialects.postgresql import ARRAY, UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from techlock.common.api import (
     BaseOffsetListQueryParams,
     BaseOffsetListQueryParamsSchema,
@@ -17,12 +17,18 @@ from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
 from techlock.compass.models.report_version import Tag
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
+    'INSTRUCTION_SEARCH_TYPES',
     'ReportInstruction',
     'ReportInstructionSchema',
     'ReportInstructionPageableSchema',
     'ReportInstructionListQueryParameters',
     'ReportInstructionListQueryParametersSchema',
+    'ReportInstructionSearchPageableSchema',
+    'ReportInstructionSearchQueryParametersSchema',
+    'ReportInstructionSearchResultSchema',
     'REPORT_INSTRUCTION_CLAIM_SPEC',
 ]
 
@@ -42,6 +48,9 @@ REPORT_INSTRUCTION_CLAIM_SPEC = ClaimSpec(
     default_actions=['read'],
 )
 
+# Kinds of results of `GET /report_instructions/search`, both hold the requirement texts of a report version.
+INSTRUCTION_SEARCH_TYPES = ('report_instruction', 'report_node')
+
 
 class ReportInstructionSchema(BaseModelSchema):
     uuid = mf.String(required=True, allow_none=False)
@@ -67,10 +76,47 @@ class ReportInstructionPageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(ReportInstructionSchema, many=True, dump_only=True)
 
 
-class ReportInstructionListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class ReportInstructionSearchResultSchema(ReportInstructionSchema):
+    type = mf.String(dump_only=True, description=f'Kind of result, one of: {", ".join(INSTRUCTION_SEARCH_TYPES)}.')
+    parent_id = mf.String(dump_only=True, allow_none=True, description='Parent node of a report_node.')
+    rank = mf.Float(dump_only=True, description='How well the result matches, between 0 and 1.')
+    headline = mf.String(dump_only=True, description='Fragments of the text with the matches in `<mark>` tags.')
+
+    class Meta:
+        exclude = ('version', 'node')
+
+
+class ReportInstructionSearchPageableSchema(ma.Schema):
+    items = mf.Nested(ReportInstructionSearchResultSchema, many=True, dump_only=True)
+    offset = mf.Integer(dump_only=True)
+    limit = mf.Integer(dump_only=True)
+    total_count = mf.Integer(dump_only=True)
+
+
+class ReportInstructionSearchQueryParametersSchema(ma.Schema):
+    q = mf.String(
+        required=True,
+        validate=ma.validate.Length(min=1, max=256),
+        description='Words, "quoted phrases", `or` and `-excluded` words, like a web search.',
+    )
+    version_id = mf.List(
+        mf.UUID(),
+        missing=list,
+        description='Only search these report versions, all versions by default.',
+    )
+    types = mf.List(
+        mf.String(validate=ma.validate.OneOf(INSTRUCTION_SEARCH_TYPES)),
+        missing=list(INSTRUCTION_SEARCH_TYPES),
+        description='Kinds of results to include, all by default.',
+    )
+    offset = mf.Integer(missing=0, validate=ma.validate.Range(min=0))
+    limit = mf.Integer(missing=20, validate=ma.validate.Range(min=1, max=100))
+
+
+class ReportInstructionListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter report_instructions by name prefix.',
+        description='Used to filter report_instructions by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -96,11 +142,25 @@ class ReportInstruction(BaseModel):
     version_id = sa.Column(UUID, sa.ForeignKey('report_versions.id'))
     node_id = sa.Column(UUID, sa.ForeignKey('report_nodes.id'))
 
+    # Set by the `report_instructions_search_vector` trigger from number, name and text.
+    search_vector = deferred(sa.Column(TSVECTOR, nullable=True))
+
     version = relationship('ReportVersion')
 
     node = relationship('ReportNode', backref='instructions')
 
 
+# Full-text search of `GET /report_instructions/search`.
+sa.Index(
+    'ix_report_instructions_search_vector',
+    ReportInstruction.search_vector,
+    postgresql_using='gin',
+)
+
+
+name_trgm_index(ReportInstruction)
+
+
 @dataclass
-class ReportInstructionListQueryParameters(BaseOffsetListQueryParams):
+class ReportInstructionListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = ReportInstruction
@@ -4,8 +4,8 @@ import marshmallow as ma
 import marshmallow.fields as mf
 import sqlalchemy as sa
 import sqlalchemy.sql.sqltypes as st  # Prevent class name overlap.
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from techlock.common.api import (
     BaseOffsetListQueryParams,
     BaseOffsetListQueryParamsSchema,
@@ -16,6 +16,8 @@ from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
 from techlock.compass.models.report_version import ReportVersionSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'ReportNode',
     'ReportNodeSchema',
@@ -75,10 +77,10 @@ class ReportNodePageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(ReportNodeSchema, many=True, dump_only=True)
 
 
-class ReportNodeListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class ReportNodeListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter report_nodes by name prefix.',
+        description='Used to filter report_nodes by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -97,6 +99,9 @@ class ReportNode(BaseModel):
     parent_id = sa.Column(UUID, sa.ForeignKey('report_nodes.id'), nullable=True)
     version_id = sa.Column(UUID, sa.ForeignKey('report_versions.id'))
 
+    # Set by the `report_nodes_search_vector` trigger from number, name and text.
+    search_vector = deferred(sa.Column(TSVECTOR, nullable=True))
+
     parent = relationship(
         'ReportNode',
         remote_side=['entity_id'],
@@ -114,6 +119,17 @@ class ReportNode(BaseModel):
     )
 
 
+# Full-text search of `GET /report_instructions/search`.
+sa.Index(
+    'ix_report_nodes_search_vector',
+    ReportNode.search_vector,
+    postgresql_using='gin',
+)
+
+
+name_trgm_index(ReportNode)
+
+
 @dataclass
-class ReportNodeListQueryParameters(BaseOffsetListQueryParams):
+class ReportNodeListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = ReportNode
@@ -18,6 +18,8 @@ from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
 from techlock.compass.models.report import ReportSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'ReportVersion',
     'ReportVersionSchema',
@@ -92,10 +94,10 @@ class ReportVersionPageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(ReportVersionSchema, many=True, dump_only=True)
 
 
-class ReportVersionListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class ReportVersionListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter report_versions by name prefix.',
+        description='Used to filter report_versions by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -134,6 +136,9 @@ class ReportVersion(BaseModel):
     )
 
 
+name_trgm_index(ReportVersion)
+
+
 @dataclass
-class ReportVersionListQueryParameters(BaseOffsetListQueryParams):
+class ReportVersionListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = ReportVersion
@@ -0,0 +1,73 @@
+import marshmallow as ma
+import marshmallow.fields as mf
+from techlock.common.api import ClaimSpec
+
+__all__ = [
+    'SEARCH_TYPES',
+    'SearchResultSchema',
+    'SearchPageableSchema',
+    'SearchQueryParametersSchema',
+    'SEARCH_CLAIM_SPEC',
+]
+
+
+SEARCH_CLAIM_SPEC = ClaimSpec(
+    actions=[
+        'read',
+    ],
+    resource_name='search',
+    filter_fields=[
+        'name',
+        'created_by',
+    ],
+    default_actions=['read'],
+)
+
+SEARCH_TYPES = ('comment', 'journal', 'summary_note')
+SEARCH_SCOPE_FIELDS = ('audit_id', 'compliance_id')
+
+
+class SearchResultSchema(ma.Schema):
+    type = mf.String(dump_only=True, description=f'Kind of result, one of: {", ".join(SEARCH_TYPES)}.')
+    id = mf.String(dump_only=True)
+    name = mf.String(dump_only=True)
+    description = mf.String(dump_only=True)
+    headline = mf.String(dump_only=True, description='Fragments of the description with the matches in `<mark>` tags.')
+    rank = mf.Float(dump_only=True, description='How well the result matches, between 0 and 1.')
+    created_by = mf.String(dump_only=True)
+    created_on = mf.DateTime(dump_only=True)
+
+    audit_id = mf.String(dump_only=True)
+    compliance_id = mf.String(dump_only=True)
+
+
+class SearchPageableSchema(ma.Schema):
+    items = mf.Nested(SearchResultSchema, many=True, dump_only=True)
+    limit = mf.Integer(dump_only=True)
+    next_cursor = mf.String(
+        dump_only=True,
+        allow_none=True,
+        description='Pass as `cursor` to get the next page. Not set on the last page.',
+    )
+
+
+class SearchQueryParametersSchema(ma.Schema):
+    q = mf.String(
+        required=True,
+        validate=ma.validate.Length(min=1, max=256),
+        description='Words, "quoted phrases", `or` and `-excluded` words, like a web search.',
+    )
+    audit_id = mf.UUID(allow_none=True)
+    compliance_id = mf.UUID(allow_none=True)
+    types = mf.List(
+        mf.String(validate=ma.validate.OneOf(SEARCH_TYPES)),
+        missing=list(SEARCH_TYPES),
+        description='Kinds of results to include, all by default.',
+    )
+    cursor = mf.String(allow_none=True, description='`next_cursor` of the previous page.')
+    limit = mf.Integer(missing=20, validate=ma.validate.Range(min=1, max=100))
+
+    @ma.validates_schema
+    def validate_scope(self, data, **kwargs):
+        if not any(data.get(field) for field in SEARCH_SCOPE_FIELDS):
+            raise ma.ValidationError(f'At least one of {", ".join(SEARCH_SCOPE_FIELDS)} is required.')
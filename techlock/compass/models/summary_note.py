@@ -13,6 +13,8 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'SummaryNote',
     'SummaryNoteSchema',
@@ -53,10 +55,10 @@ class SummaryNotePageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(SummaryNoteSchema, many=True, dump_only=True)
 
 
-class SummaryNoteListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class SummaryNoteListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter summary_notes by name prefix.',
+        description='Used to filter summary_notes by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -76,6 +78,22 @@ class SummaryNote(BaseModel):
     compliance = relationship('Compliance')
 
 
+# Notes search within an audit or compliance, see `techlock.compass.services.search`.
+sa.Index(
+    'ix_summary_notes_audit_id',
+    SummaryNote.audit_id,
+    postgresql_where=SummaryNote.is_active.is_(True),
+)
+sa.Index(
+    'ix_summary_notes_compliance_id',
+    SummaryNote.compliance_id,
+    postgresql_where=SummaryNote.is_active.is_(True),
+)
+
+
+name_trgm_index(SummaryNote)
+
+
 @dataclass
-class SummaryNoteListQueryParameters(BaseOffsetListQueryParams):
+class SummaryNoteListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = SummaryNote
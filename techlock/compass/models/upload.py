@@ -14,6 +14,8 @@ from techlock.common.api import (
 )
 from techlock.common.orm.sqlalchemy import BaseModel, BaseModelSchema
 
+from ..api.filters import FilterParams, FilterSchema, name_trgm_index
+
 __all__ = [
     'Upload',
     'UploadSchema',
@@ -61,10 +63,10 @@ class UploadPageableSchema(OffsetPageableResponseBaseSchema):
     items = mf.Nested(UploadSchema, many=True, dump_only=True)
 
 
-class UploadListQueryParametersSchema(BaseOffsetListQueryParamsSchema):
+class UploadListQueryParametersSchema(FilterSchema, BaseOffsetListQueryParamsSchema):
     name = mf.String(
         allow_none=True,
-        description='Used to filter uploads by name prefix.',
+        description='Used to filter uploads by name, see `name_match`.',
     )
 
     @ma.post_load
@@ -91,6 +93,26 @@ class Upload(BaseModel):
     compliance_period = relationship('CompliancePeriod')
 
 
+# Activity feed pages, newest first, see `techlock.compass.services.activity`.
+sa.Index(
+    'ix_uploads_audit_id_timestamp',
+    Upload.audit_id,
+    Upload.timestamp,
+    Upload.id,
+    postgresql_where=Upload.is_active.is_(True),
+)
+sa.Index(
+    'ix_uploads_compliance_period_id_timestamp',
+    Upload.compliance_period_id,
+    Upload.timestamp,
+    Upload.id,
+    postgresql_where=Upload.is_active.is_(True),
+)
+
+
+name_trgm_index(Upload)
+
+
 @dataclass
-class UploadListQueryParameters(BaseOffsetListQueryParams):
+class UploadListQueryParameters(FilterParams, BaseOffsetListQueryParams):
     __db_model__ = Upload
@@ -0,0 +1,20 @@
+from .eager_loading import MAX_DEPTH, eager_load, is_expanded, loader_options
+from .query_counter import (
+    QueryCounter,
+    QueryCountExceeded,
+    count_in_parent_request,
+    count_queries,
+    init_query_counter,
+    normalize_statement,
+)
+from .scoping import capture_criteria, denied_rows, scope_criteria, scoped_query, unmatched_rows
+from .streaming import snapshot_session
+from .tenancy import (
+    current_tenant,
+    init_row_level_security,
+    maintenance_engine,
+    row_level_security_enabled,
+    set_row_level_security,
+    set_tenant_config,
+    tenant_context,
+)
@@ -0,0 +1,184 @@
+"""
+Eager loading derived from response schemas.
+
+Every `Nested` field of a response schema that maps onto a relationship of the model is loaded up front,
+`selectinload` for collections and `joinedload` for many-to-one relationships.
+This way a page of rows and all of its nested objects load in a fixed number of queries,
+instead of one query per row per relationship during serialization.
+When only a subset of fields is requested, the other columns are left out of the SELECT as well,
+except the `ALWAYS_LOADED` ones.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional, Sequence, Tuple, Type
+
+import marshmallow as ma
+import marshmallow.fields as mf
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.orm import Query, joinedload, load_only, selectinload
+
+__all__ = [
+    'ALWAYS_LOADED',
+    'MAX_DEPTH',
+    'eager_load',
+    'is_expanded',
+    'loader_options',
+    'selection_tree',
+]
+
+# Self referencing schemas, like ReportNodeSchema.children, are only loaded up to this depth.
+MAX_DEPTH = 3
+# Always loaded when only a subset of fields is requested, the ETags of `techlock.compass.api.etags` read them.
+ALWAYS_LOADED = ('id', 'changed_on')
+
+_eager_options = ContextVar('compass_eager_options', default=None)
+
+
+def is_expanded(path: str, expand: Optional[FrozenSet[str]]) -> bool:
+    """
+    Returns true if the nested field at the dotted `path` should be included.
+    `None` means everything is expanded.
+    """
+    if expand is None:
+        return True
+
+    return any(e == path or e.startswith(path + '.') for e in expand)
+
+
+def selection_tree(fields: Optional[FrozenSet[str]]) -> Optional[Dict[str, Dict]]:
+    """
+    Convert dotted field paths into a tree, `{'id', 'audit.name'}` becomes `{'id': {}, 'audit': {'name': {}}}`.
+    An empty dict selects all fields of that level, `None` selects everything.
+    """
+    if fields is None:
+        return None
+
+    tree = {}
+    for f in fields:
+        node = tree
+        for part in f.split('.'):
+            node = node.setdefault(part, {})
+
+    return tree
+
+
+def _load_only(model, schema: ma.Schema, selection: Dict[str, Dict]):
+    mapper = sa.inspect(model)
+    keys = {pk.key for pk in mapper.primary_key}
+    keys.update(key for key in ALWAYS_LOADED if key in mapper.column_attrs)
+    for name in selection:
+        field = schema.fields.get(name)
+        if field is None:
+            continue
+
+        key = field.attribute or name
+        if key in mapper.column_attrs:
+            keys.add(key)
+        elif key in mapper.relationships:
+            # Keep the foreign keys needed to load the relationship.
+            keys.update(
+                mapper.get_property_by_column(column).key
+                for column in mapper.relationships[key].local_columns
+            )
+
+    return [getattr(model, key) for key in sorted(keys)]
+
+
+def _nested_options(model, schema: ma.Schema, selection, expand, depth, parent=None, prefix=''):
+    options = []
+    if selection:
+        columns = _load_only(model, schema, selection)
+        options.append(load_only(*columns) if parent is None else parent.load_only(*columns))
+
+    if depth <= 0:
+        return options
+
+    relationships = sa.inspect(model).relationships
+    for name, field in schema.fields.items():
+        if not isinstance(field, mf.Nested):
+            continue
+
+        key = field.attribute or name
+        path = prefix + name
+        if key not in relationships or not is_expanded(path, expand):
+            continue
+        if selection is not None and name not in selection:
+            continue
+
+        relationship = relationships[key]
+        attr = getattr(model, key)
+        if parent is None:
+            option = selectinload(attr) if relationship.uselist else joinedload(attr)
+        else:
+            option = parent.selectinload(attr) if relationship.uselist else parent.joinedload(attr)
+
+        children = _nested_options(
+            relationship.mapper.class_,
+            field.schema,
+            selection.get(name) or None if selection else None,
+            expand,
+            depth - 1,
+            parent=option,
+            prefix=path + '.',
+        )
+        # Child options already contain this option as their prefix.
+        options.extend(children or [option])
+
+    return options
+
+
+@lru_cache(maxsize=512)
+def _schema_instance(schema_cls: Type[ma.Schema]) -> ma.Schema:
+    return schema_cls()
+
+
+@lru_cache(maxsize=1024)
+def loader_options(
+    model,
+    schema_cls: Type[ma.Schema],
+    fields: Optional[FrozenSet[str]] = None,
+    expand: Optional[FrozenSet[str]] = None,
+    max_depth: int = MAX_DEPTH,
+) -> Tuple:
+    """
+    Build the loader options needed to serialize `model` with `schema_cls`.
+
+    Args:
+        fields: Dotted paths of the fields that will be serialized, `None` for all.
+            Columns that are not selected are not loaded either.
+        expand: Dotted paths of the nested objects that will be serialized, `None` for all.
+    """
+    schema = _schema_instance(schema_cls)
+    return tuple(_nested_options(model, schema, selection_tree(fields), expand, max_depth))
+
+
+@event.listens_for(Query, 'before_compile', retval=True)
+def _apply_eager_options(query: Query):
+    current = _eager_options.get()
+    if current is None:
+        return query
+
+    model, options = current
+    descriptions = query.column_descriptions
+    if not options or len(descriptions) != 1 or descriptions[0]['expr'] is not model:
+        return query
+
+    return query.options(*options)
+
+
+@contextmanager
+def eager_load(model, options: Sequence):
+    """
+    Apply `options` to the queries that select `model` within the block.
+
+    Example:
+        with eager_load(Event, loader_options(Event, EventSchema)):
+            Event.get_all(...)
+    """
+    token = _eager_options.set((model, options))
+    try:
+        yield
+    finally:
+        _eager_options.reset(token)
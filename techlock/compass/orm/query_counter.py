@@ -0,0 +1,200 @@
+"""
+Per-request SQL statement counting.
+
+Nested schemas make it easy to serialize a page of models while lazily loading each relationship row by row.
+The query counter records every statement executed while a request (or a `count_queries` block) is active,
+groups them by their normalized form and reports requests that cross the configured thresholds.
+
+Modes, configured via the `QUERY_COUNT_MODE` env variable:
+    off:    Nothing is recorded.
+    warn:   Requests over the threshold are logged as warnings.
+    raise:  Requests over the threshold fail with a 500.
+
+Requests dispatched within `count_in_parent_request`, like the operations of `POST /batch`,
+count towards the request that dispatched them.
+"""
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Tuple
+
+from environs import Env
+from flask import Flask, jsonify
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+__all__ = [
+    'QueryCounter',
+    'QueryCountExceeded',
+    'count_in_parent_request',
+    'count_queries',
+    'init_query_counter',
+    'normalize_statement',
+]
+
+logger = logging.getLogger(__name__)
+
+MODES = ('off', 'warn', 'raise')
+# Stages in which the counter is enabled when no explicit mode is configured.
+DEBUG_STAGES = ('test', 'staging')
+
+_NORMALIZE_PATTERNS = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),                   # string literals
+    (re.compile(r'%\(\w+\)s|%s|:\w+'), '?'),                # bind parameters
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),                # numeric literals
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(?)'),     # IN lists of any length
+    (re.compile(r'\s+'), ' '),
+]
+
+_current_counter = ContextVar('compass_query_counter', default=None)
+_in_parent_request = ContextVar('compass_query_counter_in_parent_request', default=False)
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Collapse literals, bind parameters and whitespace so that statements that only differ in their values are grouped.
+    """
+    for pattern, replacement in _NORMALIZE_PATTERNS:
+        statement = pattern.sub(replacement, statement)
+
+    return statement.strip()
+
+
+class QueryCountExceeded(Exception):
+
+    def __init__(self, counter: 'QueryCounter'):
+        self.counter = counter
+        super().__init__(
+            f'Executed {counter.total} queries, {counter.max_repeats} of the same statement. '
+            f'Limits: {counter.threshold} total, {counter.repeat_threshold} repeats.',
+        )
+
+
+class QueryCounter:
+
+    def __init__(self, threshold: int, repeat_threshold: int):
+        self.threshold = threshold
+        self.repeat_threshold = repeat_threshold
+        self.statements = Counter()
+
+    def record(self, statement: str):
+        self.statements[normalize_statement(statement)] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.statements.values())
+
+    @property
+    def max_repeats(self) -> int:
+        return max(self.statements.values(), default=0)
+
+    @property
+    def exceeded(self) -> bool:
+        return self.total > self.threshold or self.max_repeats > self.repeat_threshold
+
+    def most_common(self, n: int = 5) -> List[Tuple[str, int]]:
+        return self.statements.most_common(n)
+
+    def to_dict(self):
+        return {
+            'total': self.total,
+            'threshold': self.threshold,
+            'repeat_threshold': self.repeat_threshold,
+            'most_common': [
+                {'statement': statement, 'count': count}
+                for statement, count in self.most_common()
+            ],
+        }
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.record(statement)
+
+
+@contextmanager
+def count_queries(threshold: int = 50, repeat_threshold: int = 10, raise_if_exceeded: bool = True):
+    """
+    Count the queries executed within the block.
+
+    Example:
+        with count_queries(threshold=5) as counter:
+            Event.get_all(...)
+    """
+    counter = QueryCounter(threshold, repeat_threshold)
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+    if raise_if_exceeded and counter.exceeded:
+        raise QueryCountExceeded(counter)
+
+
+@contextmanager
+def count_in_parent_request():
+    """
+    Requests dispatched within the block count their queries towards the current request,
+    their own before and after request hooks leave its counter alone.
+    """
+    token = _in_parent_request.set(True)
+    try:
+        yield
+    finally:
+        _in_parent_request.reset(token)
+
+
+def init_query_counter(app: Flask, mode: str = None):
+    """
+    Count the statements of every request of `app` and report them in the `X-Query-Count` response header.
+
+    Only statements executed before the view returns are counted. Streamed responses, like exports
+    and the compliance matrix, run their queries while the body is sent, after the header was set.
+    """
+    env = Env()
+    if mode is None:
+        default_mode = 'warn' if env.str('STAGE', '').lower() in DEBUG_STAGES else 'off'
+        mode = env.str('QUERY_COUNT_MODE', default_mode).lower()
+    if mode not in MODES:
+        raise ValueError(f'Invalid QUERY_COUNT_MODE: {mode}. Allowed values: {MODES}')
+    if mode == 'off':
+        return
+
+    threshold = env.int('QUERY_COUNT_THRESHOLD', 50)
+    repeat_threshold = env.int('QUERY_REPEAT_THRESHOLD', 10)
+    logger.info('Query counter enabled', extra={
+        'mode': mode,
+        'threshold': threshold,
+        'repeat_threshold': repeat_threshold,
+    })
+
+    @app.before_request
+    def start_counting():
+        if _in_parent_request.get():
+            return
+        _current_counter.set(QueryCounter(threshold, repeat_threshold))
+
+    @app.after_request
+    def check_query_count(response):
+        if _in_parent_request.get():
+            return response
+        counter = _current_counter.get()
+        _current_counter.set(None)
+        if counter is None:
+            return response
+
+        response.headers['X-Query-Count'] = str(counter.total)
+        if not counter.exceeded:
+            return response
+
+        logger.warning('Query count exceeded', extra=counter.to_dict())
+        if mode == 'raise':
+            response = jsonify(message=str(QueryCountExceeded(counter)), queries=counter.to_dict())
+            response.status_code = 500
+
+        return response
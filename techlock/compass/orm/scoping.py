@@ -0,0 +1,170 @@
+"""
+Tenant and claim scoping for hand written queries.
+
+`BaseModel.get_all` filters every query by tenant, by `is_active` and by the claims of the current user,
+but only returns pages of objects. Endpoints that stream, aggregate or batch need that same filter on their own query.
+Instead of reimplementing the claim rules, `scope_criteria` lets `get_all` build its query
+and captures the WHERE clause right before it would be compiled, without executing anything.
+The same clause checks objects that are not written yet, see `denied_rows`.
+"""
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import ClauseElement, visitors
+from techlock.common.api.auth.claim import ClaimSet
+from techlock.common.config import AuthInfo
+from techlock.common.orm.sqlalchemy import db
+
+from ..cache import LRUCache
+
+__all__ = [
+    'capture_criteria',
+    'denied_rows',
+    'scope_criteria',
+    'scoped_query',
+    'unmatched_rows',
+]
+
+_capture = ContextVar('compass_capture_criteria', default=None)
+
+# Criteria per (claims cache key, model), for ClaimSets that have a `cache_key`, see `techlock.compass.api.claims`.
+_criteria_cache = LRUCache(maxsize=1024)
+
+
+class _Captured(Exception):
+    def __init__(self, criteria: Optional[ClauseElement]):
+        super().__init__('criteria captured')
+        self.criteria = criteria
+
+
+@event.listens_for(Query, 'before_compile', retval=True)
+def _capture_criteria(query: Query):
+    model = _capture.get()
+    if model is None:
+        return query
+
+    descriptions = query.column_descriptions
+    if len(descriptions) == 1 and descriptions[0]['expr'] is model:
+        raise _Captured(query.whereclause)
+
+    return query
+
+
+def capture_criteria(model, load: Callable) -> Optional[ClauseElement]:
+    """
+    Call `load` up to the moment it compiles its first query that selects `model`,
+    and return that query's WHERE clause. The query is never executed.
+
+    Example:
+        criteria = capture_criteria(Event, lambda: Event.get_all(current_user, claims=claims))
+    """
+    token = _capture.set(model)
+    try:
+        load()
+    except _Captured as e:
+        return e.criteria
+    finally:
+        _capture.reset(token)
+
+    raise RuntimeError(f'{model.__name__} was not queried.')
+
+
+def scope_criteria(
+    model,
+    current_user: AuthInfo,
+    claims: ClaimSet,
+    additional_filters: List = None,
+) -> Optional[ClauseElement]:
+    """
+    Returns the WHERE clause `model.get_all` uses for `current_user` and `claims`, including `additional_filters`.
+    Without additional filters the clause is cached per token.
+    """
+    def load():
+        return capture_criteria(model, lambda: model.get_all(
+            current_user,
+            offset=0,
+            limit=1,
+            additional_filters=additional_filters,
+            claims=claims,
+        ))
+
+    cache_key = getattr(claims, 'cache_key', None)
+    if cache_key is None or additional_filters:
+        return load()
+
+    return _criteria_cache.get_or_set((cache_key, model), load)
+
+
+def scoped_query(
+    model,
+    current_user: AuthInfo,
+    claims: ClaimSet,
+    additional_filters: List = None,
+    session=None,
+) -> Query:
+    """
+    Returns a query for `model`, filtered like `model.get_all`, on `session` or the request's session.
+    """
+    session = session or db.session
+    query = session.query(model)
+    criteria = scope_criteria(model, current_user, claims, additional_filters=additional_filters)
+    if criteria is not None:
+        query = query.filter(criteria)
+
+    return query
+
+
+def denied_rows(
+    model,
+    current_user: AuthInfo,
+    claims: ClaimSet,
+    rows: List[Dict[str, Any]],
+    session=None,
+) -> List[int]:
+    """
+    Returns the indexes of `rows`, dicts of `model` columns, that `model.get_all` would not return
+    for `current_user` and `claims`. For checking rows that are inserted without loading objects.
+    """
+    criteria = scope_criteria(model, current_user, claims)
+    return unmatched_rows(model, criteria, rows, session=session)
+
+
+def unmatched_rows(model, criteria: Optional[ClauseElement], rows: List[Dict[str, Any]], session=None) -> List[int]:
+    """
+    Returns the indexes of `rows`, dicts of `model` columns, that don't match `criteria` on `model`.
+    The rows are checked in one statement, against a VALUES list, no table is read.
+    """
+    if criteria is None or not rows:
+        return []
+
+    table = model.__table__
+    names = {
+        element.key
+        for element in visitors.iterate(criteria)
+        if isinstance(element, sa.Column) and element.table is table
+    }
+    columns = [column for column in table.columns if column.key in names]
+    candidates = sa.values(
+        sa.column('index', sa.Integer),
+        *(sa.column(column.key, column.type) for column in columns),
+        name='candidates',
+    ).data([
+        (index, *(row.get(column.key) for column in columns))
+        for index, row in enumerate(rows)
+    ])
+
+    def replace(element):
+        if isinstance(element, sa.Column) and element.table is table:
+            return candidates.c[element.key]
+        return None
+
+    matches = visitors.replacement_traverse(criteria, {}, replace)
+    statement = sa.select(candidates.c.index).where(
+        sa.not_(sa.func.coalesce(matches, False)),
+    ).order_by(candidates.c.index)
+
+    session = session or db.session
+    return [index for index, in session.execute(statement)]
@@ -0,0 +1,44 @@
+"""
+Sessions for responses that are streamed.
+
+A streamed response body is generated after the view returned, when the request and app contexts are already gone,
+along with the request's session and `db.engine`. The view resolves the engine and passes it to the generator,
+`snapshot_session` gives the generator its own connection, with a REPEATABLE READ transaction
+so every row comes from the same snapshot, scoped to the tenant in row level security mode.
+
+    def _stream(engine, tenant_id):
+        with snapshot_session(engine, tenant_id) as session:
+            ...
+
+    return Response(_stream(db.engine, current_tenant()))
+"""
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .tenancy import row_level_security_enabled, set_tenant_config
+
+__all__ = [
+    'snapshot_session',
+]
+
+
+@contextmanager
+def snapshot_session(engine: Engine, tenant_id: str = None) -> Iterator[Session]:
+    """
+    Yields a read only session on its own connection of `engine`, the transaction is rolled back when the block exits.
+    """
+    connection = engine.connect().execution_options(isolation_level='REPEATABLE READ')
+    transaction = connection.begin()
+    if row_level_security_enabled() and tenant_id is not None:
+        # The request context is gone by the time the body is streamed, scope the connection up front.
+        set_tenant_config(connection, tenant_id)
+    session = Session(bind=connection)
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
@@ -0,0 +1,149 @@
+"""
+Row level security mode.
+
+Every tenant table has a `tenant_isolation` policy, see migration `c7a1e5f3b9d2`, which only matches the rows of
+the tenant in the `app.tenant_id` setting. The policies are disabled until `flask row-level-security on`
+enables them, deployments that don't opt in are not affected.
+
+With `ROW_LEVEL_SECURITY=true`, every transaction started while handling a request sets `app.tenant_id`
+to the tenant of the current user, so the enabled policies hide the rows of all other tenants from every query,
+including hand written ones. Transactions started without a tenant see no rows at all.
+Migrations and background jobs that work across tenants connect with `maintenance_engine`, as a role with BYPASSRLS,
+configured with `MAINTENANCE_DATABASE_URI`.
+
+Note that superusers bypass row level security, the service must connect as a regular role for it to apply.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+import click
+from environs import Env
+from flask import Flask
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from techlock.common.orm.sqlalchemy import db
+
+__all__ = [
+    'TENANT_POLICY',
+    'TENANT_SETTING',
+    'current_tenant',
+    'init_row_level_security',
+    'maintenance_engine',
+    'row_level_security_enabled',
+    'set_row_level_security',
+    'set_tenant_config',
+    'tenant_context',
+]
+
+logger = logging.getLogger(__name__)
+
+TENANT_SETTING = 'app.tenant_id'
+TENANT_POLICY = 'tenant_isolation'
+
+_POLICY_TABLES = text(
+    'SELECT tablename FROM pg_policies WHERE schemaname = current_schema() AND policyname = :policy ORDER BY tablename',
+)
+
+_enabled = False
+_current_tenant = ContextVar('compass_current_tenant', default=None)
+_maintenance_engine = None
+_maintenance_engine_lock = threading.Lock()
+
+
+def row_level_security_enabled() -> bool:
+    return _enabled
+
+
+def current_tenant() -> Optional[str]:
+    return _current_tenant.get()
+
+
+def set_tenant_config(connection, tenant_id: Optional[str]):
+    """
+    Set `app.tenant_id` for the current transaction of `connection`.
+    """
+    connection.execute(
+        text('SELECT set_config(:setting, :tenant_id, true)'),
+        {'setting': TENANT_SETTING, 'tenant_id': tenant_id or ''},
+    )
+
+
+def maintenance_engine() -> Optional[Engine]:
+    """
+    Returns the engine of `MAINTENANCE_DATABASE_URI`, `None` when it is not configured.
+    Its role must have BYPASSRLS, the policies hide every row from transactions without a tenant.
+    """
+    global _maintenance_engine
+
+    with _maintenance_engine_lock:
+        if _maintenance_engine is None:
+            uri = Env().str('MAINTENANCE_DATABASE_URI', None)
+            if uri:
+                _maintenance_engine = create_engine(uri)
+
+        return _maintenance_engine
+
+
+def set_row_level_security(engine: Engine, enabled: bool) -> List[str]:
+    """
+    Enable, and force for the table owner, or disable the tenant isolation policies. Returns the tables.
+    """
+    with engine.begin() as connection:
+        quote = connection.dialect.identifier_preparer.quote
+        tables = [row[0] for row in connection.execute(_POLICY_TABLES, {'policy': TENANT_POLICY})]
+        for table in tables:
+            if enabled:
+                connection.execute(text(f'ALTER TABLE {quote(table)} ENABLE ROW LEVEL SECURITY'))
+                connection.execute(text(f'ALTER TABLE {quote(table)} FORCE ROW LEVEL SECURITY'))
+            else:
+                connection.execute(text(f'ALTER TABLE {quote(table)} NO FORCE ROW LEVEL SECURITY'))
+                connection.execute(text(f'ALTER TABLE {quote(table)} DISABLE ROW LEVEL SECURITY'))
+
+    return tables
+
+
+@event.listens_for(Session, 'after_begin')
+def _set_tenant_on_begin(session, transaction, connection):
+    if not _enabled:
+        return
+
+    tenant_id = _current_tenant.get()
+    if tenant_id is not None:
+        set_tenant_config(connection, tenant_id)
+
+
+@contextmanager
+def tenant_context(tenant_id: Optional[str], session: Session = None):
+    """
+    Scope the transactions started within the block to `tenant_id`.
+    If `session` is already in a transaction, that transaction is scoped as well.
+    """
+    token = _current_tenant.set(tenant_id)
+    try:
+        if _enabled and session is not None and tenant_id is not None and session.in_transaction():
+            set_tenant_config(session.connection(), tenant_id)
+        yield
+    finally:
+        _current_tenant.reset(token)
+
+
+def init_row_level_security(app: Flask, enabled: bool = None):
+    global _enabled
+
+    if enabled is None:
+        enabled = Env().bool('ROW_LEVEL_SECURITY', False)
+
+    _enabled = enabled
+    if enabled:
+        logger.info('Row level security enabled', extra={'setting': TENANT_SETTING})
+
+    @app.cli.command('row-level-security')
+    @click.argument('state', type=click.Choice(['on', 'off']))
+    def row_level_security_command(state: str):
+        """Enable or disable the tenant isolation policies, enable them before setting ROW_LEVEL_SECURITY."""
+        tables = set_row_level_security(maintenance_engine() or db.engine, state == 'on')
+        click.echo(f'Row level security {state} for {len(tables)} tables.')
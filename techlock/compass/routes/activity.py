@@ -0,0 +1,55 @@
+import logging
+from typing import Any, Dict
+
+from flask.views import MethodView
+from flask_smorest import Blueprint
+from techlock.common.api.auth.claim import ClaimSet
+from techlock.common.config import AuthInfo
+from techlock.common.orm.sqlalchemy import db
+
+from ..api import access_required, claim_criteria, json_response
+from ..models import ACTIVITY_CLAIM_SPEC as claim_spec
+from ..models import (
+    COMMENT_CLAIM_SPEC,
+    EVENT_CLAIM_SPEC,
+    JOURNAL_CLAIM_SPEC,
+    UPLOAD_CLAIM_SPEC,
+    ActivityPageableSchema,
+    ActivityQueryParametersSchema,
+)
+from ..models.activity import SCOPE_FIELDS
+from ..services import ACTIVITY_MODELS, activity_page
+
+logger = logging.getLogger(__name__)
+
+blp = Blueprint('activity', __name__, url_prefix='/activity')
+
+_CLAIM_SPECS = {
+    'event': EVENT_CLAIM_SPEC,
+    'comment': COMMENT_CLAIM_SPEC,
+    'journal': JOURNAL_CLAIM_SPEC,
+    'upload': UPLOAD_CLAIM_SPEC,
+}
+
+
+@blp.route('')
+class Activity(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=ActivityQueryParametersSchema, location='query')
+    @blp.response(status_code=200, schema=ActivityPageableSchema)
+    def get(self, query_params: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('GET activity')
+        scope = {k: query_params[k] for k in SCOPE_FIELDS if query_params.get(k)}
+
+        page = activity_page(
+            db.session,
+            current_user.tenant_id,
+            scope,
+            claim_criteria(current_user, ACTIVITY_MODELS, _CLAIM_SPECS, query_params['types']),
+            types=query_params['types'],
+            cursor=query_params.get('cursor'),
+            limit=query_params['limit'],
+        )
+
+        return json_response(page)
@@ -4,11 +4,21 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import AUDIT_RESPONSE_CLAIM_SPEC as claim_spec
 from ..models import (
     AuditResponse,
@@ -17,6 +27,8 @@ from ..models import (
     AuditResponsePageableSchema,
     AuditResponseSchema,
 )
+from ..models.event import Type as EventType
+from ..services import emit_event
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +43,9 @@ class AuditResponses(MethodView):
         schema=AuditResponseListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(AuditResponseSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=AuditResponsePageableSchema)
+    @fieldsets(AuditResponse, AuditResponsePageableSchema)
     def get(self, query_params: AuditResponseListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET audit_responses')
         pageable_resp = AuditResponse.get_all(
@@ -54,12 +68,52 @@ class AuditResponses(MethodView):
 
         audit_history = AuditResponse(**data)
 
+        emit_event(EventType.create, current_user, obj=audit_history)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         audit_history.save(current_user, claims=claims, commit=not dry_run)
 
         return audit_history
 
 
+@blp.route('/export')
+class AuditResponsesExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=AuditResponseListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: AuditResponseListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting audit_responses', extra={'format': export_format})
+        return export_response(
+            AuditResponse,
+            AuditResponseSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class AuditResponsesBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(AuditResponseSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(AuditResponseSchema))
+    @fieldsets(AuditResponse, batch_get_schema(AuditResponseSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting audit_responses', extra={'count': len(data['ids'])})
+        return batch_get(AuditResponse, current_user, claims, data['ids'])
+
+
 @blp.route('/<audit_history_id>')
 class AuditResponseById(MethodView):
 
@@ -74,7 +128,9 @@ class AuditResponseById(MethodView):
         return audit_history
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(AuditResponseSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=AuditResponseSchema)
+    @fieldsets(AuditResponse, AuditResponseSchema)
     def get(self, audit_history_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting audit_history', extra={'id': audit_history_id})
         audit_history = self.get_audit_history(
@@ -98,12 +154,16 @@ class AuditResponseById(MethodView):
             audit_history_id,
         )
 
+        check_if_match(audit_history)
+
         for k, v in data.items():
             if hasattr(audit_history, k):
                 setattr(audit_history, k, v)
             else:
                 raise BadRequestException(f'AuditResponse has no attribute: {k}')
 
+        emit_event(EventType.update, current_user, obj=audit_history)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         audit_history.save(
             current_user,
@@ -125,6 +185,8 @@ class AuditResponseById(MethodView):
             audit_history_id,
         )
 
+        emit_event(EventType.delete, current_user, obj=audit_history)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         audit_history.delete(
             current_user,
@@ -1,11 +1,21 @@
 import logging
+from typing import Any, Dict
 
 from flask.views import MethodView
 from flask_smorest import Blueprint
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import AUDIT_RESPONSE_CLAIM_SPEC as claim_spec
 from ..models import (
     AuditResponseHistory,
@@ -32,7 +42,9 @@ class AuditResponseHistorys(MethodView):
         schema=AuditResponseHistoryListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(AuditResponseHistorySchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=AuditResponseHistoryPageableSchema)
+    @fieldsets(AuditResponseHistory, AuditResponseHistoryPageableSchema)
     def get(self, query_params: AuditResponseHistoryListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET audit_responses_history')
         pageable_resp = AuditResponseHistory.get_all(
@@ -47,6 +59,44 @@ class AuditResponseHistorys(MethodView):
         return pageable_resp
 
 
+@blp.route('/export')
+class AuditResponseHistorysExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=AuditResponseHistoryListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: AuditResponseHistoryListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting audit_responses_history', extra={'format': export_format})
+        return export_response(
+            AuditResponseHistory,
+            AuditResponseHistorySchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class AuditResponseHistorysBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(AuditResponseHistorySchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(AuditResponseHistorySchema))
+    @fieldsets(AuditResponseHistory, batch_get_schema(AuditResponseHistorySchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting audit_responses_history', extra={'count': len(data['ids'])})
+        return batch_get(AuditResponseHistory, current_user, claims, data['ids'])
+
+
 @blp.route('/<audit_history_id>')
 class AuditResponseHistoryById(MethodView):
 
@@ -61,7 +111,9 @@ class AuditResponseHistoryById(MethodView):
         return audit_history
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(AuditResponseHistorySchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=AuditResponseHistorySchema)
+    @fieldsets(AuditResponseHistory, AuditResponseHistorySchema)
     def get(self, audit_history_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting audit_history', extra={'id': audit_history_id})
         audit_history = self.get_audit_history(
@@ -1,34 +1,72 @@
+import json
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
+import sqlalchemy as sa
+from flask import Response, request, stream_with_context
 from flask.views import MethodView
-from flask_smorest import Blueprint
+from flask_smorest import Blueprint, abort
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
+from techlock.common.orm.sqlalchemy import db
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    claim_criteria,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+    isoformat,
+    json_response,
+)
 from ..models import AUDIT_CLAIM_SPEC as claim_spec
 from ..models import (
+    AUDIT_RESPONSE_CLAIM_SPEC,
+    COMMENT_CLAIM_SPEC,
+    EVENT_CLAIM_SPEC,
     Audit,
+    AuditChangesQueryParametersSchema,
     AuditListQueryParameters,
     AuditListQueryParametersSchema,
     AuditPageableSchema,
+    AuditResponse,
     AuditSchema,
+    AuditSummaryListSchema,
 )
+from ..models.event import Type as EventType
+from ..models.report_version import Compliance as ComplianceStatus
+from ..orm import scope_criteria
+from ..services import CHANGE_KINDS, STREAM_ID, change_feed, emit_event, readable_changes
 
 logger = logging.getLogger(__name__)
 
 blp = Blueprint('audits', __name__, url_prefix='/audits')
 
+_SUMMARY_MODELS = {'audit_response': AuditResponse}
+_SUMMARY_CLAIM_SPECS = {'audit_response': AUDIT_RESPONSE_CLAIM_SPEC}
+_CHANGE_MODELS = {kind: model for model, (kind, _) in CHANGE_KINDS.items()}
+_CHANGE_CLAIM_SPECS = {
+    'audit_response': AUDIT_RESPONSE_CLAIM_SPEC,
+    'comment': COMMENT_CLAIM_SPEC,
+    'event': EVENT_CLAIM_SPEC,
+}
+
 
 @blp.route('')
 class Audits(MethodView):
 
     @access_required('read', claim_spec=claim_spec)
     @blp.arguments(schema=AuditListQueryParametersSchema, location='query')
+    @blp.arguments(field_selection_schema(AuditSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=AuditPageableSchema)
+    @fieldsets(Audit, AuditPageableSchema)
     def get(self, query_params: AuditListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET audits')
         pageable_resp = Audit.get_all(
@@ -51,12 +89,210 @@ class Audits(MethodView):
 
         audit = Audit(**data)
 
+        emit_event(EventType.create, current_user, obj=audit)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         audit.save(current_user, claims=claims, commit=not dry_run)
 
         return audit
 
 
+@blp.route('/export')
+class AuditsExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=AuditListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(self, query_params: AuditListQueryParameters, export_format: str, current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Exporting audits', extra={'format': export_format})
+        return export_response(
+            Audit,
+            AuditSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+def _readable_responses(criteria: Dict[str, Any]):
+    if 'audit_response' not in criteria:
+        return sa.false()
+
+    return criteria['audit_response'] if criteria['audit_response'] is not None else sa.true()
+
+
+@blp.route('/summary')
+class AuditsSummary(MethodView):
+    """
+    Phase, dates and compliance counts of every audit matching the filters, paging parameters are ignored.
+    All counts come from a single grouped query, see index `ix_audit_responses_audit_id_compliance`.
+    Only the audit responses the user can read are counted, all counts are 0 without access to audit responses.
+
+    The summaries are built as plain dicts and returned with `json_response`,
+    `AuditSummaryListSchema` only documents the response, it is not used to dump it.
+    """
+
+    def summary_query(
+        self,
+        session,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+        response_criteria: Dict[str, Any],
+        additional_filters=None,
+    ):
+        """
+        `response_criteria` are the claim criteria of audit responses, see `claim_criteria`.
+        """
+        counts = [
+            sa.func.count(AuditResponse.compliance).filter(AuditResponse.compliance == compliance).label(compliance.name)
+            for compliance in ComplianceStatus
+        ]
+        query = session.query(
+            Audit.id,
+            Audit.name,
+            Audit.phase,
+            Audit.start_date,
+            Audit.estimated_remediation_date,
+            Audit.remediation_date,
+            Audit.estimated_end_date,
+            Audit.end_date,
+            sa.func.count(AuditResponse.compliance).label('total_responses'),
+            *counts,
+        ).outerjoin(
+            AuditResponse,
+            sa.and_(
+                AuditResponse.audit_id == Audit.id,
+                AuditResponse.is_active.is_(True),
+                _readable_responses(response_criteria),
+            ),
+        ).group_by(Audit.id).order_by(Audit.name, Audit.id)
+
+        criteria = scope_criteria(Audit, current_user, claims, additional_filters=additional_filters)
+        if criteria is not None:
+            query = query.filter(criteria)
+
+        return query
+
+    def summary(self, row) -> Dict[str, Any]:
+        return {
+            'id': str(row.id),
+            'name': row.name,
+            'phase': row.phase.name if row.phase is not None else None,
+            'start_date': isoformat(row.start_date),
+            'estimated_remediation_date': isoformat(row.estimated_remediation_date),
+            'remediation_date': isoformat(row.remediation_date),
+            'estimated_end_date': isoformat(row.estimated_end_date),
+            'end_date': isoformat(row.end_date),
+            'total_responses': row.total_responses,
+            'compliance': {compliance.name: getattr(row, compliance.name) for compliance in ComplianceStatus},
+        }
+
+    def get_summaries(self, current_user: AuthInfo, claims: ClaimSet, additional_filters=None) -> List[Dict[str, Any]]:
+        query = self.summary_query(
+            db.session,
+            current_user,
+            claims,
+            claim_criteria(current_user, _SUMMARY_MODELS, _SUMMARY_CLAIM_SPECS),
+            additional_filters=additional_filters,
+        )
+        return [self.summary(row) for row in query]
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=AuditListQueryParametersSchema, location='query')
+    @blp.response(status_code=200, schema=AuditSummaryListSchema)
+    def get(self, query_params: AuditListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
+        logger.info('GET audits summary')
+        summaries = self.get_summaries(current_user, claims, additional_filters=query_params.get_filters())
+
+        return json_response({'items': summaries})
+
+
+@blp.route('/batch_get')
+class AuditsBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(AuditSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(AuditSchema))
+    @fieldsets(Audit, batch_get_schema(AuditSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting audits', extra={'count': len(data['ids'])})
+        return batch_get(Audit, current_user, claims, data['ids'])
+
+
+@blp.route('/<audit_id>/changes')
+class AuditChanges(MethodView):
+    """
+    Changes of the audit's responses, comments and events, see `techlock.compass.services.change_feed`.
+    """
+
+    def readable(self, criteria: Dict[str, Any]):
+        def allow(changes):
+            try:
+                return readable_changes(changes, criteria, db.session)
+            finally:
+                # Release the session's connection, it is not needed while waiting for changes.
+                db.session.close()
+
+        return allow
+
+    def poll(self, feed, audit_id: str, last_id: str, wait: int, allow) -> Dict[str, Any]:
+        reset = last_id is not None and feed.is_trimmed(audit_id, last_id)
+        if last_id is None or reset:
+            last_id = feed.last_id(audit_id)
+
+        changes = feed.read(audit_id, last_id, block=wait)
+        if changes:
+            last_id = changes[-1][0]
+
+        return {
+            'changes': [{'event_id': entry_id, **json.loads(data)} for entry_id, data in allow(changes)],
+            'last_event_id': last_id,
+            'reset': reset,
+        }
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(AuditChangesQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(self, mode: str, wait: int, audit_id: str, current_user: AuthInfo, claims: ClaimSet, last_event_id: str = None):
+        logger.info('Following audit changes', extra={'id': audit_id, 'mode': mode})
+        feed = change_feed()
+        if feed is None:
+            abort(503, message='The change feed is not enabled.')
+
+        audit = Audit.get(
+            current_user,
+            audit_id,
+            claims=claims,
+            raise_if_not_found=True,
+        )
+
+        last_id = last_event_id or request.headers.get('Last-Event-ID')
+        if last_id is not None and not STREAM_ID.match(last_id):
+            raise BadRequestException(f'Invalid Last-Event-ID: {last_id}')
+        allow = self.readable(claim_criteria(current_user, _CHANGE_MODELS, _CHANGE_CLAIM_SPECS))
+        # Release the session's connection, it is not needed while waiting for changes.
+        db.session.close()
+
+        if mode == 'poll':
+            return json_response(self.poll(feed, str(audit.id), last_id, wait, allow))
+
+        if not feed.acquire_stream():
+            abort(503, message='Too many change feed streams, use mode=poll.', headers={'Retry-After': '30'})
+
+        # The request context stays around while streaming, for the claim checks of the changes.
+        response = Response(
+            stream_with_context(feed.stream(str(audit.id), last_id, allow=allow)),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        )
+        response.call_on_close(feed.release_stream)
+
+        return response
+
+
 @blp.route('/<audit_id>')
 class AuditById(MethodView):
 
@@ -71,7 +307,9 @@ class AuditById(MethodView):
         return audit
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(AuditSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=AuditSchema)
+    @fieldsets(Audit, AuditSchema)
     def get(self, audit_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting audit', extra={'id': audit_id})
         audit = self.get_audit(current_user, claims, audit_id)
@@ -91,12 +329,16 @@ class AuditById(MethodView):
             audit_id,
         )
 
+        check_if_match(audit)
+
         for k, v in data.items():
             if hasattr(audit, k):
                 setattr(audit, k, v)
             else:
                 raise BadRequestException(f'Audit has no attribute: {k}')
 
+        emit_event(EventType.update, current_user, obj=audit)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         audit.save(
             current_user,
@@ -118,6 +360,8 @@ class AuditById(MethodView):
             audit_id,
         )
 
+        emit_event(EventType.delete, current_user, obj=audit)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         audit.delete(
             current_user,
@@ -4,11 +4,21 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import AUDIT_HISTORY_CLAIM_SPEC as claim_spec
 from ..models import (
     AuditHistory,
@@ -31,7 +41,9 @@ class AuditHistorys(MethodView):
         schema=AuditHistoryListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(AuditHistorySchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=AuditHistoryPageableSchema)
+    @fieldsets(AuditHistory, AuditHistoryPageableSchema)
     def get(self, query_params: AuditHistoryListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET audits_history')
         pageable_resp = AuditHistory.get_all(
@@ -60,6 +72,44 @@ class AuditHistorys(MethodView):
         return audit_history
 
 
+@blp.route('/export')
+class AuditHistorysExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=AuditHistoryListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: AuditHistoryListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting audits_history', extra={'format': export_format})
+        return export_response(
+            AuditHistory,
+            AuditHistorySchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class AuditHistorysBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(AuditHistorySchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(AuditHistorySchema))
+    @fieldsets(AuditHistory, batch_get_schema(AuditHistorySchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting audits_history', extra={'count': len(data['ids'])})
+        return batch_get(AuditHistory, current_user, claims, data['ids'])
+
+
 @blp.route('/<audit_history_id>')
 class AuditHistoryById(MethodView):
 
@@ -74,7 +124,9 @@ class AuditHistoryById(MethodView):
         return audit_history
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(AuditHistorySchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=AuditHistorySchema)
+    @fieldsets(AuditHistory, AuditHistorySchema)
     def get(self, audit_history_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting audit_history', extra={'id': audit_history_id})
         audit_history = self.get_audit_history(
@@ -98,6 +150,8 @@ class AuditHistoryById(MethodView):
             audit_history_id,
         )
 
+        check_if_match(audit_history)
+
         for k, v in data.items():
             if hasattr(audit_history, k):
                 setattr(audit_history, k, v)
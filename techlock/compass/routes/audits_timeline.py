@@ -4,11 +4,21 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import AUDIT_TIMELINE_CLAIM_SPEC as claim_spec
 from ..models import (
     AuditTimeline,
@@ -31,7 +41,9 @@ class AuditTimelines(MethodView):
         schema=AuditTimelineListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(AuditTimelineSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=AuditTimelinePageableSchema)
+    @fieldsets(AuditTimeline, AuditTimelinePageableSchema)
     def get(self, query_params: AuditTimelineListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET audits_timeline')
         pageable_resp = AuditTimeline.get_all(
@@ -60,6 +72,44 @@ class AuditTimelines(MethodView):
         return audit
 
 
+@blp.route('/export')
+class AuditTimelinesExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=AuditTimelineListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: AuditTimelineListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting audits_timeline', extra={'format': export_format})
+        return export_response(
+            AuditTimeline,
+            AuditTimelineSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class AuditTimelinesBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(AuditTimelineSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(AuditTimelineSchema))
+    @fieldsets(AuditTimeline, batch_get_schema(AuditTimelineSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting audits_timeline', extra={'count': len(data['ids'])})
+        return batch_get(AuditTimeline, current_user, claims, data['ids'])
+
+
 @blp.route('/<audit_id>')
 class AuditTimelineById(MethodView):
 
@@ -74,7 +124,9 @@ class AuditTimelineById(MethodView):
         return audit
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(AuditTimelineSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=AuditTimelineSchema)
+    @fieldsets(AuditTimeline, AuditTimelineSchema)
     def get(self, audit_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting audit', extra={'id': audit_id})
         audit = self.get_audit(current_user, claims, audit_id)
@@ -94,6 +146,8 @@ class AuditTimelineById(MethodView):
             audit_id,
         )
 
+        check_if_match(audit)
+
         for k, v in data.items():
             if hasattr(audit, k):
                 setattr(audit, k, v)
@@ -0,0 +1,33 @@
+import logging
+from typing import Any, Dict
+
+from flask import current_app
+from flask.views import MethodView
+from flask_smorest import Blueprint
+from techlock.common.api.auth.claim import ClaimSet
+from techlock.common.api.models.dry_run import DryRunSchema
+from techlock.common.config import AuthInfo
+
+from ..api import access_required, json_response
+from ..models import BATCH_CLAIM_SPEC as claim_spec
+from ..models import BatchSchema
+from ..services import run_batch
+
+logger = logging.getLogger(__name__)
+
+blp = Blueprint('batch', __name__, url_prefix='/batch')
+
+
+@blp.route('')
+class Batch(MethodView):
+
+    @access_required('create', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchSchema)
+    @blp.arguments(DryRunSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=BatchSchema)
+    def post(self, data: Dict[str, Any], dry_run: bool, current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Running batch', extra={'operations': len(data['operations']), 'dry_run': dry_run})
+
+        result = run_batch(current_app._get_current_object(), data['operations'], dry_run=dry_run)
+
+        return json_response(result)
@@ -4,11 +4,21 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import COMMENT_CLAIM_SPEC as claim_spec
 from ..models import (
     Comment,
@@ -17,6 +27,8 @@ from ..models import (
     CommentPageableSchema,
     CommentSchema,
 )
+from ..models.event import Type as EventType
+from ..services import emit_event
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +40,9 @@ class Comments(MethodView):
 
     @access_required('read', claim_spec=claim_spec)
     @blp.arguments(schema=CommentListQueryParametersSchema, location='query')
+    @blp.arguments(field_selection_schema(CommentSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=CommentPageableSchema)
+    @fieldsets(Comment, CommentPageableSchema)
     def get(self, query_params: CommentListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET comments')
         pageable_resp = Comment.get_all(
@@ -51,12 +65,52 @@ class Comments(MethodView):
 
         comment = Comment(**data)
 
+        emit_event(EventType.create, current_user, obj=comment)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         comment.save(current_user, claims=claims, commit=not dry_run)
 
         return comment
 
 
+@blp.route('/export')
+class CommentsExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=CommentListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: CommentListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting comments', extra={'format': export_format})
+        return export_response(
+            Comment,
+            CommentSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class CommentsBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(CommentSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(CommentSchema))
+    @fieldsets(Comment, batch_get_schema(CommentSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting comments', extra={'count': len(data['ids'])})
+        return batch_get(Comment, current_user, claims, data['ids'])
+
+
 @blp.route('/<comment_id>')
 class CommentById(MethodView):
 
@@ -71,7 +125,9 @@ class CommentById(MethodView):
         return comment
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(CommentSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=CommentSchema)
+    @fieldsets(Comment, CommentSchema)
     def get(self, comment_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting comment', extra={'id': comment_id})
         comment = self.get_comment(current_user, claims, comment_id)
@@ -91,12 +147,16 @@ class CommentById(MethodView):
             comment_id,
         )
 
+        check_if_match(comment)
+
         for k, v in data.items():
             if hasattr(comment, k):
                 setattr(comment, k, v)
             else:
                 raise BadRequestException(f'Comment has no attribute: {k}')
 
+        emit_event(EventType.update, current_user, obj=comment)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         comment.save(
             current_user,
@@ -118,6 +178,8 @@ class CommentById(MethodView):
             comment_id,
         )
 
+        emit_event(EventType.delete, current_user, obj=comment)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         comment.delete(
             current_user,
@@ -4,11 +4,22 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
-
+from techlock.common.orm.sqlalchemy import db
+
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import COMPLIANCE_PERIOD_CLAIM_SPEC as claim_spec
 from ..models import (
     CompliancePeriod,
@@ -17,6 +28,8 @@ from ..models import (
     CompliancePeriodPageableSchema,
     CompliancePeriodSchema,
 )
+from ..models.event import Type as EventType
+from ..services import emit_event, rewind_period_marks
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +48,9 @@ class CompliancePeriods(MethodView):
         schema=CompliancePeriodListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(CompliancePeriodSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=CompliancePeriodPageableSchema)
+    @fieldsets(CompliancePeriod, CompliancePeriodPageableSchema)
     def get(self, query_params: CompliancePeriodListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET compliance_periods')
         pageable_resp = CompliancePeriod.get_all(
@@ -58,12 +73,52 @@ class CompliancePeriods(MethodView):
 
         compliance_period = CompliancePeriod(**data)
 
+        emit_event(EventType.create, current_user, obj=compliance_period)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         compliance_period.save(current_user, claims=claims, commit=not dry_run)
 
         return compliance_period
 
 
+@blp.route('/export')
+class CompliancePeriodsExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=CompliancePeriodListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: CompliancePeriodListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting compliance_periods', extra={'format': export_format})
+        return export_response(
+            CompliancePeriod,
+            CompliancePeriodSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class CompliancePeriodsBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(CompliancePeriodSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(CompliancePeriodSchema))
+    @fieldsets(CompliancePeriod, batch_get_schema(CompliancePeriodSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting compliance_periods', extra={'count': len(data['ids'])})
+        return batch_get(CompliancePeriod, current_user, claims, data['ids'])
+
+
 @blp.route('/<compliance_period_id>')
 class CompliancePeriodById(MethodView):
 
@@ -78,7 +133,9 @@ class CompliancePeriodById(MethodView):
         return compliance_period
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(CompliancePeriodSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=CompliancePeriodSchema)
+    @fieldsets(CompliancePeriod, CompliancePeriodSchema)
     def get(self, compliance_period_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info(
             'Getting compliance_period',
@@ -105,12 +162,20 @@ class CompliancePeriodById(MethodView):
             compliance_period_id,
         )
 
+        check_if_match(compliance_period)
+
+        moved_back = 'end_date' in data and data['end_date'] < compliance_period.end_date
         for k, v in data.items():
             if hasattr(compliance_period, k):
                 setattr(compliance_period, k, v)
             else:
                 raise BadRequestException(f'CompliancePeriod has no attribute: {k}')
 
+        if moved_back:
+            rewind_period_marks(db.session, compliance_period.tenant_id, compliance_period.end_date)
+
+        emit_event(EventType.update, current_user, obj=compliance_period)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         compliance_period.save(
             current_user,
@@ -135,6 +200,8 @@ class CompliancePeriodById(MethodView):
             compliance_period_id,
         )
 
+        emit_event(EventType.delete, current_user, obj=compliance_period)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         compliance_period.delete(
             current_user,
@@ -4,11 +4,21 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import COMPLIANCE_RESPONSE_CLAIM_SPEC as claim_spec
 from ..models import (
     ComplianceResponse,
@@ -17,6 +27,8 @@ from ..models import (
     ComplianceResponsePageableSchema,
     ComplianceResponseSchema,
 )
+from ..models.event import Type as EventType
+from ..services import emit_event
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +47,9 @@ class ComplianceResponses(MethodView):
         schema=ComplianceResponseListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(ComplianceResponseSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ComplianceResponsePageableSchema)
+    @fieldsets(ComplianceResponse, ComplianceResponsePageableSchema)
     def get(self, query_params: ComplianceResponseListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET compliance_responses')
         pageable_resp = ComplianceResponse.get_all(
@@ -58,6 +72,8 @@ class ComplianceResponses(MethodView):
 
         compliance_response = ComplianceResponse(**data)
 
+        emit_event(EventType.create, current_user, obj=compliance_response)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         compliance_response.save(
             current_user,
@@ -68,6 +84,44 @@ class ComplianceResponses(MethodView):
         return compliance_response
 
 
+@blp.route('/export')
+class ComplianceResponsesExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=ComplianceResponseListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: ComplianceResponseListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting compliance_responses', extra={'format': export_format})
+        return export_response(
+            ComplianceResponse,
+            ComplianceResponseSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class ComplianceResponsesBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(ComplianceResponseSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(ComplianceResponseSchema))
+    @fieldsets(ComplianceResponse, batch_get_schema(ComplianceResponseSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting compliance_responses', extra={'count': len(data['ids'])})
+        return batch_get(ComplianceResponse, current_user, claims, data['ids'])
+
+
 @blp.route('/<compliance_response_id>')
 class ComplianceResponseById(MethodView):
 
@@ -82,7 +136,9 @@ class ComplianceResponseById(MethodView):
         return compliance_response
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(ComplianceResponseSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ComplianceResponseSchema)
+    @fieldsets(ComplianceResponse, ComplianceResponseSchema)
     def get(self, compliance_response_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info(
             'Getting compliance_response',
@@ -109,12 +165,16 @@ class ComplianceResponseById(MethodView):
             compliance_response_id,
         )
 
+        check_if_match(compliance_response)
+
         for k, v in data.items():
             if hasattr(compliance_response, k):
                 setattr(compliance_response, k, v)
             else:
                 raise BadRequestException(f'ComplianceResponse has no attribute: {k}')
 
+        emit_event(EventType.update, current_user, obj=compliance_response)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         compliance_response.save(
             current_user,
@@ -139,6 +199,8 @@ class ComplianceResponseById(MethodView):
             compliance_response_id,
         )
 
+        emit_event(EventType.delete, current_user, obj=compliance_response)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         compliance_response.delete(
             current_user,
@@ -1,11 +1,21 @@
 import logging
+from typing import Any, Dict
 
 from flask.views import MethodView
 from flask_smorest import Blueprint
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import COMPLIANCE_RESPONSE_HISTORY_CLAIM_SPEC as claim_spec
 from ..models import (
     ComplianceResponseHistory,
@@ -32,10 +42,12 @@ class ComplianceResponseHistorys(MethodView):
         schema=ComplianceResponseHistoryListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(ComplianceResponseHistorySchema), location='query', as_kwargs=True)
     @blp.response(
         status_code=200,
         schema=ComplianceResponseHistoryPageableSchema,
     )
+    @fieldsets(ComplianceResponseHistory, ComplianceResponseHistoryPageableSchema)
     def get(self, query_params: ComplianceResponseHistoryListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET compliance_responses_history')
         pageable_resp = ComplianceResponseHistory.get_all(
@@ -50,6 +62,44 @@ class ComplianceResponseHistorys(MethodView):
         return pageable_resp
 
 
+@blp.route('/export')
+class ComplianceResponseHistorysExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=ComplianceResponseHistoryListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: ComplianceResponseHistoryListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting compliance_responses_history', extra={'format': export_format})
+        return export_response(
+            ComplianceResponseHistory,
+            ComplianceResponseHistorySchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class ComplianceResponseHistorysBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(ComplianceResponseHistorySchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(ComplianceResponseHistorySchema))
+    @fieldsets(ComplianceResponseHistory, batch_get_schema(ComplianceResponseHistorySchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting compliance_responses_history', extra={'count': len(data['ids'])})
+        return batch_get(ComplianceResponseHistory, current_user, claims, data['ids'])
+
+
 @blp.route('/<compliance_response_id>')
 class ComplianceResponseHistoryById(MethodView):
 
@@ -64,7 +114,9 @@ class ComplianceResponseHistoryById(MethodView):
         return compliance_response
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(ComplianceResponseHistorySchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ComplianceResponseHistorySchema)
+    @fieldsets(ComplianceResponseHistory, ComplianceResponseHistorySchema)
     def get(self, compliance_response_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info(
             'Getting compliance_response',
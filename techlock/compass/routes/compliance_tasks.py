@@ -4,11 +4,21 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import COMPLIANCE_TASK_CLAIM_SPEC as claim_spec
 from ..models import (
     ComplianceTask,
@@ -17,6 +27,8 @@ from ..models import (
     ComplianceTaskPageableSchema,
     ComplianceTaskSchema,
 )
+from ..models.event import Type as EventType
+from ..services import emit_event
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +43,9 @@ class ComplianceTasks(MethodView):
         schema=ComplianceTaskListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(ComplianceTaskSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ComplianceTaskPageableSchema)
+    @fieldsets(ComplianceTask, ComplianceTaskPageableSchema)
     def get(self, query_params: ComplianceTaskListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET compliance_tasks')
         pageable_resp = ComplianceTask.get_all(
@@ -54,12 +68,52 @@ class ComplianceTasks(MethodView):
 
         compliance_task = ComplianceTask(**data)
 
+        emit_event(EventType.create, current_user, obj=compliance_task)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         compliance_task.save(current_user, claims=claims, commit=not dry_run)
 
         return compliance_task
 
 
+@blp.route('/export')
+class ComplianceTasksExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=ComplianceTaskListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: ComplianceTaskListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting compliance_tasks', extra={'format': export_format})
+        return export_response(
+            ComplianceTask,
+            ComplianceTaskSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class ComplianceTasksBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(ComplianceTaskSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(ComplianceTaskSchema))
+    @fieldsets(ComplianceTask, batch_get_schema(ComplianceTaskSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting compliance_tasks', extra={'count': len(data['ids'])})
+        return batch_get(ComplianceTask, current_user, claims, data['ids'])
+
+
 @blp.route('/<compliance_task_id>')
 class ComplianceTaskById(MethodView):
 
@@ -74,7 +128,9 @@ class ComplianceTaskById(MethodView):
         return compliance_task
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(ComplianceTaskSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ComplianceTaskSchema)
+    @fieldsets(ComplianceTask, ComplianceTaskSchema)
     def get(self, compliance_task_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info(
             'Getting compliance_task',
@@ -101,12 +157,16 @@ class ComplianceTaskById(MethodView):
             compliance_task_id,
         )
 
+        check_if_match(compliance_task)
+
         for k, v in data.items():
             if hasattr(compliance_task, k):
                 setattr(compliance_task, k, v)
             else:
                 raise BadRequestException(f'ComplianceTask has no attribute: {k}')
 
+        emit_event(EventType.update, current_user, obj=compliance_task)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         compliance_task.save(
             current_user,
@@ -131,6 +191,8 @@ class ComplianceTaskById(MethodView):
             compliance_task_id,
         )
 
+        emit_event(EventType.delete, current_user, obj=compliance_task)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         compliance_task.delete(
             current_user,
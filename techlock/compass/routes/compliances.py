@@ -2,26 +2,61 @@ import logging
 from typing import Any, Dict
 
 from flask.views import MethodView
-from flask_smorest import Blueprint
+from flask_smorest import Blueprint, abort
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
+from techlock.common.orm.sqlalchemy import db
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    claim_criteria,
+    dump,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+    is_native,
+    resolve_claims,
+)
 from ..models import COMPLIANCE_CLAIM_SPEC as claim_spec
 from ..models import (
+    COMPLIANCE_PERIOD_CLAIM_SPEC,
+    COMPLIANCE_RESPONSE_CLAIM_SPEC,
+    COMPLIANCE_TASK_CLAIM_SPEC,
     Compliance,
     ComplianceListQueryParameters,
     ComplianceListQueryParametersSchema,
     CompliancePageableSchema,
+    CompliancePeriodSyncSchema,
     ComplianceSchema,
 )
+from ..models.event import Type as EventType
+from ..services import MATRIX_MODELS, emit_event, matrix_response, sync_periods
 
 logger = logging.getLogger(__name__)
 
 blp = Blueprint('compliances', __name__, url_prefix='/compliances')
 
+_MATRIX_CLAIM_SPECS = {
+    'compliance_task': COMPLIANCE_TASK_CLAIM_SPEC,
+    'compliance_period': COMPLIANCE_PERIOD_CLAIM_SPEC,
+    'compliance_response': COMPLIANCE_RESPONSE_CLAIM_SPEC,
+}
+
+
+def _check_period_access():
+    """
+    Syncing creates, updates and deactivates periods, which needs both actions on compliance periods.
+    """
+    if resolve_claims(COMPLIANCE_PERIOD_CLAIM_SPEC, ['create', 'update']) is None:
+        abort(403, message='Not allowed to create compliance periods.')
+
 
 @blp.route('')
 class Compliances(MethodView):
@@ -31,7 +66,9 @@ class Compliances(MethodView):
         schema=ComplianceListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(ComplianceSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=CompliancePageableSchema)
+    @fieldsets(Compliance, CompliancePageableSchema)
     def get(self, query_params: ComplianceListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET compliances')
         pageable_resp = Compliance.get_all(
@@ -54,12 +91,109 @@ class Compliances(MethodView):
 
         compliance = Compliance(**data)
 
+        emit_event(EventType.create, current_user, obj=compliance)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         compliance.save(current_user, claims=claims, commit=not dry_run)
 
         return compliance
 
 
+@blp.route('/export')
+class CompliancesExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=ComplianceListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: ComplianceListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting compliances', extra={'format': export_format})
+        return export_response(
+            Compliance,
+            ComplianceSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class CompliancesBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(ComplianceSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(ComplianceSchema))
+    @fieldsets(Compliance, batch_get_schema(ComplianceSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting compliances', extra={'count': len(data['ids'])})
+        return batch_get(Compliance, current_user, claims, data['ids'])
+
+
+@blp.route('/<compliance_id>/matrix')
+class ComplianceMatrix(MethodView):
+    """
+    Status of every period of the compliance, as a task x period grid.
+
+    The response is streamed, one task at a time:
+    `{"compliance": {...}, "tasks": [{"id", "name", "frequency", "period_count", "status_counts", "periods": [...]}]}`,
+    where every period has its `index` within the task, dates, and the `phase` and `status` of its latest response.
+    Tasks, periods and responses the user can not read are left out.
+    """
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.response(status_code=200)
+    def get(self, compliance_id: str, current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Getting compliance matrix', extra={'id': compliance_id})
+        compliance = Compliance.get(
+            current_user,
+            compliance_id,
+            claims=claims,
+            raise_if_not_found=True,
+        )
+
+        return matrix_response(
+            dump(ComplianceSchema(), compliance, native=is_native()),
+            str(compliance.id),
+            current_user.tenant_id,
+            claim_criteria(current_user, MATRIX_MODELS, _MATRIX_CLAIM_SPECS),
+        )
+
+
+@blp.route('/<compliance_id>/periods')
+class CompliancePeriodsSync(MethodView):
+
+    @access_required(['read', 'update'], claim_spec=claim_spec)
+    @blp.arguments(schema=CompliancePeriodSyncSchema)
+    @blp.arguments(DryRunSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=CompliancePeriodSyncSchema)
+    def post(self, data: Dict[str, Any], dry_run: bool, compliance_id: str, current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Generating compliance periods', extra={'id': compliance_id, 'data': data})
+
+        compliance = Compliance.get(
+            current_user,
+            compliance_id,
+            claims=claims.filter_by_action('update'),
+            raise_if_not_found=True,
+        )
+        _check_period_access()
+
+        result = sync_periods(db.session, compliance, current_user, task_ids=data['task_ids'])
+
+        # no need to rollback on dry-run, flask-sqlalchemy does this for us.
+        if not dry_run:
+            db.session.commit()
+
+        return result
+
+
 @blp.route('/<compliance_id>')
 class ComplianceById(MethodView):
 
@@ -74,7 +208,9 @@ class ComplianceById(MethodView):
         return compliance
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(ComplianceSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ComplianceSchema)
+    @fieldsets(Compliance, ComplianceSchema)
     def get(self, compliance_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting compliance', extra={'id': compliance_id})
         compliance = self.get_compliance(current_user, claims, compliance_id)
@@ -94,12 +230,26 @@ class ComplianceById(MethodView):
             compliance_id,
         )
 
+        check_if_match(compliance)
+
+        reschedule = any(
+            k in data and data[k] != getattr(compliance, k)
+            for k in ('start_date', 'end_date')
+        )
+        if reschedule:
+            _check_period_access()
+
         for k, v in data.items():
             if hasattr(compliance, k):
                 setattr(compliance, k, v)
             else:
                 raise BadRequestException(f'Compliance has no attribute: {k}')
 
+        if reschedule:
+            sync_periods(db.session, compliance, current_user)
+
+        emit_event(EventType.update, current_user, obj=compliance)
+
         compliance.save(
             current_user,
             claims=claims.filter_by_action('update'),
@@ -120,6 +270,8 @@ class ComplianceById(MethodView):
             compliance_id,
         )
 
+        emit_event(EventType.delete, current_user, obj=compliance)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         compliance.delete(
             current_user,
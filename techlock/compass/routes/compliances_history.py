@@ -1,11 +1,21 @@
 import logging
+from typing import Any, Dict
 
 from flask.views import MethodView
 from flask_smorest import Blueprint
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import COMPLIANCE_HISTORY_CLAIM_SPEC as claim_spec
 from ..models import (
     ComplianceHistory,
@@ -32,7 +42,9 @@ class ComplianceHistorys(MethodView):
         schema=ComplianceHistoryListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(ComplianceHistorySchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ComplianceHistoryPageableSchema)
+    @fieldsets(ComplianceHistory, ComplianceHistoryPageableSchema)
     def get(self, query_params: ComplianceHistoryListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET compliances_history')
         pageable_resp = ComplianceHistory.get_all(
@@ -47,6 +59,44 @@ class ComplianceHistorys(MethodView):
         return pageable_resp
 
 
+@blp.route('/export')
+class ComplianceHistorysExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=ComplianceHistoryListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: ComplianceHistoryListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting compliances_history', extra={'format': export_format})
+        return export_response(
+            ComplianceHistory,
+            ComplianceHistorySchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class ComplianceHistorysBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(ComplianceHistorySchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(ComplianceHistorySchema))
+    @fieldsets(ComplianceHistory, batch_get_schema(ComplianceHistorySchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting compliances_history', extra={'count': len(data['ids'])})
+        return batch_get(ComplianceHistory, current_user, claims, data['ids'])
+
+
 @blp.route('/<compliance_id>')
 class ComplianceHistoryById(MethodView):
 
@@ -61,7 +111,9 @@ class ComplianceHistoryById(MethodView):
         return compliance
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(ComplianceHistorySchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ComplianceHistorySchema)
+    @fieldsets(ComplianceHistory, ComplianceHistorySchema)
     def get(self, compliance_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting compliance', extra={'id': compliance_id})
         compliance = self.get_compliance(current_user, claims, compliance_id)
@@ -4,11 +4,21 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import COMPLIANCE_TIMELINE_CLAIM_SPEC as claim_spec
 from ..models import (
     ComplianceTimeline,
@@ -35,7 +45,9 @@ class ComplianceTimelines(MethodView):
         schema=ComplianceTimelineListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(ComplianceTimelineSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ComplianceTimelinePageableSchema)
+    @fieldsets(ComplianceTimeline, ComplianceTimelinePageableSchema)
     def get(self, query_params: ComplianceTimelineListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET compliances_timeline')
         pageable_resp = ComplianceTimeline.get_all(
@@ -64,6 +76,44 @@ class ComplianceTimelines(MethodView):
         return compliance
 
 
+@blp.route('/export')
+class ComplianceTimelinesExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=ComplianceTimelineListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: ComplianceTimelineListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting compliances_timeline', extra={'format': export_format})
+        return export_response(
+            ComplianceTimeline,
+            ComplianceTimelineSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class ComplianceTimelinesBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(ComplianceTimelineSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(ComplianceTimelineSchema))
+    @fieldsets(ComplianceTimeline, batch_get_schema(ComplianceTimelineSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting compliances_timeline', extra={'count': len(data['ids'])})
+        return batch_get(ComplianceTimeline, current_user, claims, data['ids'])
+
+
 @blp.route('/<compliance_id>')
 class ComplianceTimelineById(MethodView):
 
@@ -78,7 +128,9 @@ class ComplianceTimelineById(MethodView):
         return compliance
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(ComplianceTimelineSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ComplianceTimelineSchema)
+    @fieldsets(ComplianceTimeline, ComplianceTimelineSchema)
     def get(self, compliance_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting compliance', extra={'id': compliance_id})
         compliance = self.get_compliance(current_user, claims, compliance_id)
@@ -98,6 +150,8 @@ class ComplianceTimelineById(MethodView):
             compliance_id,
         )
 
+        check_if_match(compliance)
+
         for k, v in data.items():
             if hasattr(compliance, k):
                 setattr(compliance, k, v)
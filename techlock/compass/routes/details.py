@@ -4,11 +4,21 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import DETAIL_CLAIM_SPEC as claim_spec
 from ..models import (
     Detail,
@@ -17,6 +27,8 @@ from ..models import (
     DetailPageableSchema,
     DetailSchema,
 )
+from ..models.event import Type as EventType
+from ..services import emit_event
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +40,9 @@ class Details(MethodView):
 
     @access_required('read', claim_spec=claim_spec)
     @blp.arguments(schema=DetailListQueryParametersSchema, location='query')
+    @blp.arguments(field_selection_schema(DetailSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=DetailPageableSchema)
+    @fieldsets(Detail, DetailPageableSchema)
     def get(self, query_params: DetailListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET details')
         pageable_resp = Detail.get_all(
@@ -51,12 +65,52 @@ class Details(MethodView):
 
         detail = Detail(**data)
 
+        emit_event(EventType.create, current_user, obj=detail)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         detail.save(current_user, claims=claims, commit=not dry_run)
 
         return detail
 
 
+@blp.route('/export')
+class DetailsExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=DetailListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: DetailListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting details', extra={'format': export_format})
+        return export_response(
+            Detail,
+            DetailSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class DetailsBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(DetailSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(DetailSchema))
+    @fieldsets(Detail, batch_get_schema(DetailSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting details', extra={'count': len(data['ids'])})
+        return batch_get(Detail, current_user, claims, data['ids'])
+
+
 @blp.route('/<detail_id>')
 class DetailById(MethodView):
 
@@ -71,7 +125,9 @@ class DetailById(MethodView):
         return detail
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(DetailSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=DetailSchema)
+    @fieldsets(Detail, DetailSchema)
     def get(self, detail_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting detail', extra={'id': detail_id})
         detail = self.get_detail(current_user, claims, detail_id)
@@ -91,12 +147,16 @@ class DetailById(MethodView):
             detail_id,
         )
 
+        check_if_match(detail)
+
         for k, v in data.items():
             if hasattr(detail, k):
                 setattr(detail, k, v)
             else:
                 raise BadRequestException(f'Detail has no attribute: {k}')
 
+        emit_event(EventType.update, current_user, obj=detail)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         detail.save(
             current_user,
@@ -118,6 +178,8 @@ class DetailById(MethodView):
             detail_id,
         )
 
+        emit_event(EventType.delete, current_user, obj=detail)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         detail.delete(
             current_user,
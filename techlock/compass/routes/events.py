@@ -2,21 +2,34 @@ import logging
 from typing import Any, Dict
 
 from flask.views import MethodView
-from flask_smorest import Blueprint
+from flask_smorest import Blueprint, abort
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
-
+from techlock.common.orm.sqlalchemy import db
+
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import EVENT_CLAIM_SPEC as claim_spec
 from ..models import (
     Event,
+    EventBatchSchema,
     EventListQueryParameters,
     EventListQueryParametersSchema,
     EventPageableSchema,
     EventSchema,
 )
+from ..services import denied_events, emit_events
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +41,9 @@ class Events(MethodView):
 
     @access_required('read', claim_spec=claim_spec)
     @blp.arguments(schema=EventListQueryParametersSchema, location='query')
+    @blp.arguments(field_selection_schema(EventSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=EventPageableSchema)
+    @fieldsets(Event, EventPageableSchema)
     def get(self, query_params: EventListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET events')
         pageable_resp = Event.get_all(
@@ -57,6 +72,62 @@ class Events(MethodView):
         return event
 
 
+@blp.route('/batch')
+class EventsBatch(MethodView):
+
+    @access_required('create', claim_spec=claim_spec)
+    @blp.arguments(schema=EventBatchSchema)
+    @blp.arguments(DryRunSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=201, schema=EventBatchSchema)
+    def post(self, data: Dict[str, Any], dry_run: bool, current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Creating events', extra={'count': len(data['items'])})
+
+        # The events are inserted without loading them, check them like `Event.save` would first.
+        denied = denied_events(data['items'], current_user, claims.filter_by_action('create'))
+        if denied:
+            abort(403, message=f'Not allowed to create the events at: {", ".join(str(i) for i in denied)}.')
+
+        created = emit_events(data['items'], current_user)
+
+        # no need to rollback on dry-run, flask-sqlalchemy does this for us.
+        if not dry_run:
+            db.session.commit()
+
+        return {'created': created}
+
+
+@blp.route('/export')
+class EventsExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=EventListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(self, query_params: EventListQueryParameters, export_format: str, current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Exporting events', extra={'format': export_format})
+        return export_response(
+            Event,
+            EventSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class EventsBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(EventSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(EventSchema))
+    @fieldsets(Event, batch_get_schema(EventSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting events', extra={'count': len(data['ids'])})
+        return batch_get(Event, current_user, claims, data['ids'])
+
+
 @blp.route('/<event_id>')
 class EventById(MethodView):
 
@@ -71,7 +142,9 @@ class EventById(MethodView):
         return event
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(EventSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=EventSchema)
+    @fieldsets(Event, EventSchema)
     def get(self, event_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting event', extra={'id': event_id})
         event = self.get_event(current_user, claims, event_id)
@@ -91,6 +164,8 @@ class EventById(MethodView):
             event_id,
         )
 
+        check_if_match(event)
+
         for k, v in data.items():
             if hasattr(event, k):
                 setattr(event, k, v)
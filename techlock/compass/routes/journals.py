@@ -4,11 +4,21 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import JOURNAL_CLAIM_SPEC as claim_spec
 from ..models import (
     Journal,
@@ -17,6 +27,8 @@ from ..models import (
     JournalPageableSchema,
     JournalSchema,
 )
+from ..models.event import Type as EventType
+from ..services import emit_event
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +40,9 @@ class Journals(MethodView):
 
     @access_required('read', claim_spec=claim_spec)
     @blp.arguments(schema=JournalListQueryParametersSchema, location='query')
+    @blp.arguments(field_selection_schema(JournalSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=JournalPageableSchema)
+    @fieldsets(Journal, JournalPageableSchema)
     def get(self, query_params: JournalListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET journals')
         pageable_resp = Journal.get_all(
@@ -51,12 +65,52 @@ class Journals(MethodView):
 
         journal = Journal(**data)
 
+        emit_event(EventType.create, current_user, obj=journal)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         journal.save(current_user, claims=claims, commit=not dry_run)
 
         return journal
 
 
+@blp.route('/export')
+class JournalsExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=JournalListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: JournalListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting journals', extra={'format': export_format})
+        return export_response(
+            Journal,
+            JournalSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class JournalsBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(JournalSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(JournalSchema))
+    @fieldsets(Journal, batch_get_schema(JournalSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting journals', extra={'count': len(data['ids'])})
+        return batch_get(Journal, current_user, claims, data['ids'])
+
+
 @blp.route('/<journal_id>')
 class JournalById(MethodView):
 
@@ -71,7 +125,9 @@ class JournalById(MethodView):
         return journal
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(JournalSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=JournalSchema)
+    @fieldsets(Journal, JournalSchema)
     def get(self, journal_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting journal', extra={'id': journal_id})
         journal = self.get_journal(current_user, claims, journal_id)
@@ -91,12 +147,16 @@ class JournalById(MethodView):
             journal_id,
         )
 
+        check_if_match(journal)
+
         for k, v in data.items():
             if hasattr(journal, k):
                 setattr(journal, k, v)
             else:
                 raise BadRequestException(f'Journal has no attribute: {k}')
 
+        emit_event(EventType.update, current_user, obj=journal)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         journal.save(
             current_user,
@@ -118,6 +178,8 @@ class JournalById(MethodView):
             journal_id,
         )
 
+        emit_event(EventType.delete, current_user, obj=journal)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         journal.delete(
             current_user,
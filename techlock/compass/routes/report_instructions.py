@@ -4,19 +4,37 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
-
+from techlock.common.orm.sqlalchemy import db
+
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    cache_control,
+    check_if_match,
+    claim_criteria,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+    json_response,
+)
 from ..models import REPORT_INSTRUCTION_CLAIM_SPEC as claim_spec
 from ..models import (
+    REPORT_NODE_CLAIM_SPEC,
     ReportInstruction,
     ReportInstructionListQueryParameters,
     ReportInstructionListQueryParametersSchema,
     ReportInstructionPageableSchema,
     ReportInstructionSchema,
+    ReportInstructionSearchPageableSchema,
+    ReportInstructionSearchQueryParametersSchema,
 )
+from ..services import INSTRUCTION_MODELS, search_report_instructions
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +44,11 @@ blp = Blueprint(
     url_prefix='/report_instructions',
 )
 
+_SEARCH_CLAIM_SPECS = {
+    'report_instruction': claim_spec,
+    'report_node': REPORT_NODE_CLAIM_SPEC,
+}
+
 
 @blp.route('')
 class ReportInstructions(MethodView):
@@ -35,7 +58,10 @@ class ReportInstructions(MethodView):
         schema=ReportInstructionListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(ReportInstructionSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ReportInstructionPageableSchema)
+    @cache_control()
+    @fieldsets(ReportInstruction, ReportInstructionPageableSchema)
     def get(self, query_params: ReportInstructionListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET report_instructions')
         pageable_resp = ReportInstruction.get_all(
@@ -68,6 +94,66 @@ class ReportInstructions(MethodView):
         return report_instruction
 
 
+@blp.route('/export')
+class ReportInstructionsExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=ReportInstructionListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: ReportInstructionListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting report_instructions', extra={'format': export_format})
+        return export_response(
+            ReportInstruction,
+            ReportInstructionSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/search')
+class ReportInstructionsSearch(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=ReportInstructionSearchQueryParametersSchema, location='query')
+    @blp.response(status_code=200, schema=ReportInstructionSearchPageableSchema)
+    @cache_control()
+    def get(self, query_params: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Searching report_instructions', extra={'q': query_params['q']})
+        page = search_report_instructions(
+            db.session,
+            query_params['q'],
+            claim_criteria(current_user, INSTRUCTION_MODELS, _SEARCH_CLAIM_SPECS, query_params['types']),
+            types=query_params['types'],
+            version_ids=query_params['version_id'],
+            offset=query_params['offset'],
+            limit=query_params['limit'],
+        )
+
+        return json_response(page)
+
+
+@blp.route('/batch_get')
+class ReportInstructionsBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(ReportInstructionSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(ReportInstructionSchema))
+    @fieldsets(ReportInstruction, batch_get_schema(ReportInstructionSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting report_instructions', extra={'count': len(data['ids'])})
+        return batch_get(ReportInstruction, current_user, claims, data['ids'])
+
+
 @blp.route('/<report_instruction_id>')
 class ReportInstructionById(MethodView):
 
@@ -82,7 +168,10 @@ class ReportInstructionById(MethodView):
         return report_instruction
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(ReportInstructionSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ReportInstructionSchema)
+    @cache_control()
+    @fieldsets(ReportInstruction, ReportInstructionSchema)
     def get(self, report_instruction_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info(
             'Getting report_instruction',
@@ -109,6 +198,8 @@ class ReportInstructionById(MethodView):
             report_instruction_id,
         )
 
+        check_if_match(report_instruction)
+
         for k, v in data.items():
             if hasattr(report_instruction, k):
                 setattr(report_instruction, k, v)
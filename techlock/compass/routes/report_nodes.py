@@ -4,11 +4,22 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    cache_control,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import REPORT_NODE_CLAIM_SPEC as claim_spec
 from ..models import (
     ReportNode,
@@ -31,7 +42,10 @@ class ReportNodes(MethodView):
         schema=ReportNodeListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(ReportNodeSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ReportNodePageableSchema)
+    @cache_control()
+    @fieldsets(ReportNode, ReportNodePageableSchema)
     def get(self, query_params: ReportNodeListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET report_nodes')
         pageable_resp = ReportNode.get_all(
@@ -60,6 +74,44 @@ class ReportNodes(MethodView):
         return report_node
 
 
+@blp.route('/export')
+class ReportNodesExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=ReportNodeListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: ReportNodeListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting report_nodes', extra={'format': export_format})
+        return export_response(
+            ReportNode,
+            ReportNodeSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class ReportNodesBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(ReportNodeSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(ReportNodeSchema))
+    @fieldsets(ReportNode, batch_get_schema(ReportNodeSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting report_nodes', extra={'count': len(data['ids'])})
+        return batch_get(ReportNode, current_user, claims, data['ids'])
+
+
 @blp.route('/<report_node_id>')
 class ReportNodeById(MethodView):
 
@@ -74,7 +126,10 @@ class ReportNodeById(MethodView):
         return report_node
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(ReportNodeSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ReportNodeSchema)
+    @cache_control()
+    @fieldsets(ReportNode, ReportNodeSchema)
     def get(self, report_node_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting report_node', extra={'id': report_node_id})
         report_node = self.get_report_node(
@@ -98,6 +153,8 @@ class ReportNodeById(MethodView):
             report_node_id,
         )
 
+        check_if_match(report_node)
+
         for k, v in data.items():
             if hasattr(report_node, k):
                 setattr(report_node, k, v)
@@ -1,27 +1,63 @@
+import hashlib
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
+from uuid import UUID
 
+import sqlalchemy as sa
 from flask.views import MethodView
-from flask_smorest import Blueprint
+from flask_smorest import Blueprint, abort
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
+from techlock.common.orm.sqlalchemy import db
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    cache_control,
+    check_if_match,
+    claim_criteria,
+    dump,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+    is_native,
+    json_response,
+    not_modified,
+    resource_etag,
+)
+from ..models import REPORT_INSTRUCTION_CLAIM_SPEC, REPORT_NODE_CLAIM_SPEC
 from ..models import REPORT_VERSION_CLAIM_SPEC as claim_spec
 from ..models import (
+    ReportInstruction,
+    ReportInstructionSchema,
+    ReportNode,
+    ReportNodeSchema,
     ReportVersion,
     ReportVersionListQueryParameters,
     ReportVersionListQueryParametersSchema,
     ReportVersionPageableSchema,
     ReportVersionSchema,
 )
+from ..orm import scoped_query
 
 logger = logging.getLogger(__name__)
 
 blp = Blueprint('report_versions', __name__, url_prefix='/report_versions')
 
+_TREE_MODELS = {
+    'report_node': ReportNode,
+    'report_instruction': ReportInstruction,
+}
+_TREE_CLAIM_SPECS = {
+    'report_node': REPORT_NODE_CLAIM_SPEC,
+    'report_instruction': REPORT_INSTRUCTION_CLAIM_SPEC,
+}
+
 
 @blp.route('')
 class ReportVersions(MethodView):
@@ -31,7 +67,10 @@ class ReportVersions(MethodView):
         schema=ReportVersionListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(ReportVersionSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ReportVersionPageableSchema)
+    @cache_control()
+    @fieldsets(ReportVersion, ReportVersionPageableSchema)
     def get(self, query_params: ReportVersionListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET report_versions')
         pageable_resp = ReportVersion.get_all(
@@ -60,6 +99,44 @@ class ReportVersions(MethodView):
         return report_version
 
 
+@blp.route('/export')
+class ReportVersionsExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=ReportVersionListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: ReportVersionListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting report_versions', extra={'format': export_format})
+        return export_response(
+            ReportVersion,
+            ReportVersionSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class ReportVersionsBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(ReportVersionSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(ReportVersionSchema))
+    @fieldsets(ReportVersion, batch_get_schema(ReportVersionSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting report_versions', extra={'count': len(data['ids'])})
+        return batch_get(ReportVersion, current_user, claims, data['ids'])
+
+
 @blp.route('/<report_version_id>')
 class ReportVersionById(MethodView):
 
@@ -74,7 +151,10 @@ class ReportVersionById(MethodView):
         return report_version
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(ReportVersionSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ReportVersionSchema)
+    @cache_control()
+    @fieldsets(ReportVersion, ReportVersionSchema)
     def get(self, report_version_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting report_version', extra={'id': report_version_id})
         report_version = self.get_report_version(
@@ -98,6 +178,8 @@ class ReportVersionById(MethodView):
             report_version_id,
         )
 
+        check_if_match(report_version)
+
         for k, v in data.items():
             if hasattr(report_version, k):
                 setattr(report_version, k, v)
@@ -133,3 +215,108 @@ class ReportVersionById(MethodView):
         )
 
         return
+
+
+@blp.route('/<uuid:version_uuid>/tree')
+class ReportVersionTree(MethodView):
+    """
+    The complete framework of a version, its nodes as a tree and the instructions of every node,
+    both filtered by the user's claims for them. Nodes the user can not read are left out with their children.
+    Nodes and instructions can be edited after the version is imported, clients revalidate the tree with its ETag.
+    """
+
+    def get_etag(self, report_version: ReportVersion, criteria: Dict[str, Any]) -> str:
+        """
+        The ETag of the version and of the count and latest change of the nodes and instructions the user can read,
+        so it changes with every edit, deletion and addition, without loading the tree.
+        The claim criteria are part of it, users with different scopes never share an ETag.
+        """
+        parts = [resource_etag(report_version)]
+        for kind, model in _TREE_MODELS.items():
+            if kind not in criteria:
+                parts.append('-')
+                continue
+
+            query = db.session.query(
+                sa.func.count(model.id),
+                sa.func.max(model.changed_on),
+            ).filter(
+                model.version_id == report_version.id,
+            )
+            if criteria[kind] is not None:
+                compiled = criteria[kind].compile()
+                parts.append(f'{compiled}{sorted(compiled.params.items())}')
+                query = query.filter(criteria[kind])
+
+            count, changed_on = query.one()
+            parts.append(f'{count}:{changed_on.isoformat() if changed_on is not None else ""}')
+
+        return hashlib.sha1(';'.join(parts).encode('utf-8')).hexdigest()
+
+    def get_nodes(self, report_version: ReportVersion, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        The nodes of the version the user can read as a tree, with the instructions the user can read.
+        """
+        if 'report_node' not in criteria:
+            return []
+
+        node_schema = ReportNodeSchema(exclude=('parent', 'children', 'version'))
+        instruction_schema = ReportInstructionSchema(exclude=('version', 'node'))
+
+        nodes = db.session.query(ReportNode).filter(
+            ReportNode.version_id == report_version.id,
+            ReportNode.is_active.is_(True),
+        ).order_by(ReportNode.table, ReportNode.row, ReportNode.id)
+        if criteria['report_node'] is not None:
+            nodes = nodes.filter(criteria['report_node'])
+
+        by_id = {}
+        for node in nodes:
+            data = dump(node_schema, node, native=is_native())
+            data['children'] = []
+            data['instructions'] = []
+            by_id[str(node.id)] = data
+
+        if 'report_instruction' in criteria:
+            instructions = db.session.query(ReportInstruction).filter(
+                ReportInstruction.version_id == report_version.id,
+                ReportInstruction.is_active.is_(True),
+            ).order_by(ReportInstruction.table, ReportInstruction.row, ReportInstruction.id)
+            if criteria['report_instruction'] is not None:
+                instructions = instructions.filter(criteria['report_instruction'])
+
+            for instruction in instructions:
+                node = by_id.get(str(instruction.node_id))
+                if node is not None:
+                    node['instructions'].append(dump(instruction_schema, instruction, native=is_native()))
+
+        roots = []
+        for data in by_id.values():
+            parent = by_id.get(str(data['parent_id'])) if data.get('parent_id') else None
+            (parent['children'] if parent is not None else roots).append(data)
+
+        return roots
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.response(status_code=200)
+    @cache_control()
+    def get(self, version_uuid: UUID, current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Getting report_version tree', extra={'uuid': str(version_uuid)})
+        report_version = scoped_query(ReportVersion, current_user, claims).filter(
+            ReportVersion.uuid == version_uuid,
+        ).order_by(ReportVersion.created_on.desc()).first()
+        if report_version is None:
+            abort(404, message=f'ReportVersion with uuid {version_uuid} not found.')
+
+        criteria = claim_criteria(current_user, _TREE_MODELS, _TREE_CLAIM_SPECS)
+        etag = self.get_etag(report_version, criteria)
+        response = not_modified(etag)
+        if response is not None:
+            return response
+
+        data = dump(ReportVersionSchema(exclude=('nodes', 'report')), report_version, native=is_native())
+        data['nodes'] = self.get_nodes(report_version, criteria)
+
+        response = json_response(data)
+        response.set_etag(etag, weak=True)
+        return response
@@ -4,11 +4,22 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    cache_control,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import REPORT_CLAIM_SPEC as claim_spec
 from ..models import (
     Report,
@@ -28,7 +39,10 @@ class Reports(MethodView):
 
     @access_required('read', claim_spec=claim_spec)
     @blp.arguments(schema=ReportListQueryParametersSchema, location='query')
+    @blp.arguments(field_selection_schema(ReportSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ReportPageableSchema)
+    @cache_control()
+    @fieldsets(Report, ReportPageableSchema)
     def get(self, query_params: ReportListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET reports')
         pageable_resp = Report.get_all(
@@ -57,6 +71,44 @@ class Reports(MethodView):
         return report
 
 
+@blp.route('/export')
+class ReportsExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=ReportListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: ReportListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting reports', extra={'format': export_format})
+        return export_response(
+            Report,
+            ReportSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class ReportsBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(ReportSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(ReportSchema))
+    @fieldsets(Report, batch_get_schema(ReportSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting reports', extra={'count': len(data['ids'])})
+        return batch_get(Report, current_user, claims, data['ids'])
+
+
 @blp.route('/<report_id>')
 class ReportById(MethodView):
 
@@ -71,7 +123,10 @@ class ReportById(MethodView):
         return report
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(ReportSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=ReportSchema)
+    @cache_control()
+    @fieldsets(Report, ReportSchema)
     def get(self, report_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting report', extra={'id': report_id})
         report = self.get_report(current_user, claims, report_id)
@@ -91,6 +146,8 @@ class ReportById(MethodView):
             report_id,
         )
 
+        check_if_match(report)
+
         for k, v in data.items():
             if hasattr(report, k):
                 setattr(report, k, v)
@@ -0,0 +1,49 @@
+import logging
+from typing import Any, Dict
+
+from flask.views import MethodView
+from flask_smorest import Blueprint
+from techlock.common.api.auth.claim import ClaimSet
+from techlock.common.config import AuthInfo
+from techlock.common.orm.sqlalchemy import db
+
+from ..api import access_required, claim_criteria, json_response
+from ..models import COMMENT_CLAIM_SPEC, JOURNAL_CLAIM_SPEC
+from ..models import SEARCH_CLAIM_SPEC as claim_spec
+from ..models import SUMMARY_NOTE_CLAIM_SPEC, SearchPageableSchema, SearchQueryParametersSchema
+from ..models.search import SEARCH_SCOPE_FIELDS
+from ..services import NOTE_MODELS, search_notes
+
+logger = logging.getLogger(__name__)
+
+blp = Blueprint('search', __name__, url_prefix='/search')
+
+_CLAIM_SPECS = {
+    'comment': COMMENT_CLAIM_SPEC,
+    'journal': JOURNAL_CLAIM_SPEC,
+    'summary_note': SUMMARY_NOTE_CLAIM_SPEC,
+}
+
+
+@blp.route('')
+class Search(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=SearchQueryParametersSchema, location='query')
+    @blp.response(status_code=200, schema=SearchPageableSchema)
+    def get(self, query_params: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Searching notes', extra={'q': query_params['q']})
+        scope = {k: query_params[k] for k in SEARCH_SCOPE_FIELDS if query_params.get(k)}
+
+        page = search_notes(
+            db.session,
+            current_user.tenant_id,
+            query_params['q'],
+            scope,
+            claim_criteria(current_user, NOTE_MODELS, _CLAIM_SPECS, query_params['types']),
+            types=query_params['types'],
+            cursor=query_params.get('cursor'),
+            limit=query_params['limit'],
+        )
+
+        return json_response(page)
@@ -4,11 +4,21 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import SUMMARY_NOTE_CLAIM_SPEC as claim_spec
 from ..models import (
     SummaryNote,
@@ -17,6 +27,8 @@ from ..models import (
     SummaryNotePageableSchema,
     SummaryNoteSchema,
 )
+from ..models.event import Type as EventType
+from ..services import emit_event
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +43,9 @@ class SummaryNotes(MethodView):
         schema=SummaryNoteListQueryParametersSchema,
         location='query',
     )
+    @blp.arguments(field_selection_schema(SummaryNoteSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=SummaryNotePageableSchema)
+    @fieldsets(SummaryNote, SummaryNotePageableSchema)
     def get(self, query_params: SummaryNoteListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET summary_notes')
         pageable_resp = SummaryNote.get_all(
@@ -54,12 +68,52 @@ class SummaryNotes(MethodView):
 
         summary_note = SummaryNote(**data)
 
+        emit_event(EventType.create, current_user, obj=summary_note)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         summary_note.save(current_user, claims=claims, commit=not dry_run)
 
         return summary_note
 
 
+@blp.route('/export')
+class SummaryNotesExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=SummaryNoteListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: SummaryNoteListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting summary_notes', extra={'format': export_format})
+        return export_response(
+            SummaryNote,
+            SummaryNoteSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class SummaryNotesBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(SummaryNoteSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(SummaryNoteSchema))
+    @fieldsets(SummaryNote, batch_get_schema(SummaryNoteSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting summary_notes', extra={'count': len(data['ids'])})
+        return batch_get(SummaryNote, current_user, claims, data['ids'])
+
+
 @blp.route('/<summary_note_id>')
 class SummaryNoteById(MethodView):
 
@@ -74,7 +128,9 @@ class SummaryNoteById(MethodView):
         return summary_note
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(SummaryNoteSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=SummaryNoteSchema)
+    @fieldsets(SummaryNote, SummaryNoteSchema)
     def get(self, summary_note_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting summary_note', extra={'id': summary_note_id})
         summary_note = self.get_summary_note(
@@ -98,12 +154,16 @@ class SummaryNoteById(MethodView):
             summary_note_id,
         )
 
+        check_if_match(summary_note)
+
         for k, v in data.items():
             if hasattr(summary_note, k):
                 setattr(summary_note, k, v)
             else:
                 raise BadRequestException(f'SummaryNote has no attribute: {k}')
 
+        emit_event(EventType.update, current_user, obj=summary_note)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         summary_note.save(
             current_user,
@@ -125,6 +185,8 @@ class SummaryNoteById(MethodView):
             summary_note_id,
         )
 
+        emit_event(EventType.delete, current_user, obj=summary_note)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         summary_note.delete(
             current_user,
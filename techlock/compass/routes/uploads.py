@@ -4,11 +4,21 @@ from typing import Any, Dict
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from techlock.common.api import BadRequestException
-from techlock.common.api.auth import access_required
 from techlock.common.api.auth.claim import ClaimSet
 from techlock.common.api.models.dry_run import DryRunSchema
 from techlock.common.config import AuthInfo
 
+from ..api import (
+    BatchGetSchema,
+    ExportQueryParametersSchema,
+    access_required,
+    batch_get,
+    batch_get_schema,
+    check_if_match,
+    export_response,
+    field_selection_schema,
+    fieldsets,
+)
 from ..models import UPLOAD_CLAIM_SPEC as claim_spec
 from ..models import (
     Upload,
@@ -17,6 +27,8 @@ from ..models import (
     UploadPageableSchema,
     UploadSchema,
 )
+from ..models.event import Type as EventType
+from ..services import emit_event
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +40,9 @@ class Uploads(MethodView):
 
     @access_required('read', claim_spec=claim_spec)
     @blp.arguments(schema=UploadListQueryParametersSchema, location='query')
+    @blp.arguments(field_selection_schema(UploadSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=UploadPageableSchema)
+    @fieldsets(Upload, UploadPageableSchema)
     def get(self, query_params: UploadListQueryParameters, current_user: AuthInfo, claims: ClaimSet):
         logger.info('GET uploads')
         pageable_resp = Upload.get_all(
@@ -51,12 +65,52 @@ class Uploads(MethodView):
 
         upload = Upload(**data)
 
+        emit_event(EventType.create, current_user, obj=upload)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         upload.save(current_user, claims=claims, commit=not dry_run)
 
         return upload
 
 
+@blp.route('/export')
+class UploadsExport(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=UploadListQueryParametersSchema, location='query')
+    @blp.arguments(ExportQueryParametersSchema, location='query', as_kwargs=True)
+    @blp.response(status_code=200)
+    def get(
+        self,
+        query_params: UploadListQueryParameters,
+        export_format: str,
+        current_user: AuthInfo,
+        claims: ClaimSet,
+    ):
+        logger.info('Exporting uploads', extra={'format': export_format})
+        return export_response(
+            Upload,
+            UploadSchema,
+            export_format,
+            current_user,
+            claims,
+            additional_filters=query_params.get_filters(),
+        )
+
+
+@blp.route('/batch_get')
+class UploadsBatchGet(MethodView):
+
+    @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(schema=BatchGetSchema)
+    @blp.arguments(field_selection_schema(UploadSchema), location='query', as_kwargs=True)
+    @blp.response(status_code=200, schema=batch_get_schema(UploadSchema))
+    @fieldsets(Upload, batch_get_schema(UploadSchema))
+    def post(self, data: Dict[str, Any], current_user: AuthInfo, claims: ClaimSet):
+        logger.info('Batch getting uploads', extra={'count': len(data['ids'])})
+        return batch_get(Upload, current_user, claims, data['ids'])
+
+
 @blp.route('/<upload_id>')
 class UploadById(MethodView):
 
@@ -71,7 +125,9 @@ class UploadById(MethodView):
         return upload
 
     @access_required('read', claim_spec=claim_spec)
+    @blp.arguments(field_selection_schema(UploadSchema), location='query', as_kwargs=True)
     @blp.response(status_code=200, schema=UploadSchema)
+    @fieldsets(Upload, UploadSchema)
     def get(self, upload_id: str, current_user: AuthInfo, claims: ClaimSet):
         logger.info('Getting upload', extra={'id': upload_id})
         upload = self.get_upload(current_user, claims, upload_id)
@@ -91,12 +147,16 @@ class UploadById(MethodView):
             upload_id,
         )
 
+        check_if_match(upload)
+
         for k, v in data.items():
             if hasattr(upload, k):
                 setattr(upload, k, v)
             else:
                 raise BadRequestException(f'Upload has no attribute: {k}')
 
+        emit_event(EventType.update, current_user, obj=upload)
+
         upload.save(
             current_user,
             claims=claims.filter_by_action('update'),
@@ -117,6 +177,8 @@ class UploadById(MethodView):
             upload_id,
         )
 
+        emit_event(EventType.delete, current_user, obj=upload)
+
         # no need to rollback on dry-run, flask-sqlalchemy does this for us.
         upload.delete(
             current_user,
@@ -0,0 +1,32 @@
+from .activity import ACTIVITY_MODELS, activity_page
+from .batch import BatchCommitError, run_batch
+from .change_feed import (
+    CHANGE_KINDS,
+    STREAM_ID,
+    ChangeFeed,
+    change_feed,
+    init_change_feed,
+    readable_changes,
+    record_change,
+)
+from .compliance_matrix import MATRIX_BATCH_SIZE, MATRIX_MODELS, matrix_query, matrix_response
+from .compliance_periods import FREQUENCY_STEPS, sync_periods
+from .events import EVENT_INSERT_BATCH_SIZE, denied_events, emit_event, emit_events, pending_events
+from .search import (
+    INSTRUCTION_MODELS,
+    NOTE_MODELS,
+    SEARCH_CONFIG,
+    note_document,
+    search_notes,
+    search_report_instructions,
+    tsquery,
+)
+from .sweeper import (
+    SWEEPS,
+    Sweep,
+    init_sweeper,
+    rewind_period_marks,
+    sweep,
+    sweep_tenant,
+    sweeper_marks,
+)
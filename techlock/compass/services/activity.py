@@ -0,0 +1,143 @@
+"""
+Activity feed of an audit or compliance.
+
+    GET /activity?audit_id=...&limit=50
+    GET /activity?compliance_period_id=...&cursor=<next_cursor>
+
+Events, comments, journals and uploads that reference the same audit, instruction, compliance or period,
+merged into one stream, newest first. One UNION ALL query reads every page, each branch is limited on its own
+so Postgres reads at most `limit + 1` rows per table, from the (audit_id | compliance_period_id, timestamp, id) indexes.
+
+Pages are keyset paginated on (timestamp, id): the cursor holds the last item of the page,
+the next page continues right after it, no matter how many items were added in the meantime.
+Journals have no timestamp, their `created_on` is used instead.
+
+Every branch is filtered like the type's own list endpoint, by the claims of the caller for that type,
+types the caller can not read are left out.
+"""
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ClauseElement
+
+from ..api.cursors import decode_cursor, encode_cursor
+from ..models import ACTIVITY_TYPES, Comment, Event, Journal, Upload
+from ..models.activity import SCOPE_FIELDS
+
+__all__ = [
+    'ACTIVITY_MODELS',
+    'activity_page',
+]
+
+ACTIVITY_MODELS = {
+    'event': Event,
+    'comment': Comment,
+    'journal': Journal,
+    'upload': Upload,
+}
+
+
+def _column(model, name: str, type_=sa.String):
+    column = getattr(model, name, None)
+    if column is None:
+        return sa.cast(sa.null(), type_).label(name)
+
+    return column.label(name)
+
+
+def _branch(
+    session: Session,
+    kind: str,
+    tenant_id: str,
+    criteria: Optional[ClauseElement],
+    scope: Dict[str, Any],
+    after,
+    limit: int,
+):
+    model = ACTIVITY_MODELS[kind]
+    timestamp = getattr(model, 'timestamp', model.created_on)
+
+    query = session.query(
+        sa.literal(kind, sa.String).label('type'),
+        model.id.label('id'),
+        model.name.label('name'),
+        model.description.label('description'),
+        timestamp.label('timestamp'),
+        model.created_by.label('created_by'),
+        *[_column(model, name, UUID) for name in SCOPE_FIELDS],
+        (sa.cast(Event.type, sa.String) if model is Event else sa.cast(sa.null(), sa.String)).label('event_type'),
+        (sa.cast(Event.visibility, sa.String) if model is Event else sa.cast(sa.null(), sa.String)).label('visibility'),
+        _column(model, 'uuid'),
+        _column(model, 'audit_evidence', sa.Boolean),
+    ).filter(
+        model.tenant_id == tenant_id,
+        model.is_active.is_(True),
+    )
+    if criteria is not None:
+        query = query.filter(criteria)
+    for name, value in scope.items():
+        column = getattr(model, name, None)
+        if column is None:
+            # Uploads have no instruction, they never match an instruction scope.
+            return None
+        query = query.filter(column == str(value))
+
+    if after is not None:
+        query = query.filter(sa.tuple_(timestamp, model.id) < sa.tuple_(*after))
+
+    # Limiting every branch keeps each table's scan to one page.
+    return query.order_by(timestamp.desc(), model.id.desc()).limit(limit)
+
+
+def activity_page(
+    session: Session,
+    tenant_id: str,
+    scope: Dict[str, Any],
+    criteria: Dict[str, Optional[ClauseElement]],
+    types: List[str] = ACTIVITY_TYPES,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+) -> Dict[str, Any]:
+    """
+    Returns a page of the activity matching `scope`, a dict of SCOPE_FIELDS to ids,
+    as `{'items': [...], 'limit': limit, 'next_cursor': ...}`.
+    `criteria` are the claim criteria per type, see `scope_criteria`, types without criteria are left out.
+    """
+    after = decode_cursor(cursor, datetime.fromisoformat, uuid.UUID) if cursor else None
+    branches = [
+        branch for branch in (
+            _branch(session, kind, tenant_id, criteria[kind], scope, after, limit + 1)
+            for kind in ACTIVITY_TYPES if kind in types and kind in criteria
+        )
+        if branch is not None
+    ]
+    if not branches:
+        return {'items': [], 'limit': limit, 'next_cursor': None}
+
+    merged = branches[0].union_all(*branches[1:]) if len(branches) > 1 else branches[0]
+    activity = merged.subquery('activity')
+    rows = session.query(activity).order_by(
+        activity.c.timestamp.desc(),
+        activity.c.id.desc(),
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+
+    items = []
+    for row in rows:
+        item = {k: v for k, v in row._asdict().items() if v is not None}
+        item['id'] = str(row.id)
+        item['timestamp'] = row.timestamp.isoformat()
+        for name in SCOPE_FIELDS:
+            if name in item:
+                item[name] = str(item[name])
+        items.append(item)
+
+    return {'items': items, 'limit': limit, 'next_cursor': next_cursor}
@@ -0,0 +1,140 @@
+"""
+Multiple operations in one request and one transaction.
+
+    POST /batch[?dry_run=true]
+    {"operations": [
+        {"method": "PUT", "path": "/audit_responses/<id>", "body": {...}, "if_match": "W/\"...\""},
+        {"method": "POST", "path": "/comments", "body": {...}},
+        {"method": "POST", "path": "/events", "body": {...}}
+    ]}
+
+Every operation is dispatched to its route like a request of its own, with the caller's Authorization header,
+so routes check claims and validate input like they always do, and claims resolved once are reused from the cache.
+Their queries are counted as queries of the batch request, see `count_in_parent_request`.
+Write operations run as dry-runs, they share the request's session and nothing is committed until all operations
+succeeded, then the transaction is committed once. The first operation that fails stops the batch,
+everything is rolled back. With `dry_run=true` nothing is committed either way.
+
+Routes that commit on their own, without honoring `dry_run`, can't be part of a batch, their commit fails the batch.
+Streamed responses, exports, the compliance matrix and the audit change feed, can't be part of a batch either,
+they are rejected with a 400 before they run.
+Objects created within a batch get their ids when they are added, so the results include them.
+"""
+import logging
+import re
+import uuid
+from typing import Any, Dict, List
+from urllib.parse import parse_qsl
+
+from flask import Flask, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from techlock.common.orm.sqlalchemy import db
+from werkzeug.datastructures import MultiDict
+from werkzeug.test import EnvironBuilder
+
+from ..orm.query_counter import count_in_parent_request
+
+__all__ = [
+    'BatchCommitError',
+    'run_batch',
+]
+
+logger = logging.getLogger(__name__)
+
+IN_BATCH_KEY = 'compass_in_batch'
+WRITE_METHODS = ('POST', 'PUT', 'DELETE')
+# Routes whose body is generated after the view returned, outside of the batch.
+STREAMING_PATHS = re.compile(r'/(?:[^/]+/export|compliances/[^/]+/matrix|audits/[^/]+/changes)')
+
+
+class BatchCommitError(RuntimeError):
+    pass
+
+
+@event.listens_for(Session, 'before_commit')
+def _refuse_commit(session: Session):
+    if session.info.get(IN_BATCH_KEY):
+        raise BatchCommitError('The operation commits on its own, it can not be part of a batch.')
+
+
+@event.listens_for(Session, 'transient_to_pending')
+def _assign_id(session: Session, obj):
+    # Ids are generated by the database, objects of a batch are not flushed before they are serialized.
+    if session.info.get(IN_BATCH_KEY) and hasattr(obj, 'id') and obj.id is None:
+        obj.id = uuid.uuid4()
+
+
+def _run_operation(app: Flask, operation: Dict[str, Any], base_url: str, batch_path: str) -> Dict[str, Any]:
+    method = operation['method']
+    path, _, query_string = operation['path'].partition('?')
+    if path.rstrip('/') == batch_path:
+        return {'status': 400, 'body': {'message': 'Batches can not be nested.'}}
+    if STREAMING_PATHS.fullmatch(path.rstrip('/')):
+        return {'status': 400, 'body': {'message': 'Streamed responses can not be part of a batch.'}}
+
+    query = MultiDict(parse_qsl(query_string))
+    for key, value in operation['query'].items():
+        query.add(key, value)
+    if method in WRITE_METHODS:
+        query.setlist('dry_run', ['true'])
+
+    headers = {}
+    if request.headers.get('Authorization'):
+        headers['Authorization'] = request.headers['Authorization']
+    if operation.get('if_match'):
+        headers['If-Match'] = operation['if_match']
+
+    builder = EnvironBuilder(
+        path=path,
+        base_url=base_url,
+        method=method,
+        query_string=query,
+        headers=headers,
+        json=operation.get('body') if method in WRITE_METHODS else None,
+    )
+    try:
+        with app.request_context(builder.get_environ()), count_in_parent_request():
+            response = app.full_dispatch_request()
+    except Exception:
+        logger.exception('Batch operation failed', extra={'method': method, 'path': path})
+        return {'status': 500, 'body': {'message': 'Internal server error.'}}
+
+    return {
+        'status': response.status_code,
+        'body': response.get_json(silent=True),
+        'etag': response.headers.get('ETag'),
+    }
+
+
+def run_batch(app: Flask, operations: List[Dict[str, Any]], dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Run `operations` in order, in the request's transaction, committed when all succeed and it's not a dry-run.
+    Returns `{'results': [...], 'committed': ...}`, results stop at the first failed operation.
+    """
+    session = db.session()
+    batch_path = request.path.rstrip('/')
+
+    results = []
+    failed = False
+    session.info[IN_BATCH_KEY] = True
+    try:
+        for operation in operations:
+            result = _run_operation(app, operation, request.url_root, batch_path)
+            results.append(result)
+            if result['status'] >= 400:
+                failed = True
+                break
+    finally:
+        session.info.pop(IN_BATCH_KEY, None)
+
+    if failed:
+        logger.info('Batch failed', extra={'operations': len(operations), 'failed': len(results) - 1})
+        db.session.rollback()
+        return {'results': results, 'committed': False}
+
+    # no need to rollback on dry-run, flask-sqlalchemy does this for us.
+    if not dry_run:
+        db.session.commit()
+
+    return {'results': results, 'committed': not dry_run}
@@ -0,0 +1,292 @@
+"""
+Change feed per audit.
+
+    GET /audits/<audit_id>/changes                      text/event-stream
+    GET /audits/<audit_id>/changes?mode=poll&wait=25    JSON, long-poll
+
+Created, updated and deleted AuditResponses, Comments and Events of an audit are appended to a Redis stream,
+`compass:changes:audit:<audit_id>`, once the transaction that changed them commits. Rolled back changes are never
+published. Every stream keeps its last `CHANGE_FEED_MAX_LEN` changes.
+
+Clients read the stream over server-sent events. The id of every message is its stream entry id, EventSource sends it
+back as `Last-Event-ID` when it reconnects, and the feed continues right after it. When the client is too far behind
+and the entry was trimmed, a `reset` event tells it to reload the audit before following the feed again.
+A connection is closed after `CHANGE_FEED_MAX_DURATION` seconds, so streams don't hold on to a worker thread forever,
+EventSource reconnects on its own.
+
+Every open stream holds a worker thread, gunicorn only has workers x threads of them, 16 by default.
+`mode=poll` is the default, a poll holds a thread for at most `wait` seconds. At most `CHANGE_FEED_MAX_STREAMS`
+streams are open per process, further streams are refused with a 503, clients fall back to polling.
+
+Changes are filtered by the caller's claims for their kind, checked against the data of the change,
+see `readable_changes`. Kinds the caller can't read, including the internal events, are left out.
+"""
+import functools
+import json
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import marshmallow.fields as mf
+from environs import Env
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ClauseElement
+
+from ..api.encoding import dumps, is_native
+from ..api.serializers import compile_schema
+from ..models import AuditResponse, AuditResponseSchema, Comment, CommentSchema, Event, EventSchema
+from ..orm.scoping import unmatched_rows
+
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+__all__ = [
+    'CHANGE_KINDS',
+    'STREAM_ID',
+    'ChangeFeed',
+    'change_feed',
+    'init_change_feed',
+    'readable_changes',
+    'record_change',
+]
+
+logger = logging.getLogger(__name__)
+
+PENDING_CHANGES_KEY = 'compass_pending_changes'
+
+STREAM_ID = re.compile(r'^\d+-\d+$')
+
+# Kind of change, and the schema its data is serialized with, per model.
+CHANGE_KINDS = {
+    AuditResponse: ('audit_response', AuditResponseSchema),
+    Comment: ('comment', CommentSchema),
+    Event: ('event', EventSchema),
+}
+
+_feed = None
+
+
+@functools.lru_cache(maxsize=None)
+def _serializer(schema_cls, native: bool):
+    nested = [name for name, field in schema_cls._declared_fields.items() if isinstance(field, mf.Nested)]
+    return compile_schema(schema_cls(exclude=nested), native=native)
+
+
+class ChangeFeed:
+    def __init__(self, client, max_len: int = 1000, block: int = 15, max_duration: int = 300, max_streams: int = 2):
+        self.client = client
+        self.max_len = max_len
+        self.block = block
+        self.max_duration = max_duration
+        self._streams = threading.BoundedSemaphore(max_streams)
+
+    @staticmethod
+    def key(audit_id: str) -> str:
+        return f'compass:changes:audit:{audit_id}'
+
+    def publish(self, changes: List[Tuple[str, Dict[str, Any]]]):
+        pipeline = self.client.pipeline(transaction=False)
+        for audit_id, change in changes:
+            pipeline.xadd(self.key(audit_id), {'data': dumps(change)}, maxlen=self.max_len, approximate=True)
+        pipeline.execute()
+
+    def read(self, audit_id: str, last_id: str, block: Optional[int] = None, count: int = 100) -> List[Tuple[str, bytes]]:
+        """
+        Returns the changes after `last_id`, waiting up to `block` seconds for new ones when there are none.
+        """
+        response = self.client.xread(
+            {self.key(audit_id): last_id},
+            count=count,
+            block=int((self.block if block is None else block) * 1000) or None,
+        )
+        return [
+            (entry_id.decode('ascii') if isinstance(entry_id, bytes) else entry_id, fields[b'data'])
+            for _, entries in response or []
+            for entry_id, fields in entries
+        ]
+
+    def last_id(self, audit_id: str) -> str:
+        """
+        Id of the newest change, '0-0' for audits without changes.
+        """
+        entries = self.client.xrevrange(self.key(audit_id), count=1)
+        if not entries:
+            return '0-0'
+
+        entry_id = entries[0][0]
+        return entry_id.decode('ascii') if isinstance(entry_id, bytes) else entry_id
+
+    def is_trimmed(self, audit_id: str, last_id: str) -> bool:
+        """
+        Whether changes after `last_id` were already trimmed from the stream.
+        """
+        if last_id == '0-0':
+            return False
+        entries = self.client.xrange(self.key(audit_id), count=1)
+        if not entries:
+            return False
+
+        first_id = entries[0][0]
+        first_id = first_id.decode('ascii') if isinstance(first_id, bytes) else first_id
+        return _parse_id(last_id) < _parse_id(first_id)
+
+    def acquire_stream(self) -> bool:
+        """
+        Reserve one of the streams of this process, returns False when all are in use.
+        """
+        return self._streams.acquire(blocking=False)
+
+    def release_stream(self):
+        self._streams.release()
+
+    def stream(
+        self,
+        audit_id: str,
+        last_id: Optional[str],
+        allow: Callable[[List[Tuple[str, bytes]]], List[Tuple[str, bytes]]] = None,
+    ) -> Iterator[bytes]:
+        """
+        Server-sent events of the changes after `last_id`, or from now on without `last_id`.
+        `allow` filters every batch of changes that is read, see `readable_changes`.
+        """
+        yield b'retry: 3000\n\n'
+        if last_id is None:
+            last_id = self.last_id(audit_id)
+        elif self.is_trimmed(audit_id, last_id):
+            last_id = self.last_id(audit_id)
+            yield f'id: {last_id}\nevent: reset\ndata: {{}}\n\n'.encode('utf-8')
+
+        deadline = time.monotonic() + self.max_duration
+        while time.monotonic() < deadline:
+            changes = self.read(audit_id, last_id, block=min(self.block, max(deadline - time.monotonic(), 0.001)))
+            if changes:
+                last_id = changes[-1][0]
+                if allow is not None:
+                    changes = allow(changes)
+            if not changes:
+                yield b': keep-alive\n\n'
+                continue
+
+            for entry_id, data in changes:
+                kind = json.loads(data)['type']
+                yield f'id: {entry_id}\nevent: {kind}\ndata: '.encode('utf-8') + data + b'\n\n'
+
+
+def _parse_id(entry_id: str) -> Tuple[int, int]:
+    milliseconds, sequence = entry_id.split('-')
+    return int(milliseconds), int(sequence)
+
+
+def change_feed() -> Optional[ChangeFeed]:
+    return _feed
+
+
+def readable_changes(
+    changes: List[Tuple[str, bytes]],
+    criteria: Dict[str, Optional[ClauseElement]],
+    session: Session,
+) -> List[Tuple[str, bytes]]:
+    """
+    The `changes`, as read from the feed, the caller can read. `criteria` are the claim criteria per kind,
+    see `scope_criteria`, changes of kinds without criteria are left out. One statement per kind.
+    """
+    decoded = [json.loads(data) for _, data in changes]
+    denied = set()
+    for model, (kind, _) in CHANGE_KINDS.items():
+        positions = [i for i, change in enumerate(decoded) if change['type'] == kind]
+        if not positions:
+            continue
+        if kind not in criteria:
+            denied.update(positions)
+            continue
+
+        # Whether the object can be read, deleted ones included.
+        rows = [{**decoded[i]['data'], 'is_active': True} for i in positions]
+        denied.update(positions[i] for i in unmatched_rows(model, criteria[kind], rows, session=session))
+
+    return [change for i, change in enumerate(changes) if i not in denied]
+
+
+def record_change(session: Session, kind: str, op: str, audit_id: Optional[str], data: Dict[str, Any]):
+    """
+    Queue a change of an audit, published when `session` commits.
+    """
+    if _feed is None or audit_id is None:
+        return
+
+    session.info.setdefault(PENDING_CHANGES_KEY, []).append((str(audit_id), {
+        'type': kind,
+        'op': op,
+        'id': data.get('id'),
+        'data': data,
+    }))
+
+
+@event.listens_for(Session, 'after_flush')
+def _record_flushed_changes(session: Session, flush_context):
+    if _feed is None:
+        return
+
+    for objects, op in ((session.new, 'create'), (session.dirty, 'update'), (session.deleted, 'delete')):
+        for obj in objects:
+            kind = CHANGE_KINDS.get(type(obj))
+            if kind is None or (op == 'update' and not session.is_modified(obj)):
+                continue
+            name, schema_cls = kind
+            # Deletes that only deactivate the row.
+            obj_op = 'delete' if op == 'update' and obj.is_active is False else op
+            record_change(session, name, obj_op, obj.audit_id, _serializer(schema_cls, is_native())(obj))
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_changes(session: Session):
+    changes = session.info.pop(PENDING_CHANGES_KEY, None)
+    if not changes or _feed is None:
+        return
+
+    try:
+        _feed.publish(changes)
+    except Exception:
+        # The transaction is committed already, clients catch up with the next change or reload.
+        logger.exception('Failed to publish changes', extra={'count': len(changes)})
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_changes(session: Session):
+    session.info.pop(PENDING_CHANGES_KEY, None)
+
+
+def init_change_feed(app: Flask, enabled: bool = None) -> Optional[ChangeFeed]:
+    """
+    Publish changes to, and read the feed from, the Redis configured with `REDIS_HOST`.
+    """
+    global _feed
+
+    env = Env()
+    if enabled is None:
+        enabled = env.bool('CHANGE_FEED_ENABLED', True)
+    host = env.str('REDIS_HOST', None)
+    if not enabled or not host or redis is None:
+        return None
+
+    client = redis.Redis(
+        host=host,
+        port=env.int('REDIS_PORT', 6379),
+        db=env.int('REDIS_DB', 0),
+        socket_connect_timeout=env.int('REDIS_SOCKET_CONNECT_TIMEOUT', 30),
+    )
+    _feed = ChangeFeed(
+        client,
+        max_len=env.int('CHANGE_FEED_MAX_LEN', 1000),
+        block=env.int('CHANGE_FEED_HEARTBEAT', 15),
+        max_duration=env.int('CHANGE_FEED_MAX_DURATION', 300),
+        max_streams=env.int('CHANGE_FEED_MAX_STREAMS', 2),
+    )
+    logger.info('Change feed enabled', extra={'redis_host': host})
+    return _feed
@@ -0,0 +1,184 @@
+"""
+Task x period status matrix of a compliance program.
+
+    GET /compliances/<compliance_id>/matrix
+
+A single query returns one row per CompliancePeriod, with its task and the latest ComplianceResponse of the period.
+Window functions number the periods of every task and count them per status, so the rows can be written to
+the response as they are read from a server side cursor, one task at a time, for programs of any length.
+
+Tasks, periods and responses are each filtered by the caller's claims for them, like their own list endpoints.
+Without access to tasks or periods the matrix is empty, without access to responses it has no phases and statuses.
+"""
+import itertools
+import logging
+from typing import Any, Dict, Iterator, Optional
+
+import sqlalchemy as sa
+from flask import Response
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import ClauseElement
+from techlock.common.orm.sqlalchemy import db
+
+from ..api.encoding import dumps, isoformat
+from ..models import CompliancePeriod, ComplianceResponse, ComplianceTask
+from ..models.compliance_response import Status
+from ..orm.streaming import snapshot_session
+
+__all__ = [
+    'MATRIX_BATCH_SIZE',
+    'MATRIX_MODELS',
+    'matrix_query',
+    'matrix_response',
+]
+
+logger = logging.getLogger(__name__)
+
+MATRIX_BATCH_SIZE = 1000
+MATRIX_MODELS = {
+    'compliance_task': ComplianceTask,
+    'compliance_period': CompliancePeriod,
+    'compliance_response': ComplianceResponse,
+}
+
+
+def _readable(criteria: Dict[str, Optional[ClauseElement]], kind: str) -> ClauseElement:
+    if kind not in criteria:
+        return sa.false()
+
+    return criteria[kind] if criteria[kind] is not None else sa.true()
+
+
+def matrix_query(
+    session: Session,
+    compliance_id: str,
+    tenant_id: str,
+    criteria: Dict[str, Optional[ClauseElement]],
+) -> Query:
+    """
+    Periods of `compliance_id` ordered by task and start date, with the phase and status of their latest response.
+    `criteria` are the claim criteria per kind of `MATRIX_MODELS`, see `scope_criteria`, kinds without criteria
+    are left out.
+    """
+    latest_responses = session.query(
+        ComplianceResponse.period_id,
+        ComplianceResponse.phase,
+        ComplianceResponse.status,
+        sa.func.row_number().over(
+            partition_by=ComplianceResponse.period_id,
+            order_by=(
+                sa.func.coalesce(ComplianceResponse.changed_on, ComplianceResponse.created_on).desc(),
+                ComplianceResponse.id.desc(),
+            ),
+        ).label('rank'),
+    ).filter(
+        ComplianceResponse.tenant_id == tenant_id,
+        ComplianceResponse.compliance_id == compliance_id,
+        ComplianceResponse.is_active.is_(True),
+        _readable(criteria, 'compliance_response'),
+    ).subquery('latest_responses')
+
+    by_task = {'partition_by': CompliancePeriod.task_id}
+    status_counts = [
+        sa.func.count(latest_responses.c.status).filter(
+            latest_responses.c.status == status,
+        ).over(**by_task).label(f'status_{status.name}')
+        for status in Status
+    ]
+
+    return session.query(
+        ComplianceTask.id.label('task_id'),
+        ComplianceTask.name.label('task_name'),
+        ComplianceTask.frequency,
+        CompliancePeriod.id.label('period_id'),
+        CompliancePeriod.start_date,
+        CompliancePeriod.end_date,
+        latest_responses.c.phase,
+        latest_responses.c.status,
+        sa.func.row_number().over(order_by=CompliancePeriod.start_date, **by_task).label('period_index'),
+        sa.func.count().over(**by_task).label('period_count'),
+        *status_counts,
+    ).join(
+        ComplianceTask,
+        ComplianceTask.id == CompliancePeriod.task_id,
+    ).outerjoin(
+        latest_responses,
+        sa.and_(
+            latest_responses.c.period_id == CompliancePeriod.id,
+            latest_responses.c.rank == 1,
+        ),
+    ).filter(
+        CompliancePeriod.tenant_id == tenant_id,
+        CompliancePeriod.compliance_id == compliance_id,
+        CompliancePeriod.is_active.is_(True),
+        ComplianceTask.is_active.is_(True),
+        _readable(criteria, 'compliance_period'),
+        _readable(criteria, 'compliance_task'),
+    ).order_by(
+        ComplianceTask.name,
+        ComplianceTask.id,
+        CompliancePeriod.start_date,
+    )
+
+
+def _name(value):
+    return value.name if value is not None else None
+
+
+def _task(row) -> Dict[str, Any]:
+    return {
+        'id': str(row.task_id),
+        'name': row.task_name,
+        'frequency': _name(row.frequency),
+        'period_count': row.period_count,
+        'status_counts': {status.name: getattr(row, f'status_{status.name}') for status in Status},
+    }
+
+
+def _period(row) -> Dict[str, Any]:
+    return {
+        'index': row.period_index,
+        'id': str(row.period_id),
+        'start_date': isoformat(row.start_date),
+        'end_date': isoformat(row.end_date),
+        'phase': _name(row.phase),
+        'status': _name(row.status),
+    }
+
+
+def _stream(
+    engine,
+    compliance: Dict[str, Any],
+    compliance_id: str,
+    tenant_id: str,
+    criteria: Dict[str, Optional[ClauseElement]],
+) -> Iterator[bytes]:
+    yield b'{"compliance":' + dumps(compliance) + b',"tasks":['
+
+    with snapshot_session(engine, tenant_id) as session:
+        rows = matrix_query(session, compliance_id, tenant_id, criteria).yield_per(MATRIX_BATCH_SIZE)
+        for i, (_, task_rows) in enumerate(itertools.groupby(rows, key=lambda row: row.task_id)):
+            first = next(task_rows)
+            task = _task(first)
+            task['periods'] = [_period(first)] + [_period(row) for row in task_rows]
+            yield (b',' if i else b'') + dumps(task)
+
+    yield b']}'
+
+
+def matrix_response(
+    compliance: Dict[str, Any],
+    compliance_id: str,
+    tenant_id: str,
+    criteria: Dict[str, Optional[ClauseElement]],
+) -> Response:
+    """
+    Streams the matrix of `compliance_id`, `compliance` is the serialized program it belongs to.
+
+    The caller checks the user's access to the compliance, `criteria` filter its tasks, periods and responses,
+    see `matrix_query`.
+    """
+    return Response(
+        _stream(db.engine, compliance, compliance_id, tenant_id, criteria),
+        mimetype='application/json',
+    )
@@ -0,0 +1,150 @@
+"""
+CompliancePeriod generation.
+
+Every task of a compliance program gets one period per `frequency` step between the program's start_date and end_date,
+the last period ends on the program's end_date. The schedule is computed by Postgres with `generate_series`
+and written with a single statement, which only touches what differs from the stored periods:
+missing periods are inserted, periods whose end_date moved are updated,
+and periods outside of the schedule, for example after end_date was shortened, are deactivated.
+Periods whose end_date moved behind the sweeper's marks are flagged by its next run.
+
+The tasks of a program are the tasks that have active periods, plus the ones passed as `task_ids`.
+"""
+import logging
+from datetime import datetime
+from typing import Dict, Iterable
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from techlock.common.config import AuthInfo
+
+from ..models import Compliance
+from ..models.compliance_task import Frequency
+from .sweeper import rewind_period_marks
+
+__all__ = [
+    'FREQUENCY_STEPS',
+    'sync_periods',
+]
+
+logger = logging.getLogger(__name__)
+
+# Interval between the periods of a task, and the minimum number of days in that interval.
+FREQUENCY_STEPS = {
+    Frequency.weekly: ('1 week', 7),
+    Frequency.monthly: ('1 month', 28),
+    Frequency.quarterly: ('3 months', 89),
+    Frequency.semiannually: ('6 months', 181),
+    Frequency.annually: ('1 year', 365),
+}
+
+_STEPS = ', '.join(
+    f"('{frequency.name}', interval '{step}', {min_days})"
+    for frequency, (step, min_days) in FREQUENCY_STEPS.items()
+)
+
+# Periods are offset from the program's start_date, `start + n * step`, so months never drift towards the 28th.
+_SYNC_PERIODS = text(f"""
+WITH steps (frequency, step, min_days) AS (
+    VALUES {_STEPS}
+),
+program AS (
+    SELECT id, tenant_id, start_date, end_date
+    FROM compliances
+    WHERE id = CAST(:compliance_id AS uuid) AND tenant_id = :tenant_id
+),
+schedule AS (
+    SELECT
+        program.id AS compliance_id,
+        program.tenant_id,
+        task.id AS task_id,
+        task.name AS task_name,
+        (program.start_date + n * steps.step)::date AS start_date,
+        least((program.start_date + (n + 1) * steps.step)::date - 1, program.end_date) AS end_date
+    FROM program
+    JOIN compliance_tasks task ON task.tenant_id = program.tenant_id AND task.is_active IS true
+    JOIN steps ON steps.frequency = task.frequency::text
+    CROSS JOIN LATERAL generate_series(0, (program.end_date - program.start_date) / steps.min_days) AS n
+    WHERE (program.start_date + n * steps.step)::date <= program.end_date
+      AND (
+        task.id = ANY(CAST(:task_ids AS uuid[]))
+        OR task.id IN (
+            SELECT task_id FROM compliance_periods
+            WHERE compliance_id = program.id AND is_active IS true
+        )
+      )
+),
+inserted AS (
+    INSERT INTO compliance_periods (
+        name, tenant_id, created_by, created_on, changed_by, changed_on, is_active,
+        compliance_id, task_id, start_date, end_date
+    )
+    SELECT
+        task_name || ' ' || to_char(start_date, 'YYYY-MM-DD'), tenant_id, :user_id, :now, :user_id, :now, true,
+        compliance_id, task_id, start_date, end_date
+    FROM schedule
+    ON CONFLICT (compliance_id, task_id, start_date) WHERE is_active IS true DO NOTHING
+    RETURNING 1
+),
+updated AS (
+    UPDATE compliance_periods period
+    SET end_date = schedule.end_date, changed_by = :user_id, changed_on = :now
+    FROM schedule
+    WHERE period.compliance_id = schedule.compliance_id
+      AND period.task_id = schedule.task_id
+      AND period.start_date = schedule.start_date
+      AND period.end_date <> schedule.end_date
+      AND period.is_active IS true
+    RETURNING period.end_date
+),
+deactivated AS (
+    UPDATE compliance_periods period
+    SET is_active = false, changed_by = :user_id, changed_on = :now
+    FROM program
+    WHERE period.compliance_id = program.id
+      AND period.is_active IS true
+      AND NOT EXISTS (
+        SELECT 1 FROM schedule
+        WHERE schedule.task_id = period.task_id AND schedule.start_date = period.start_date
+      )
+    RETURNING 1
+)
+SELECT
+    (SELECT count(*) FROM inserted) AS created,
+    (SELECT count(*) FROM updated) AS updated,
+    (SELECT count(*) FROM deactivated) AS deactivated,
+    (SELECT min(end_date) FROM updated) AS earliest_end_date
+""")
+
+
+def sync_periods(
+    session: Session,
+    compliance: Compliance,
+    current_user: AuthInfo,
+    task_ids: Iterable[str] = None,
+) -> Dict[str, int]:
+    """
+    Bring the periods of `compliance` in line with its dates and tasks, adding `task_ids` to its tasks.
+    Pending changes of `compliance` are flushed first. Returns the number of created, updated and deactivated periods.
+    Periods that moved behind the sweeper's marks rewind them, see `rewind_period_marks`. Nothing is committed.
+    """
+    session.flush()
+
+    task_ids = [str(task_id) for task_id in task_ids or []]
+    row = session.execute(_SYNC_PERIODS, {
+        'compliance_id': str(compliance.id),
+        'tenant_id': compliance.tenant_id,
+        'task_ids': task_ids,
+        'user_id': current_user.user_id,
+        'now': datetime.utcnow(),
+    }).first()
+    if row.earliest_end_date is not None:
+        rewind_period_marks(session, compliance.tenant_id, row.earliest_end_date)
+
+    result = {
+        'created': row.created,
+        'updated': row.updated,
+        'deactivated': row.deactivated,
+    }
+    logger.info('Synced compliance periods', extra={'compliance_id': str(compliance.id), **result})
+    return result
@@ -0,0 +1,204 @@
+"""
+Buffered event emission.
+
+Events are the highest volume table, writing every event with its own INSERT, or its own transaction, does not scale.
+`emit_event` only adds the event to a buffer on the session. Right before the session commits, the buffer is written
+with a single multi-row INSERT, in the same transaction as the changes the events describe.
+When the transaction is rolled back, like on dry-runs or errors, the buffered events are dropped with it.
+
+    emit_event(Type.update, current_user, obj=audit)
+    audit.save(current_user, claims=claims, commit=not dry_run)
+
+Events emitted for an object reference it, and its audit or compliance, and are resolved when the buffer is written,
+so objects created in the same transaction have their ids.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from techlock.common.api.auth.claim import ClaimSet
+from techlock.common.config import AuthInfo
+from techlock.common.orm.sqlalchemy import db
+
+from ..models import Event
+from ..models.event import Type, Visibility
+from ..orm.scoping import denied_rows
+from .change_feed import record_change
+
+__all__ = [
+    'EVENT_INSERT_BATCH_SIZE',
+    'denied_events',
+    'emit_event',
+    'emit_events',
+    'pending_events',
+]
+
+logger = logging.getLogger(__name__)
+
+PENDING_EVENTS_KEY = 'compass_pending_events'
+# Rows per INSERT, larger buffers are written with a few statements.
+EVENT_INSERT_BATCH_SIZE = 1000
+
+REFERENCE_FIELDS = ('audit_id', 'audit_instruction_id', 'compliance_id', 'compliance_period_id')
+# Columns clients can set on the events they submit, the rest is set by the server.
+CLIENT_FIELDS = ('name', 'description', 'tags', 'timestamp', 'type', 'visibility', *REFERENCE_FIELDS)
+
+# Event references that are named differently on the object, by table.
+_REFERENCE_ALIASES = {
+    'audits': {'audit_id': 'id'},
+    'audit_responses': {'audit_instruction_id': 'instruction_id'},
+    'compliances': {'compliance_id': 'id'},
+    'compliance_periods': {'compliance_period_id': 'id'},
+    'compliance_responses': {'compliance_period_id': 'period_id'},
+}
+
+
+@dataclass
+class _PendingEvent:
+    type: Type
+    visibility: Visibility
+    tenant_id: str
+    user_id: str
+    timestamp: datetime
+    obj: Any = None
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+    def references(self) -> Dict[str, Any]:
+        table = getattr(self.obj, '__tablename__', None)
+        aliases = _REFERENCE_ALIASES.get(table, {})
+        references = {}
+        for name in REFERENCE_FIELDS:
+            attribute = aliases.get(name, name)
+            # The object itself may be gone once a delete is committed, only reference its parents.
+            if self.type == Type.delete and attribute == 'id':
+                continue
+            value = getattr(self.obj, attribute, None)
+            references[name] = str(value) if value is not None else None
+
+        return references
+
+    def row(self) -> Dict[str, Any]:
+        row = {
+            'name': self.type.name,
+            'description': None,
+            'tags': {},
+            'tenant_id': self.tenant_id,
+            'created_by': self.user_id,
+            'created_on': self.timestamp,
+            'changed_by': self.user_id,
+            'changed_on': self.timestamp,
+            'is_active': True,
+            'timestamp': self.timestamp,
+            'type': self.type,
+            'visibility': self.visibility,
+            **dict.fromkeys(REFERENCE_FIELDS),
+        }
+        if self.obj is not None:
+            table = self.obj.__tablename__
+            row.update(self.references())
+            row['name'] = f'{table}.{self.type.name}'
+            row['description'] = getattr(self.obj, 'name', None)
+            row['tags'] = {'resource': table, 'resource_id': str(self.obj.id) if self.obj.id is not None else None}
+        row.update(self.fields)
+
+        return row
+
+
+def _change_data(id, row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        **row,
+        'id': str(id),
+        'type': row['type'].name,
+        'visibility': row['visibility'].name,
+    }
+
+
+def pending_events(session: Session = None) -> List[_PendingEvent]:
+    session = session or db.session
+    return session.info.setdefault(PENDING_EVENTS_KEY, [])
+
+
+def emit_event(
+    type: Type,
+    current_user: AuthInfo,
+    obj=None,
+    visibility: Visibility = Visibility.internal,
+    session: Session = None,
+    **fields,
+):
+    """
+    Buffer an event, written when `session`, the request's session by default, commits.
+    `obj` is the object the event is about, `fields` are Event columns and override what is derived from `obj`.
+    """
+    pending_events(session).append(_PendingEvent(
+        type=type,
+        visibility=visibility,
+        tenant_id=current_user.tenant_id,
+        user_id=current_user.user_id,
+        timestamp=fields.pop('timestamp', None) or datetime.utcnow(),
+        obj=obj,
+        fields=fields,
+    ))
+
+
+def _submitted_event(item: Dict[str, Any], current_user: AuthInfo) -> _PendingEvent:
+    fields = {k: v for k, v in item.items() if k in CLIENT_FIELDS}
+    return _PendingEvent(
+        type=fields.pop('type'),
+        visibility=fields.pop('visibility', Visibility.internal),
+        tenant_id=current_user.tenant_id,
+        user_id=current_user.user_id,
+        timestamp=fields.pop('timestamp', None) or datetime.utcnow(),
+        fields=fields,
+    )
+
+
+def emit_events(items: Iterable[Dict[str, Any]], current_user: AuthInfo, session: Session = None) -> int:
+    """
+    Buffer events given as Event columns, like `EventSchema` loads them. Returns the number of buffered events.
+    Events are not checked against claims, see `denied_events`.
+    """
+    pending = [_submitted_event(item, current_user) for item in items]
+    pending_events(session).extend(pending)
+
+    return len(pending)
+
+
+def denied_events(
+    items: List[Dict[str, Any]],
+    current_user: AuthInfo,
+    claims: ClaimSet,
+    session: Session = None,
+) -> List[int]:
+    """
+    Returns the indexes of the events given as Event columns, like `EventSchema` loads them,
+    that `claims` do not allow, checked the way they would be written by `emit_events`.
+    """
+    rows = [_submitted_event(item, current_user).row() for item in items]
+    return denied_rows(Event, current_user, claims, rows, session=session)
+
+
+@event.listens_for(Session, 'before_commit')
+def _write_pending_events(session: Session):
+    pending = session.info.pop(PENDING_EVENTS_KEY, None)
+    if not pending:
+        return
+
+    # Objects created in this transaction get their ids.
+    session.flush()
+    for i in range(0, len(pending), EVENT_INSERT_BATCH_SIZE):
+        rows = [e.row() for e in pending[i:i + EVENT_INSERT_BATCH_SIZE]]
+        result = session.execute(Event.__table__.insert().values(rows).returning(Event.__table__.c.id))
+        for (id,), row in zip(result, rows):
+            record_change(session, 'event', 'create', row['audit_id'], _change_data(id, row))
+    logger.debug('Wrote events', extra={'count': len(pending)})
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_pending_events(session: Session):
+    dropped = session.info.pop(PENDING_EVENTS_KEY, None)
+    if dropped:
+        logger.debug('Dropped events of rolled back transaction', extra={'count': len(dropped)})
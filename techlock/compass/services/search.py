@@ -0,0 +1,279 @@
+"""
+Full-text search.
+
+    GET /report_instructions/search?q=access control&version_id=...&limit=20
+    GET /search?q=firewall&audit_id=...&cursor=<next_cursor>
+
+`q` is parsed with `websearch_to_tsquery`, so it accepts what people type into search boxes:
+words, "quoted phrases", `or` and `-excluded` words.
+
+ReportInstructions and ReportNodes, which both hold requirement texts, are matched against their `search_vector`,
+the number and name weighted above the text, which a trigger keeps up to date, and which is covered by a GIN index,
+so a search reads each index once, across all bundled catalogs, and only filters on `version_id` afterwards.
+Matches are ranked with `ts_rank_cd`, and highlighted with `ts_headline` for the returned page only,
+highlighting is by far the most expensive part of a search.
+
+Comments, journals and summary notes are searched together, by their name and description, within an audit
+or compliance. Each table has a GIN index on `note_document`, Postgres combines it with the audit_id and
+compliance_id indexes, or only uses those for scopes with few notes, and never reads a whole tenant's notes.
+Like the activity feed, one UNION ALL query limits every table to one page, and pages are keyset paginated
+on (rank, id), the cursor holds the last result of the page. Every table is filtered by the caller's claims
+for it, kinds the caller can not read are left out.
+"""
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ClauseElement
+
+from ..api.cursors import decode_cursor, encode_cursor
+from ..api.encoding import is_native
+from ..api.serializers import dump
+from ..models import (
+    INSTRUCTION_SEARCH_TYPES,
+    SEARCH_TYPES,
+    Comment,
+    Journal,
+    ReportInstruction,
+    ReportInstructionSchema,
+    ReportNode,
+    ReportNodeSchema,
+    SummaryNote,
+)
+
+__all__ = [
+    'INSTRUCTION_MODELS',
+    'NOTE_MODELS',
+    'SEARCH_CONFIG',
+    'note_document',
+    'search_notes',
+    'search_report_instructions',
+    'tsquery',
+]
+
+SEARCH_CONFIG = 'english'
+# Characters of the markdown in instruction texts, they are not part of any word.
+MARKUP = r'[*_`#>|]+'
+HEADLINE_OPTIONS = 'StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2'
+# Divides the rank by itself + 1, keeps ranks between 0 and 1.
+RANK_NORMALIZATION = 32
+
+INSTRUCTION_MODELS = {
+    'report_instruction': ReportInstruction,
+    'report_node': ReportNode,
+}
+# Nested objects are not part of search results.
+_INSTRUCTION_SCHEMAS = {
+    'report_instruction': ReportInstructionSchema(exclude=('version', 'node')),
+    'report_node': ReportNodeSchema(exclude=('parent', 'children', 'version')),
+}
+
+NOTE_MODELS = {
+    'comment': Comment,
+    'journal': Journal,
+    'summary_note': SummaryNote,
+}
+
+
+def _config():
+    return sa.literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+
+def tsquery(q: str):
+    return sa.func.websearch_to_tsquery(_config(), q)
+
+
+def headline(column, query):
+    text = sa.func.regexp_replace(sa.func.coalesce(column, ''), MARKUP, ' ', 'g')
+    return sa.func.ts_headline(_config(), text, query, HEADLINE_OPTIONS)
+
+
+def note_document(model):
+    """
+    tsvector of a note's name and description.
+    Has to stay the exact expression of the `ix_<table>_search` indexes, or they are not used.
+    """
+    table = model.__tablename__
+    return sa.literal_column(
+        f"to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce({table}.name, '') || ' ' || coalesce({table}.description, ''))",
+    )
+
+
+def _instruction_branch(
+    session: Session,
+    kind: str,
+    criteria: Optional[ClauseElement],
+    version_ids: List[str],
+    query,
+):
+    model = INSTRUCTION_MODELS[kind]
+    branch = session.query(
+        sa.literal(kind, sa.String).label('type'),
+        model.id.label('id'),
+        sa.func.ts_rank_cd(model.search_vector, query, RANK_NORMALIZATION).label('rank'),
+    ).filter(
+        model.search_vector.op('@@')(query),
+    )
+    if criteria is not None:
+        branch = branch.filter(criteria)
+    if version_ids:
+        branch = branch.filter(model.version_id.in_([str(v) for v in version_ids]))
+
+    return branch
+
+
+def search_report_instructions(
+    session: Session,
+    q: str,
+    criteria: Dict[str, Optional[ClauseElement]],
+    types: List[str] = INSTRUCTION_SEARCH_TYPES,
+    version_ids: List[str] = None,
+    offset: int = 0,
+    limit: int = 20,
+) -> Dict[str, Any]:
+    """
+    Returns a page of the ReportInstructions and ReportNodes matching `q`, best match first,
+    as `{'items': [...], 'offset': offset, 'limit': limit, 'total_count': ...}`.
+    `criteria` are the claim criteria per kind, see `scope_criteria`, kinds without criteria are left out.
+    """
+    query = tsquery(q)
+    branches = [
+        _instruction_branch(session, kind, criteria[kind], version_ids, query)
+        for kind in INSTRUCTION_SEARCH_TYPES if kind in types and kind in criteria
+    ]
+    if not branches:
+        return {'items': [], 'offset': offset, 'limit': limit, 'total_count': 0}
+
+    merged = branches[0].union_all(*branches[1:]) if len(branches) > 1 else branches[0]
+    matches = merged.subquery('matches')
+    page = session.query(
+        matches,
+        sa.func.count().over().label('total_count'),
+    ).order_by(
+        matches.c.rank.desc(),
+        matches.c.id,
+    ).offset(offset).limit(limit).all()
+
+    # Only the page is loaded and highlighted, one query per kind on it.
+    found = {}
+    for kind in {row.type for row in page}:
+        model = INSTRUCTION_MODELS[kind]
+        ids = [row.id for row in page if row.type == kind]
+        rows = session.query(model, headline(model.text, query)).filter(model.id.in_(ids)).all()
+        found.update({(kind, obj.id): (obj, highlighted) for obj, highlighted in rows})
+
+    native = is_native()
+    items = []
+    for row in page:
+        obj, highlighted = found[(row.type, row.id)]
+        item = dump(_INSTRUCTION_SCHEMAS[row.type], obj, native=native)
+        item['type'] = row.type
+        item['rank'] = row.rank
+        item['headline'] = highlighted
+        items.append(item)
+
+    if page:
+        total_count = page[0].total_count
+    else:
+        # Pages past the last match have no rows to count with.
+        total_count = session.query(matches).count() if offset else 0
+
+    return {
+        'items': items,
+        'offset': offset,
+        'limit': limit,
+        'total_count': total_count,
+    }
+
+
+def _note_branch(
+    session: Session,
+    kind: str,
+    tenant_id: str,
+    criteria: Optional[ClauseElement],
+    scope: Dict[str, Any],
+    query,
+    after,
+    limit: int,
+):
+    model = NOTE_MODELS[kind]
+    document = note_document(model)
+    # Ranks are `real`, rounded to numeric they survive the round trip through the cursor exactly.
+    rank = sa.func.round(sa.cast(sa.func.ts_rank_cd(document, query, RANK_NORMALIZATION), sa.Numeric), 6)
+
+    branch = session.query(
+        sa.literal(kind, sa.String).label('type'),
+        model.id.label('id'),
+        model.name.label('name'),
+        model.description.label('description'),
+        rank.label('rank'),
+        model.created_by.label('created_by'),
+        model.created_on.label('created_on'),
+        model.audit_id.label('audit_id'),
+        model.compliance_id.label('compliance_id'),
+    ).filter(
+        model.tenant_id == tenant_id,
+        model.is_active.is_(True),
+        document.op('@@')(query),
+    )
+    if criteria is not None:
+        branch = branch.filter(criteria)
+    for name, value in scope.items():
+        branch = branch.filter(getattr(model, name) == str(value))
+
+    if after is not None:
+        branch = branch.filter(sa.tuple_(rank, model.id) < sa.tuple_(sa.literal(after[0], sa.Numeric), after[1]))
+
+    return branch.order_by(rank.desc(), model.id.desc()).limit(limit)
+
+
+def search_notes(
+    session: Session,
+    tenant_id: str,
+    q: str,
+    scope: Dict[str, Any],
+    criteria: Dict[str, Optional[ClauseElement]],
+    types: List[str] = SEARCH_TYPES,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+) -> Dict[str, Any]:
+    """
+    Returns a page of the comments, journals and summary notes matching `q` and `scope`,
+    a dict of audit_id and/or compliance_id, best match first, as `{'items': [...], 'limit': limit, 'next_cursor': ...}`.
+    `criteria` are the claim criteria per kind, see `scope_criteria`, kinds without criteria are left out.
+    """
+    after = decode_cursor(cursor, Decimal, uuid.UUID) if cursor else None
+    query = tsquery(q)
+    branches = [
+        _note_branch(session, kind, tenant_id, criteria[kind], scope, query, after, limit + 1)
+        for kind in SEARCH_TYPES if kind in types and kind in criteria
+    ]
+    if not branches:
+        return {'items': [], 'limit': limit, 'next_cursor': None}
+
+    merged = branches[0].union_all(*branches[1:]) if len(branches) > 1 else branches[0]
+    results = merged.subquery('results')
+    rows = session.query(
+        results,
+        headline(results.c.description, query).label('headline'),
+    ).order_by(
+        results.c.rank.desc(),
+        results.c.id.desc(),
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].rank, rows[-1].id)
+
+    items = []
+    for row in rows:
+        item = {k: v for k, v in row._asdict().items() if v is not None}
+        item['id'] = str(row.id)
+        item['rank'] = float(row.rank)
+        item['created_on'] = row.created_on.isoformat()
+        items.append(item)
+
+    return {'items': items, 'limit': limit, 'next_cursor': next_cursor}
@@ -0,0 +1,259 @@
+"""
+Overdue and due soon sweeper.
+
+    flask sweep [--date 2026-10-19] [--workers 4]
+
+Run on a schedule, for example daily from a cron job. Every sweep flags one kind of deadline with `custom` Events:
+    compliance_period_overdue:   Active periods that ended before today without a `passed` response.
+    compliance_period_due_soon:  Active periods without a `passed` response that end within `SWEEPER_DUE_SOON_DAYS`.
+    detail_expired:              Details whose `compliant_until` is before today.
+    detail_expiring:             Details whose `compliant_until` is within `SWEEPER_DUE_SOON_DAYS`.
+
+Each sweep only scans the deadlines after its high-water mark, the last date it processed for the tenant,
+through partial indexes that only contain open rows. The events of a tenant are written with one INSERT ... SELECT
+per sweep, in the same transaction that moves the tenant's marks, so a sweep that fails part way simply resumes
+with the tenants it did not finish, and no deadline is flagged twice.
+Moving the end_date of a period back to or behind the marks rewinds the period marks of its tenant,
+see `rewind_period_marks`, periods are only flagged once per sweep and due date, so the rescan flags just the moved ones.
+Tenants are processed in parallel, each on its own connection.
+The sweeper works across tenants, with `ROW_LEVEL_SECURITY` it connects as the maintenance role,
+see `MAINTENANCE_DATABASE_URI`.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Union
+
+import click
+import sqlalchemy as sa
+from environs import Env
+from flask import Flask, current_app
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from techlock.common.orm.sqlalchemy import db
+
+from ..orm.tenancy import maintenance_engine, row_level_security_enabled
+
+__all__ = [
+    'SWEEPS',
+    'Sweep',
+    'init_sweeper',
+    'rewind_period_marks',
+    'sweep',
+    'sweep_tenant',
+    'sweeper_marks',
+]
+
+logger = logging.getLogger(__name__)
+
+SWEEPER_USER = 'sweeper'
+
+sweeper_marks = sa.Table(
+    'sweeper_marks',
+    db.metadata,
+    sa.Column('sweep', sa.String, primary_key=True),
+    sa.Column('tenant_id', sa.String, primary_key=True),
+    sa.Column('high_water_mark', sa.Date, nullable=False),
+    sa.Column('changed_on', sa.DateTime, nullable=False),
+)
+
+_EVENT_COLUMNS = (
+    'name, description, tags, tenant_id, created_by, created_on, changed_by, changed_on, is_active, '
+    'compliance_id, compliance_period_id, timestamp, type, visibility'
+)
+
+_OPEN_PERIODS = """
+    FROM compliance_periods period
+    WHERE period.tenant_id = :tenant_id
+      AND period.is_active IS true
+      AND period.end_date > :after AND period.end_date <= :until
+      AND NOT EXISTS (
+        SELECT 1 FROM compliance_responses response
+        WHERE response.period_id = period.id AND response.is_active IS true AND response.status = 'passed'
+      )
+      AND NOT EXISTS (
+        SELECT 1 FROM events event
+        WHERE event.compliance_period_id = period.id AND event.is_active IS true AND event.name = :sweep
+          AND event.tags ->> 'due_date' = to_char(period.end_date, 'YYYY-MM-DD')
+      )
+"""
+
+_PERIOD_EVENTS = f"""
+INSERT INTO events ({_EVENT_COLUMNS})
+SELECT
+    :sweep, period.name, jsonb_build_object('sweep', :sweep, 'due_date', period.end_date), period.tenant_id,
+    :user_id, :now, :user_id, :now, true,
+    period.compliance_id, period.id, :now, 'custom', 'internal'
+{_OPEN_PERIODS}
+"""
+
+_DETAIL_EVENTS = f"""
+INSERT INTO events ({_EVENT_COLUMNS})
+SELECT
+    :sweep, detail.code,
+    jsonb_build_object('sweep', :sweep, 'due_date', detail.compliant_until, 'detail_id', detail.id),
+    detail.tenant_id, :user_id, :now, :user_id, :now, true,
+    NULL, NULL, :now, 'custom', 'internal'
+FROM details detail
+WHERE detail.tenant_id = :tenant_id
+  AND detail.is_active IS true
+  AND detail.compliant_until > :after AND detail.compliant_until <= :until
+"""
+
+
+@dataclass(frozen=True)
+class Sweep:
+    name: str
+    statement: str
+    # Deadlines up to `today + lookahead` days are flagged, -1 for deadlines that passed.
+    lookahead: int
+
+
+_PERIOD_SWEEPS = ('compliance_period_overdue', 'compliance_period_due_soon')
+
+
+def _sweeps(due_soon_days: int) -> List[Sweep]:
+    return [
+        Sweep(_PERIOD_SWEEPS[0], _PERIOD_EVENTS, -1),
+        Sweep(_PERIOD_SWEEPS[1], _PERIOD_EVENTS, due_soon_days),
+        Sweep('detail_expired', _DETAIL_EVENTS, -1),
+        Sweep('detail_expiring', _DETAIL_EVENTS, due_soon_days),
+    ]
+
+
+SWEEPS = _sweeps(7)
+
+_TENANTS = text("""
+SELECT tenant_id FROM compliance_periods WHERE is_active IS true GROUP BY tenant_id
+UNION
+SELECT tenant_id FROM details WHERE is_active IS true AND compliant_until IS NOT NULL GROUP BY tenant_id
+""")
+
+_LOCK = text("SELECT pg_advisory_xact_lock(hashtext('sweeper:' || :tenant_id))")
+
+_MARKS = text('SELECT sweep, high_water_mark FROM sweeper_marks WHERE tenant_id = :tenant_id')
+
+_SET_MARK = text("""
+INSERT INTO sweeper_marks (sweep, tenant_id, high_water_mark, changed_on)
+VALUES (:sweep, :tenant_id, :until, :now)
+ON CONFLICT (sweep, tenant_id) DO UPDATE SET high_water_mark = excluded.high_water_mark, changed_on = excluded.changed_on
+""")
+
+_REWIND_MARKS = text("""
+UPDATE sweeper_marks
+SET high_water_mark = CAST(:end_date AS date) - 1, changed_on = :now
+WHERE tenant_id = :tenant_id AND sweep = ANY(CAST(:sweeps AS varchar[])) AND high_water_mark >= :end_date
+""")
+
+
+def _engine() -> Engine:
+    engine = maintenance_engine()
+    if engine is not None:
+        return engine
+    if row_level_security_enabled():
+        # The policies hide every row from the service's own role outside of requests.
+        raise RuntimeError('MAINTENANCE_DATABASE_URI is required to sweep with ROW_LEVEL_SECURITY enabled.')
+
+    return db.engine
+
+
+def sweep_tenant(
+    tenant_id: str,
+    today: date,
+    sweeps: List[Sweep] = None,
+    lookback_days: int = 30,
+    engine: Engine = None,
+) -> Dict[str, int]:
+    """
+    Run `sweeps` for one tenant in a single transaction. Returns the number of events written per sweep.
+    Tenants that were never swept start `lookback_days` before today.
+    """
+    sweeps = sweeps or SWEEPS
+    engine = engine or _engine()
+    now = datetime.utcnow()
+    written = {}
+
+    with engine.begin() as connection:
+        # Keeps concurrent sweepers from flagging the same deadlines, the lock is released at commit.
+        connection.execute(_LOCK, {'tenant_id': tenant_id})
+        marks = dict(connection.execute(_MARKS, {'tenant_id': tenant_id}).fetchall())
+        for kind in sweeps:
+            until = today + timedelta(days=kind.lookahead)
+            after = marks.get(kind.name) or until - timedelta(days=lookback_days)
+            if after >= until:
+                continue
+
+            params = {'tenant_id': tenant_id, 'sweep': kind.name, 'after': after, 'until': until, 'now': now}
+            result = connection.execute(text(kind.statement), {**params, 'user_id': SWEEPER_USER})
+            connection.execute(_SET_MARK, params)
+            written[kind.name] = result.rowcount
+
+    return written
+
+
+def rewind_period_marks(connection: Union[Connection, Session], tenant_id: str, end_date: date) -> int:
+    """
+    Move the period marks of `tenant_id` that are at or after `end_date` back before it,
+    so the next sweep flags a period whose end_date moved there. Call it in the transaction that moves the period.
+    Returns the number of marks moved.
+    """
+    # Waits for a running sweep of the tenant, which would otherwise move the marks forward again when it commits.
+    connection.execute(_LOCK, {'tenant_id': tenant_id})
+    result = connection.execute(_REWIND_MARKS, {
+        'tenant_id': tenant_id,
+        'end_date': end_date,
+        'sweeps': list(_PERIOD_SWEEPS),
+        'now': datetime.utcnow(),
+    })
+    if result.rowcount:
+        logger.info('Rewound sweeper marks', extra={'tenant_id': tenant_id, 'end_date': end_date.isoformat()})
+
+    return result.rowcount
+
+
+def sweep(app: Flask, today: date = None, workers: int = None) -> Dict[str, int]:
+    """
+    Run all sweeps for every tenant with open deadlines, `workers` tenants at a time.
+    Returns the number of events written per sweep.
+    """
+    env = Env()
+    today = today or date.today()
+    workers = workers or env.int('SWEEPER_WORKERS', 4)
+    lookback_days = env.int('SWEEPER_LOOKBACK_DAYS', 30)
+    sweeps = _sweeps(env.int('SWEEPER_DUE_SOON_DAYS', 7))
+
+    with app.app_context():
+        engine = _engine()
+        with engine.connect() as connection:
+            tenants = [row.tenant_id for row in connection.execute(_TENANTS)]
+
+    def run(tenant_id: str) -> Dict[str, int]:
+        with app.app_context():
+            try:
+                return sweep_tenant(tenant_id, today, sweeps=sweeps, lookback_days=lookback_days, engine=engine)
+            except Exception:
+                # The tenant's marks did not move, the next run picks it up again.
+                logger.exception('Failed to sweep tenant', extra={'tenant_id': tenant_id})
+                return {}
+
+    totals = {kind.name: 0 for kind in sweeps}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sweeper') as executor:
+        for written in executor.map(run, tenants):
+            for name, count in written.items():
+                totals[name] += count
+
+    logger.info('Sweep finished', extra={'tenants': len(tenants), 'date': today.isoformat(), **totals})
+    return totals
+
+
+def init_sweeper(app: Flask):
+    @app.cli.command('sweep')
+    @click.option('--date', 'today', type=click.DateTime(formats=['%Y-%m-%d']), help='Sweep as of this date.')
+    @click.option('--workers', type=int, help='Number of tenants swept in parallel.')
+    def sweep_command(today: datetime, workers: int):
+        """Flag overdue and due soon compliance periods and details with events."""
+        totals = sweep(current_app._get_current_object(), today=today.date() if today else None, workers=workers)
+        for name, count in totals.items():
+            click.echo(f'{name}: {count}')
@@ -1,14 +1,21 @@
 import os
+import uuid
 
 import boto3
 import pytest
+import requests
 from techlock.common.api.flask import create_flask
 from techlock.common.config import AuthInfo, ConfigManager
 from techlock.common.orm.sqlalchemy import db
 from techlock.common.util.helper import supress
 
+from techlock.compass.orm import count_queries
+
 flask_wrapper = create_flask(__name__, enable_jwt=False, audience='rules-service')
 
+APP_URL = os.environ.get('APP_URL', 'http://app:5000')
+JWT_URL = os.environ.get('JWT_URL', 'http://jwt:5000')
+
 
 def _flush_local_dynamodb(create=True):
     if os.name == 'nt':
@@ -58,6 +65,70 @@ def _flush_local_psql(create=True):
             db.create_all()
 
 
+@pytest.fixture
+def app():
+    return flask_wrapper.app
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Fails the test when the wrapped block executes more queries than allowed.
+    The app under test only reports its per request counts, see `QUERY_COUNT_MODE` in `tests/docker-compose.yml`.
+
+    Example:
+        def test_list_events(assert_max_queries):
+            with assert_max_queries(threshold=5):
+                ...
+    """
+    def _assert_max_queries(threshold: int = 50, repeat_threshold: int = 10):
+        return count_queries(threshold=threshold, repeat_threshold=repeat_threshold)
+
+    return _assert_max_queries
+
+
+class ApiClient(requests.Session):
+    """
+    Session calling the app under test, paths are relative to `APP_URL`.
+    """
+
+    def __init__(self, access_token: str):
+        super().__init__()
+        self.headers['Authorization'] = f'Bearer {access_token}'
+
+    def request(self, method, path, *args, **kwargs):
+        return super().request(method, APP_URL + path, *args, **kwargs)
+
+
+@pytest.fixture
+def tenant_id():
+    return f'tenant-{uuid.uuid4()}'
+
+
+@pytest.fixture
+def login(tenant_id):
+    """
+    Returns an `ApiClient` for a user of the test's own tenant with the given claims, using the mock JWT service.
+
+    Example:
+        def test_read_events(login):
+            client = login('allow:*:compliance:read:events:*')
+            assert client.get('/events').status_code == 200
+    """
+    def _login(*claims: str, user_id: str = 'user@test.com'):
+        response = requests.post(f'{JWT_URL}/login', json={
+            'sub': user_id,
+            'username': user_id,
+            'tenant_id': tenant_id,
+            'roles': [tenant_id],
+            'claims': list(claims),
+        })
+        response.raise_for_status()
+        return ApiClient(response.json()['access_token'])
+
+    return _login
+
+
 @pytest.fixture
 def flush_local_dynamodb():
     yield
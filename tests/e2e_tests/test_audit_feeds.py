@@ -0,0 +1,67 @@
+import pytest
+
+ADMIN = 'allow:*:compliance:*:*:*'
+READER = (
+    'allow:*:compliance:read:audits:*',
+    'allow:*:compliance:read:activity:*',
+    'allow:*:compliance:read:search:*',
+    'allow:*:compliance:read:comments:name:visible',
+)
+
+
+@pytest.fixture
+def audit(login):
+    """
+    An audit with a comment the reader may read, one it may not, and the events of creating them.
+    """
+    admin = login(ADMIN)
+    response = admin.post('/audits', json={'name': 'Feed audit', 'remediation_date': '2026-11-01', 'end_date': '2026-12-01'})
+    assert response.status_code == 201, response.text
+    audit_id = response.json()['id']
+
+    comment_ids = {}
+    for name in ('visible', 'hidden'):
+        response = admin.post('/comments', json={'name': name, 'description': 'Firewall rule review', 'audit_id': audit_id})
+        assert response.status_code == 201, response.text
+        comment_ids[name] = response.json()['id']
+
+    return audit_id, comment_ids
+
+
+def test_activity_only_lists_what_the_reader_can_read(login, audit):
+    audit_id, comment_ids = audit
+
+    response = login(*READER).get('/activity', params={'audit_id': audit_id})
+
+    assert response.status_code == 200, response.text
+    assert [(item['type'], item['id']) for item in response.json()['items']] == [('comment', comment_ids['visible'])]
+
+    response = login(ADMIN).get('/activity', params={'audit_id': audit_id})
+    types = {item['type'] for item in response.json()['items']}
+    assert {'comment', 'event'} <= types
+
+
+def test_search_only_finds_what_the_reader_can_read(login, audit):
+    audit_id, comment_ids = audit
+
+    response = login(*READER).get('/search', params={'q': 'firewall', 'audit_id': audit_id})
+
+    assert response.status_code == 200, response.text
+    assert [(item['type'], item['id']) for item in response.json()['items']] == [('comment', comment_ids['visible'])]
+
+
+def test_changes_only_include_what_the_reader_can_read(login, audit):
+    audit_id, comment_ids = audit
+    params = {'wait': 0, 'last_event_id': '0-0'}
+
+    response = login(*READER).get(f'/audits/{audit_id}/changes', params=params)
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [(change['type'], change['id']) for change in body['changes']] == [('comment', comment_ids['visible'])]
+    assert body['reset'] is False
+
+    response = login(ADMIN).get(f'/audits/{audit_id}/changes', params=params)
+    types = {change['type'] for change in response.json()['changes']}
+    assert {'comment', 'event'} <= types
+    assert response.json()['last_event_id'] == body['last_event_id']
@@ -0,0 +1,120 @@
+import uuid
+
+import pytest
+
+ADMIN = 'allow:*:compliance:*:*:*'
+
+
+def _create_audit(client) -> str:
+    response = client.post('/audits', json={'name': 'Batch audit', 'remediation_date': '2026-11-01', 'end_date': '2026-12-01'})
+    assert response.status_code == 201, response.text
+    return response.json()['id']
+
+
+def _create_comment(audit_id: str, name: str):
+    return {'method': 'POST', 'path': '/comments', 'body': {'name': name, 'audit_id': audit_id}}
+
+
+def _comment_count(client, name: str) -> int:
+    response = client.get('/comments', params={'name': name})
+    assert response.status_code == 200, response.text
+    return response.json()['total_count']
+
+
+def test_operations_are_committed_together(login):
+    client = login(ADMIN)
+    audit_id = _create_audit(client)
+
+    response = client.post('/batch', json={'operations': [
+        _create_comment(audit_id, 'first batched'),
+        _create_comment(audit_id, 'second batched'),
+    ]})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body['committed'] is True
+    assert [result['status'] for result in body['results']] == [201, 201]
+    assert _comment_count(client, 'first batched') == 1
+    assert _comment_count(client, 'second batched') == 1
+    # The operations' queries count towards the batch request.
+    assert int(response.headers['X-Query-Count']) > 0
+
+
+def test_failed_operation_rolls_back_the_batch(login):
+    client = login(ADMIN)
+    audit_id = _create_audit(client)
+
+    response = client.post('/batch', json={'operations': [
+        _create_comment(audit_id, 'rolled back'),
+        {'method': 'GET', 'path': f'/audits/{uuid.uuid4()}'},
+        _create_comment(audit_id, 'never run'),
+    ]})
+
+    body = response.json()
+    assert body['committed'] is False
+    # The batch stops at the first failed operation.
+    assert [result['status'] for result in body['results']] == [201, 404]
+    assert _comment_count(client, 'rolled back') == 0
+    assert _comment_count(client, 'never run') == 0
+
+
+@pytest.mark.parametrize('path', [
+    '/events/export?format=csv',
+    '/compliances/{id}/matrix',
+    '/audits/{id}/changes',
+])
+def test_streamed_responses_are_rejected(login, path):
+    client = login(ADMIN)
+    audit_id = _create_audit(client)
+
+    response = client.post('/batch', json={'operations': [
+        _create_comment(audit_id, 'before stream'),
+        {'method': 'GET', 'path': path.format(id=uuid.uuid4())},
+    ]})
+
+    body = response.json()
+    assert body['committed'] is False
+    assert [result['status'] for result in body['results']] == [201, 400]
+    assert body['results'][1]['body'] == {'message': 'Streamed responses can not be part of a batch.'}
+    assert _comment_count(client, 'before stream') == 0
+
+
+def test_dry_run_returns_the_results_without_committing(login):
+    client = login(ADMIN)
+    audit_id = _create_audit(client)
+
+    response = client.post('/batch', params={'dry_run': 'true'}, json={'operations': [
+        _create_comment(audit_id, 'dry run'),
+    ]})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body['committed'] is False
+    result, = body['results']
+    assert result['status'] == 201
+    assert result['body']['name'] == 'dry run'
+    assert result['body']['id']
+    assert _comment_count(client, 'dry run') == 0
+
+
+def test_operations_check_their_own_claims(login):
+    audit_id = _create_audit(login(ADMIN))
+    client = login('allow:*:compliance:create:batch:*', 'allow:*:compliance:read:comments:*')
+
+    response = client.post('/batch', json={'operations': [
+        _create_comment(audit_id, 'not allowed'),
+    ]})
+
+    body = response.json()
+    assert body['committed'] is False
+    assert [result['status'] for result in body['results']] == [403]
+    assert _comment_count(client, 'not allowed') == 0
+
+
+def test_batch_requires_its_claim(login):
+    audit_id = _create_audit(login(ADMIN))
+    client = login('allow:*:compliance:create:comments:*')
+
+    response = client.post('/batch', json={'operations': [_create_comment(audit_id, 'no batch claim')]})
+
+    assert response.status_code == 403
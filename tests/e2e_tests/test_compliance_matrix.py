@@ -0,0 +1,12 @@
+import json
+import uuid
+
+from techlock.compass.services import matrix_response
+
+
+def test_matrix_is_streamed_after_the_app_context_is_gone(app):
+    compliance_id = str(uuid.uuid4())
+    with app.test_request_context():
+        response = matrix_response({'id': compliance_id}, compliance_id, str(uuid.uuid4()), criteria={})
+
+    assert json.loads(b''.join(response.response)) == {'compliance': {'id': compliance_id}, 'tasks': []}
@@ -0,0 +1,107 @@
+import pytest
+
+ADMIN = 'allow:*:compliance:*:*:*'
+# May update compliances, but only read their periods.
+PERIOD_READER = (
+    'allow:*:compliance:*:compliances:*',
+    'allow:*:compliance:read:compliance_periods:*',
+)
+
+
+def _compliance(start_date: str, end_date: str):
+    return {
+        'name': 'Periods compliance',
+        'user_id': 'user@test.com',
+        'tasks': [],
+        'start_date': start_date,
+        'end_date': end_date,
+        'plan': 'gold',
+    }
+
+
+def _periods(client, compliance_id: str):
+    response = client.get('/compliance_periods', params={'filter': f'compliance_id:eq:{compliance_id}', 'limit': 100})
+    assert response.status_code == 200, response.text
+    return sorted((item['start_date'], item['end_date']) for item in response.json()['items'])
+
+
+@pytest.fixture
+def compliance(login):
+    """
+    A monthly task and a compliance from the end of January to the end of April, with its periods.
+    """
+    admin = login(ADMIN)
+    response = admin.post('/compliance_tasks', json={'name': 'Review', 'frequency': 'monthly', 'text': 'Review access'})
+    assert response.status_code == 201, response.text
+    task_id = response.json()['id']
+    response = admin.post('/compliances', json=_compliance('2026-01-31', '2026-04-30'))
+    assert response.status_code == 201, response.text
+    compliance_id = response.json()['id']
+
+    response = admin.post(f'/compliances/{compliance_id}/periods', json={'task_ids': [task_id]})
+    assert response.status_code == 200, response.text
+    assert response.json() == {'created': 4, 'updated': 0, 'deactivated': 0}
+
+    return compliance_id, task_id
+
+
+def test_months_are_stepped_from_the_start_date(login, compliance):
+    compliance_id, _ = compliance
+
+    # Months never drift towards the 28th, every period starts at the end of its month.
+    assert _periods(login(ADMIN), compliance_id) == [
+        ('2026-01-31', '2026-02-27'),
+        ('2026-02-28', '2026-03-30'),
+        ('2026-03-31', '2026-04-29'),
+        ('2026-04-30', '2026-04-30'),
+    ]
+
+
+def test_sync_is_idempotent(login, compliance):
+    compliance_id, task_id = compliance
+    admin = login(ADMIN)
+
+    response = admin.post(f'/compliances/{compliance_id}/periods', json={'task_ids': [task_id]})
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {'created': 0, 'updated': 0, 'deactivated': 0}
+    assert len(_periods(admin, compliance_id)) == 4
+
+
+def test_shortening_the_end_date_resyncs_the_periods(login, compliance):
+    compliance_id, _ = compliance
+    admin = login(ADMIN)
+
+    response = admin.put(f'/compliances/{compliance_id}', json=_compliance('2026-01-31', '2026-03-15'))
+
+    assert response.status_code == 200, response.text
+    assert _periods(admin, compliance_id) == [
+        ('2026-01-31', '2026-02-27'),
+        ('2026-02-28', '2026-03-15'),
+    ]
+
+
+def test_moving_the_start_date_reschedules_the_periods(login, compliance):
+    compliance_id, _ = compliance
+    admin = login(ADMIN)
+
+    response = admin.put(f'/compliances/{compliance_id}', json=_compliance('2026-02-01', '2026-04-30'))
+
+    assert response.status_code == 200, response.text
+    assert _periods(admin, compliance_id) == [
+        ('2026-02-01', '2026-02-28'),
+        ('2026-03-01', '2026-03-31'),
+        ('2026-04-01', '2026-04-30'),
+    ]
+
+
+def test_sync_needs_period_access(login, compliance):
+    compliance_id, task_id = compliance
+    reader = login(*PERIOD_READER)
+
+    response = reader.post(f'/compliances/{compliance_id}/periods', json={'task_ids': [task_id]})
+    assert response.status_code == 403
+
+    response = reader.put(f'/compliances/{compliance_id}', json=_compliance('2026-01-31', '2026-03-15'))
+    assert response.status_code == 403
+    assert len(_periods(login(ADMIN), compliance_id)) == 4
@@ -0,0 +1,59 @@
+import uuid
+
+ADMIN = 'allow:*:compliance:*:*:*'
+CREATE_ALLOWED = 'allow:*:compliance:create:events:name:allowed'
+
+
+def _event(name: str):
+    return {'name': name, 'type': 'custom', 'visibility': 'common'}
+
+
+def _event_count(client, name: str) -> int:
+    response = client.get('/events', params={'name': name})
+    assert response.status_code == 200, response.text
+    return response.json()['total_count']
+
+
+def test_batch_creates_the_events(login):
+    admin = login(ADMIN)
+
+    response = login(CREATE_ALLOWED).post('/events/batch', json={'items': [_event('allowed'), _event('allowed')]})
+
+    assert response.status_code == 201, response.text
+    assert response.json() == {'created': 2}
+    assert _event_count(admin, 'allowed') == 2
+
+
+def test_batch_with_a_denied_event_creates_nothing(login):
+    admin = login(ADMIN)
+
+    response = login(CREATE_ALLOWED).post('/events/batch', json={'items': [_event('allowed'), _event('denied')]})
+
+    assert response.status_code == 403
+    assert 'at: 1.' in response.json()['message']
+    assert _event_count(admin, 'allowed') == 0
+    assert _event_count(admin, 'denied') == 0
+
+
+def test_batch_dry_run_creates_nothing(login):
+    admin = login(ADMIN)
+
+    response = login(CREATE_ALLOWED).post('/events/batch', params={'dry_run': 'true'}, json={'items': [_event('allowed')]})
+
+    assert response.status_code == 201, response.text
+    assert response.json() == {'created': 1}
+    assert _event_count(admin, 'allowed') == 0
+
+
+def test_batch_get_returns_readable_events_and_the_rest_as_missing(login):
+    admin = login(ADMIN)
+    allowed_id, hidden_id = (admin.post('/events', json=_event(name)).json()['id'] for name in ('allowed', 'hidden'))
+    unknown_id = str(uuid.uuid4())
+    reader = login('allow:*:compliance:read:events:name:allowed')
+
+    response = reader.post('/events/batch_get', json={'ids': [hidden_id, allowed_id, unknown_id]})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [item['id'] for item in body['items']] == [allowed_id]
+    assert sorted(body['missing']) == sorted([hidden_id, unknown_id])
@@ -0,0 +1,32 @@
+import json
+import uuid
+from types import SimpleNamespace
+
+from techlock.common.orm.sqlalchemy import db
+
+from techlock.compass.api import export
+from techlock.compass.models import Event, EventSchema
+from techlock.compass.models.event import Type, Visibility
+from techlock.compass.services import emit_events
+
+
+def test_export_is_streamed_after_the_app_context_is_gone(app, assert_max_queries):
+    tenant_id = str(uuid.uuid4())
+    current_user = SimpleNamespace(tenant_id=tenant_id, user_id='e2e')
+    with app.app_context():
+        emit_events(
+            [{'name': f'event {i}', 'type': Type.custom, 'visibility': Visibility.common} for i in range(3)],
+            current_user,
+        )
+        db.session.commit()
+
+        body = export._stream(
+            db.engine, Event, export._export_schema(EventSchema), 'ndjson', Event.tenant_id == tenant_id,
+        )
+
+    # Like a streamed response, the body is only generated once the context is popped.
+    with assert_max_queries(threshold=5):
+        lines = b''.join(body).splitlines()
+
+    rows = [json.loads(line) for line in lines]
+    assert sorted(row['name'] for row in rows) == ['event 0', 'event 1', 'event 2']
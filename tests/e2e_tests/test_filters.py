@@ -0,0 +1,17 @@
+ADMIN = 'allow:*:compliance:*:*:*'
+
+
+def test_invalid_filters_are_bad_requests(login):
+    client = login(ADMIN)
+
+    for expression in ('missing:eq:1', 'type:lt:custom', 'timestamp:gte:yesterday'):
+        response = client.get('/events', params={'filter': expression})
+        assert response.status_code == 400, expression
+        assert expression in response.json()['message']
+
+
+def test_unindexed_filters_are_answered_with_a_warning(login):
+    response = login(ADMIN).get('/events', params={'filter': ['audit_id:isnull:false', 'visibility:eq:common']})
+
+    assert response.status_code == 200, response.text
+    assert response.headers['Warning'] == '199 compass "No index supports the filter on visibility, it may be slow."'
@@ -0,0 +1,55 @@
+import pytest
+import sqlalchemy as sa
+from techlock.common.orm.sqlalchemy import db
+
+from techlock.compass.orm import QueryCountExceeded
+
+ADMIN = 'allow:*:compliance:*:*:*'
+
+
+def test_queries_are_counted(app, assert_max_queries):
+    with app.app_context():
+        with assert_max_queries(threshold=2) as counter:
+            db.session.execute(sa.text('SELECT 1'))
+            db.session.execute(sa.text('SELECT 2'))
+
+    assert counter.total == 2
+    assert counter.most_common() == [('SELECT ?', 2)]
+
+
+def test_repeated_statements_fail_the_test(app, assert_max_queries):
+    with app.app_context():
+        with pytest.raises(QueryCountExceeded):
+            with assert_max_queries(repeat_threshold=2):
+                for i in range(3):
+                    db.session.execute(sa.text('SELECT :i'), {'i': i})
+
+
+def _event(name: str, audit_id: str):
+    return {'name': name, 'type': 'custom', 'visibility': 'common', 'audit_id': audit_id}
+
+
+def _list_query_count(client, audit_id: str) -> int:
+    response = client.get('/events', params={'filter': f'audit_id:eq:{audit_id}', 'expand': 'audit', 'limit': 100})
+    assert response.status_code == 200, response.text
+    assert all(item['audit']['id'] == audit_id for item in response.json()['items'])
+    return int(response.headers['X-Query-Count'])
+
+
+def test_nested_lists_do_not_query_per_row(login):
+    client = login(ADMIN)
+    response = client.post('/audits', json={'name': 'Counted audit', 'remediation_date': '2026-11-01', 'end_date': '2026-12-01'})
+    assert response.status_code == 201, response.text
+    audit_id = response.json()['id']
+
+    response = client.post('/events', json=_event('first', audit_id))
+    assert response.status_code == 201, response.text
+    single = _list_query_count(client, audit_id)
+
+    response = client.post('/events/batch', json={'items': [_event(f'event {i}', audit_id) for i in range(10)]})
+    assert response.status_code == 201, response.text
+    many = _list_query_count(client, audit_id)
+
+    # Events nest their audit, it is loaded for the whole page, not per event.
+    assert many == single
+    assert many <= 10
@@ -0,0 +1,107 @@
+import threading
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+from techlock.common.orm.sqlalchemy import db
+
+from techlock.compass.services import SWEEPS, sweep_tenant
+
+ADMIN = 'allow:*:compliance:*:*:*'
+OVERDUE = [kind for kind in SWEEPS if kind.name == 'compliance_period_overdue']
+
+
+@pytest.fixture
+def compliance(login):
+    """
+    A compliance with monthly periods ending on 2026-01-31, 2026-02-28 and 2026-03-31.
+    """
+    admin = login(ADMIN)
+    response = admin.post('/compliance_tasks', json={'name': 'Review', 'frequency': 'monthly', 'text': 'Review access'})
+    assert response.status_code == 201, response.text
+    task_id = response.json()['id']
+    response = admin.post('/compliances', json={
+        'name': 'Sweeper compliance',
+        'user_id': 'user@test.com',
+        'tasks': [],
+        'start_date': '2026-01-01',
+        'end_date': '2026-03-31',
+        'plan': 'gold',
+    })
+    assert response.status_code == 201, response.text
+    compliance_id = response.json()['id']
+    response = admin.post(f'/compliances/{compliance_id}/periods', json={'task_ids': [task_id]})
+    assert response.status_code == 200, response.text
+
+    return compliance_id
+
+
+def _sweep(app, tenant_id: str, today: date) -> int:
+    with app.app_context():
+        return sweep_tenant(tenant_id, today, sweeps=OVERDUE, lookback_days=90, engine=db.engine).get(OVERDUE[0].name, 0)
+
+
+def _overdue_events(client, compliance_id: str):
+    response = client.get('/events', params={
+        'name': OVERDUE[0].name,
+        'filter': f'compliance_id:eq:{compliance_id}',
+        'limit': 100,
+    })
+    assert response.status_code == 200, response.text
+    return sorted(item['tags']['due_date'] for item in response.json()['items'])
+
+
+def test_overdue_periods_are_flagged_with_events(app, login, tenant_id, compliance):
+    assert _sweep(app, tenant_id, date(2026, 3, 1)) == 2
+
+    assert _overdue_events(login(ADMIN), compliance) == ['2026-01-31', '2026-02-28']
+
+
+def test_sweeps_resume_from_the_high_water_mark(app, login, tenant_id, compliance):
+    assert _sweep(app, tenant_id, date(2026, 3, 1)) == 2
+    assert _sweep(app, tenant_id, date(2026, 3, 1)) == 0
+
+    assert _sweep(app, tenant_id, date(2026, 4, 1)) == 1
+    assert _overdue_events(login(ADMIN), compliance) == ['2026-01-31', '2026-02-28', '2026-03-31']
+
+
+def test_contending_sweepers_flag_each_deadline_once(app, login, tenant_id, compliance):
+    written = []
+
+    def run():
+        written.append(_sweep(app, tenant_id, date(2026, 3, 1)))
+
+    sweepers = [threading.Thread(target=run) for _ in range(2)]
+    with app.app_context():
+        # Hold the tenant's lock, so both sweepers wait for it.
+        with db.engine.begin() as connection:
+            connection.execute(text("SELECT pg_advisory_xact_lock(hashtext('sweeper:' || :tenant_id))"), {'tenant_id': tenant_id})
+            for sweeper in sweepers:
+                sweeper.start()
+            sweepers[0].join(timeout=0.5)
+            assert not written
+    for sweeper in sweepers:
+        sweeper.join(timeout=10)
+
+    assert sorted(written) == [0, 2]
+    assert _overdue_events(login(ADMIN), compliance) == ['2026-01-31', '2026-02-28']
+
+
+def test_a_period_moved_behind_the_mark_is_flagged(app, login, tenant_id, compliance):
+    admin = login(ADMIN)
+    assert _sweep(app, tenant_id, date(2026, 3, 1)) == 2
+    response = admin.get('/compliance_periods', params={'filter': f'compliance_id:eq:{compliance}', 'limit': 100})
+    period, = [item for item in response.json()['items'] if item['end_date'] == '2026-03-31']
+
+    response = admin.put(f'/compliance_periods/{period["id"]}', json={
+        'name': period['name'],
+        'compliance_id': period['compliance_id'],
+        'task_id': period['task_id'],
+        'start_date': period['start_date'],
+        'end_date': '2026-02-15',
+    })
+    assert response.status_code == 200, response.text
+
+    # Only the moved period is flagged, the ones in the rescanned range were flagged before.
+    assert _sweep(app, tenant_id, date(2026, 3, 1)) == 1
+    assert _overdue_events(admin, compliance) == ['2026-01-31', '2026-02-15', '2026-02-28']
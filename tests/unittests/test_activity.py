@@ -0,0 +1,58 @@
+import datetime
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from techlock.compass.api import claims, decode_cursor, encode_cursor
+from techlock.compass.models import ACTIVITY_TYPES, EVENT_CLAIM_SPEC, Comment
+from techlock.compass.routes import activity as routes
+from techlock.compass.services import ACTIVITY_MODELS, activity
+
+USER = SimpleNamespace(tenant_id='tenant', user_id='user')
+
+
+def _sql(query) -> str:
+    return str(query.statement.compile(dialect=postgresql.dialect()))
+
+
+def test_criteria_leave_out_types_the_user_can_not_read(monkeypatch):
+    monkeypatch.setattr(claims, 'resolve_claims', lambda spec, actions: None if spec is EVENT_CLAIM_SPEC else spec)
+    monkeypatch.setattr(claims, 'scope_criteria', lambda model, current_user, claims: model.created_by == 'user')
+
+    criteria = claims.claim_criteria(USER, ACTIVITY_MODELS, routes._CLAIM_SPECS, list(ACTIVITY_TYPES))
+
+    assert sorted(criteria) == ['comment', 'journal', 'upload']
+    assert 'comments.created_by' in str(criteria['comment'])
+
+
+def test_page_without_readable_types_is_empty():
+    page = activity.activity_page(None, 'tenant', {'audit_id': uuid.uuid4()}, criteria={})
+
+    assert page == {'items': [], 'limit': 50, 'next_cursor': None}
+
+
+def test_branch_is_filtered_by_the_claims_of_its_type():
+    audit_id = uuid.uuid4()
+    after = (datetime.datetime(2021, 1, 2), uuid.uuid4())
+    query = activity._branch(Session(), 'comment', 'tenant', Comment.created_by == 'user', {'audit_id': audit_id}, after, 51)
+
+    sql = _sql(query)
+    assert 'comments.tenant_id = ' in sql
+    assert 'comments.created_by = ' in sql
+    assert 'comments.audit_id = ' in sql
+    assert '(comments.timestamp, comments.id) < ' in sql
+    assert 'LIMIT ' in sql
+
+
+def test_upload_branch_never_matches_an_instruction_scope():
+    query = activity._branch(Session(), 'upload', 'tenant', None, {'audit_instruction_id': uuid.uuid4()}, None, 51)
+
+    assert query is None
+
+
+def test_cursor_round_trip():
+    timestamp, id = datetime.datetime(2021, 1, 2, 3, 4, 5, 6), uuid.uuid4()
+
+    assert decode_cursor(encode_cursor(timestamp, id), datetime.datetime.fromisoformat, uuid.UUID) == (timestamp, id)
@@ -0,0 +1,85 @@
+import datetime
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from techlock.compass.models.audit import Phase
+from techlock.compass.models.audit_response import AuditResponse
+from techlock.compass.models.report_version import Compliance
+from techlock.compass.routes import audits
+
+
+def _summary_sql(monkeypatch, response_criteria=None) -> str:
+    monkeypatch.setattr(audits, 'scope_criteria', lambda model, *args, **kwargs: model.is_active.is_(True))
+    if response_criteria is None:
+        response_criteria = {'audit_response': None}
+    query = audits.AuditsSummary().summary_query(
+        Session(),
+        current_user=None,
+        claims=None,
+        response_criteria=response_criteria,
+    )
+
+    return str(query.statement.compile(dialect=postgresql.dialect()))
+
+
+def test_summary_query_counts_every_compliance(monkeypatch):
+    sql = _summary_sql(monkeypatch)
+
+    assert 'count(audit_responses.compliance) AS total_responses' in sql
+    for compliance in Compliance:
+        assert f'AS {compliance.name}' in sql
+    assert sql.count('FILTER (WHERE audit_responses.compliance = ') == len(Compliance)
+
+
+def test_summary_query_is_scoped_and_grouped(monkeypatch):
+    sql = _summary_sql(monkeypatch)
+
+    assert 'LEFT OUTER JOIN audit_responses ON audit_responses.audit_id = audits.id' in sql
+    assert 'audits.is_active IS true' in sql
+    assert 'GROUP BY audits.id' in sql
+
+
+def test_summary_query_counts_readable_responses(monkeypatch):
+    criteria = AuditResponse.tenant_id == 'tenant'
+    sql = _summary_sql(monkeypatch, {'audit_response': criteria})
+
+    assert (
+        'LEFT OUTER JOIN audit_responses ON audit_responses.audit_id = audits.id'
+        ' AND audit_responses.is_active IS true AND audit_responses.tenant_id = %(tenant_id_1)s'
+    ) in sql
+
+
+def test_summary_query_counts_nothing_without_response_access(monkeypatch):
+    sql = _summary_sql(monkeypatch, {})
+
+    assert 'LEFT OUTER JOIN audit_responses ON false' in sql
+    assert 'audits.is_active IS true' in sql
+
+
+def test_summary_of_row():
+    id = uuid.uuid4()
+    counts = {compliance.name: i for i, compliance in enumerate(Compliance)}
+    row = SimpleNamespace(
+        id=id,
+        name='audit',
+        phase=Phase.scoping_and_validation,
+        start_date=datetime.date(2021, 1, 2),
+        estimated_remediation_date=None,
+        remediation_date=None,
+        estimated_end_date=datetime.date(2021, 3, 4),
+        end_date=None,
+        total_responses=sum(counts.values()),
+        **counts,
+    )
+
+    summary = audits.AuditsSummary().summary(row)
+
+    assert summary['id'] == str(id)
+    assert summary['phase'] == 'scoping_and_validation'
+    assert summary['start_date'] == '2021-01-02'
+    assert summary['end_date'] is None
+    assert summary['total_responses'] == sum(counts.values())
+    assert summary['compliance'] == counts
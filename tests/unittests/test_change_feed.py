@@ -0,0 +1,71 @@
+import json
+
+import fakeredis
+import pytest
+
+from techlock.compass.services import change_feed
+from techlock.compass.services.change_feed import ChangeFeed, readable_changes
+
+
+@pytest.fixture
+def feed():
+    return ChangeFeed(fakeredis.FakeRedis(), block=0.01, max_duration=0.05, max_streams=1)
+
+
+def _change(kind: str, id: str, **data):
+    return {'type': kind, 'op': 'create', 'id': id, 'data': {'id': id, **data}}
+
+
+def _publish(feed, *changes):
+    feed.publish([('audit', change) for change in changes])
+    return feed.read('audit', '0-0', block=0)
+
+
+def test_changes_of_kinds_without_criteria_are_left_out(feed):
+    changes = _publish(feed, _change('comment', 'c1'), _change('event', 'e1'), _change('audit_response', 'r1'))
+
+    readable = readable_changes(changes, {'comment': None}, session=None)
+
+    assert [json.loads(data)['id'] for _, data in readable] == ['c1']
+
+
+def test_changes_are_checked_against_the_criteria_of_their_kind(feed, monkeypatch):
+    checked = []
+
+    def unmatched_rows(model, criteria, rows, session=None):
+        checked.append((model.__tablename__, criteria, rows))
+        return [i for i, row in enumerate(rows) if row.get('visibility') == 'internal']
+
+    monkeypatch.setattr(change_feed, 'unmatched_rows', unmatched_rows)
+    changes = _publish(
+        feed,
+        _change('event', 'e1', visibility='internal', is_active=False),
+        _change('comment', 'c1'),
+        _change('event', 'e2', visibility='common'),
+    )
+
+    readable = readable_changes(changes, {'comment': None, 'event': 'event criteria'}, session=None)
+
+    assert [json.loads(data)['id'] for _, data in readable] == ['c1', 'e2']
+    (table, criteria, rows), = [c for c in checked if c[0] == 'events']
+    assert criteria == 'event criteria'
+    # Deleted objects are checked like they still exist.
+    assert [row['is_active'] for row in rows] == [True, True]
+
+
+def test_stream_only_sends_allowed_changes(feed):
+    changes = _publish(feed, _change('comment', 'c1'), _change('event', 'e1'))
+    allow = lambda changes: [c for c in changes if json.loads(c[1])['type'] == 'comment']
+
+    body = b''.join(feed.stream('audit', '0-0', allow=allow)).decode('utf-8')
+
+    assert f'id: {changes[0][0]}\nevent: comment\n' in body
+    assert 'event: event' not in body
+
+
+def test_streams_are_limited(feed):
+    assert feed.acquire_stream()
+    assert not feed.acquire_stream()
+
+    feed.release_stream()
+    assert feed.acquire_stream()
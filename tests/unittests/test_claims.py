@@ -0,0 +1,62 @@
+import base64
+import json
+from types import SimpleNamespace
+
+import flask
+import pytest
+from werkzeug.exceptions import Forbidden
+
+from techlock.compass.api import claims
+
+SPEC = SimpleNamespace(resource_name='events')
+
+
+def _token(**payload) -> str:
+    def encode(data) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode('utf-8')).rstrip(b'=').decode('utf-8')
+
+    return f'{encode({"alg": "RS256"})}.{encode(payload)}.signature'
+
+
+@pytest.fixture
+def now(monkeypatch):
+    monkeypatch.setattr(claims.time, 'time', lambda: 1000.0)
+    return 1000.0
+
+
+def _expires_at(token: str) -> float:
+    with flask.Flask(__name__).test_request_context(headers={'Authorization': f'Bearer {token}'}):
+        return claims._cache_expires_at()
+
+
+def test_cached_claims_expire_with_the_token(now):
+    assert _expires_at(_token(exp=now + 10)) == now + 10
+
+
+def test_cached_claims_expire_after_the_ttl(now):
+    assert _expires_at(_token(exp=now + 86400)) == now + claims.CLAIM_CACHE_TTL
+    assert _expires_at(_token(sub='user')) == now + claims.CLAIM_CACHE_TTL
+
+
+def _denying(error):
+    def access_required(actions, claim_spec=None):
+        def decorator(func):
+            def wrapper():
+                raise error
+            return wrapper
+        return decorator
+
+    return access_required
+
+
+def test_resolve_claims_without_access(monkeypatch):
+    monkeypatch.setattr(claims, 'access_required', _denying(Forbidden()))
+
+    assert claims.resolve_claims(SPEC) is None
+
+
+def test_resolve_claims_raises_other_errors(monkeypatch):
+    monkeypatch.setattr(claims, 'access_required', _denying(RuntimeError('database is down')))
+
+    with pytest.raises(RuntimeError):
+        claims.resolve_claims(SPEC)
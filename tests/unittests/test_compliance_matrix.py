@@ -0,0 +1,35 @@
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from techlock.compass.models import ComplianceResponse, ComplianceTask
+from techlock.compass.services import matrix_query
+
+
+def _sql(criteria) -> str:
+    query = matrix_query(Session(), 'compliance', 'tenant', criteria)
+    return str(query.statement.compile(dialect=postgresql.dialect()))
+
+
+def test_every_kind_is_filtered_by_its_claims():
+    sql = _sql({
+        'compliance_task': ComplianceTask.created_by == 'user',
+        'compliance_period': None,
+        'compliance_response': ComplianceResponse.created_by == 'user',
+    })
+
+    assert 'compliance_tasks.created_by = ' in sql
+    assert 'compliance_responses.created_by = ' in sql
+    assert 'false' not in sql
+
+
+def test_responses_are_left_out_without_access():
+    sql = _sql({'compliance_task': None, 'compliance_period': None})
+
+    assert 'WHERE false) AS latest_responses' in sql
+    assert 'compliance_periods.is_active IS true' in sql
+
+
+def test_matrix_is_empty_without_access_to_periods():
+    sql = _sql({'compliance_task': None, 'compliance_response': None})
+
+    assert 'WHERE false ORDER BY' in sql
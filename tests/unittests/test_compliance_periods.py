@@ -0,0 +1,84 @@
+import datetime
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from techlock.compass.models.compliance_task import Frequency
+from techlock.compass.services import compliance_periods
+from techlock.compass.services.compliance_periods import FREQUENCY_STEPS, sync_periods
+
+
+class FakeSession:
+    def __init__(self, earliest_end_date=None):
+        self.flushed = False
+        self.params = None
+        self.earliest_end_date = earliest_end_date
+
+    def flush(self):
+        self.flushed = True
+
+    def execute(self, statement, params):
+        assert self.flushed
+        self.params = params
+        row = SimpleNamespace(created=3, updated=1, deactivated=2, earliest_end_date=self.earliest_end_date)
+        return SimpleNamespace(first=lambda: row)
+
+
+def _sql() -> str:
+    return str(compliance_periods._SYNC_PERIODS.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.parametrize('frequency', list(Frequency))
+def test_every_frequency_has_a_step(frequency):
+    step, min_days = FREQUENCY_STEPS[frequency]
+
+    assert f"('{frequency.name}', interval '{step}', {min_days})" in _sql()
+
+
+def test_periods_are_offset_from_the_start_date():
+    sql = _sql()
+
+    assert '(program.start_date + n * steps.step)::date AS start_date' in sql
+    assert 'least((program.start_date + (n + 1) * steps.step)::date - 1, program.end_date) AS end_date' in sql
+    assert 'generate_series(0, (program.end_date - program.start_date) / steps.min_days)' in sql
+
+
+def test_sync_statement_inserts_updates_and_deactivates():
+    sql = _sql()
+
+    assert 'ON CONFLICT (compliance_id, task_id, start_date) WHERE is_active IS true DO NOTHING' in sql
+    assert 'SET end_date = schedule.end_date' in sql
+    assert 'SET is_active = false' in sql
+    assert 'WHERE id = CAST(%(compliance_id)s AS uuid) AND tenant_id = %(tenant_id)s' in sql
+    assert 'task.id = ANY(CAST(%(task_ids)s AS uuid[]))' in sql
+
+
+def test_sync_periods_flushes_and_counts(monkeypatch):
+    monkeypatch.setattr(compliance_periods, 'datetime', SimpleNamespace(utcnow=lambda: 'now'))
+    monkeypatch.setattr(compliance_periods, 'rewind_period_marks', lambda *args: pytest.fail('Nothing moved.'))
+    session = FakeSession()
+    compliance = SimpleNamespace(id=uuid.uuid4(), tenant_id='tenant')
+    task_id = uuid.uuid4()
+
+    result = sync_periods(session, compliance, SimpleNamespace(user_id='user'), task_ids=[task_id])
+
+    assert result == {'created': 3, 'updated': 1, 'deactivated': 2}
+    assert session.params == {
+        'compliance_id': str(compliance.id),
+        'tenant_id': 'tenant',
+        'task_ids': [str(task_id)],
+        'user_id': 'user',
+        'now': 'now',
+    }
+
+
+def test_moved_periods_rewind_the_sweeper_marks(monkeypatch):
+    rewound = []
+    monkeypatch.setattr(compliance_periods, 'rewind_period_marks', lambda *args: rewound.append(args))
+    session = FakeSession(earliest_end_date=datetime.date(2026, 3, 15))
+
+    sync_periods(session, SimpleNamespace(id=uuid.uuid4(), tenant_id='tenant'), SimpleNamespace(user_id='user'))
+
+    assert rewound == [(session, 'tenant', datetime.date(2026, 3, 15))]
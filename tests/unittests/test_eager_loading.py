@@ -0,0 +1,55 @@
+import datetime
+from types import SimpleNamespace
+
+import marshmallow as ma
+import marshmallow.fields as mf
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session, declarative_base
+
+from techlock.compass.api import collection_etag
+from techlock.compass.orm import count_queries, loader_options
+
+Base = declarative_base()
+
+
+class Note(Base):
+    __tablename__ = 'notes'
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String)
+    description = sa.Column(sa.String)
+    changed_on = sa.Column(sa.DateTime)
+
+
+class NoteSchema(ma.Schema):
+    id = mf.Integer()
+    name = mf.String()
+    description = mf.String()
+    changed_on = mf.DateTime()
+
+
+@pytest.fixture
+def session():
+    engine = sa.create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all(
+        Note(name=f'note {i}', description='text', changed_on=datetime.datetime(2021, 1, 1 + i))
+        for i in range(5)
+    )
+    session.commit()
+    session.expunge_all()
+    return session
+
+
+@pytest.mark.parametrize('limit', [1, 5])
+def test_sparse_list_and_its_etag_load_in_one_query(session, limit):
+    options = loader_options(Note, NoteSchema, frozenset({'name'}))
+
+    with count_queries() as counter:
+        items = session.query(Note).options(*options).order_by(Note.id).limit(limit).all()
+        collection_etag(SimpleNamespace(offset=0, limit=limit), items, ['offset', 'limit'])
+
+    assert counter.total == 1
+    assert 'description' not in counter.most_common()[0][0]
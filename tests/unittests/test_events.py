@@ -0,0 +1,74 @@
+import datetime
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from techlock.compass.models import Event
+from techlock.compass.models.event import Type, Visibility
+from techlock.compass.orm import scoping
+from techlock.compass.services import events
+
+USER = SimpleNamespace(tenant_id='tenant', user_id='user')
+
+
+class _Session:
+    def __init__(self, result=()):
+        self.info = {}
+        self.result = result
+        self.statements = []
+
+    def execute(self, statement):
+        compiled = statement.compile(dialect=postgresql.dialect(), compile_kwargs={'render_postcompile': True})
+        self.statements.append(compiled)
+        return list(self.result)
+
+
+def _items():
+    return [
+        {'name': 'allowed', 'type': Type.custom, 'visibility': Visibility.common, 'audit_id': 'a'},
+        {'name': 'denied', 'type': Type.custom, 'visibility': Visibility.internal, 'tags': {'key': 'value'}},
+    ]
+
+
+def test_emit_events_buffers_submitted_columns():
+    session = _Session()
+    timestamp = datetime.datetime(2021, 1, 2, 3, 4, 5)
+    items = [{**_items()[0], 'timestamp': timestamp, 'tenant_id': 'other', 'created_by': 'other'}]
+
+    assert events.emit_events(items, USER, session=session) == 1
+
+    row = events.pending_events(session)[0].row()
+    assert row['name'] == 'allowed'
+    assert row['audit_id'] == 'a'
+    assert row['compliance_id'] is None
+    assert row['timestamp'] == timestamp
+    # Server side columns can't be submitted.
+    assert row['tenant_id'] == 'tenant'
+    assert row['created_by'] == 'user'
+    assert not session.statements
+
+
+def test_denied_events_checks_every_event_against_the_claims(monkeypatch):
+    criteria = (Event.tenant_id == 'tenant') & (Event.name == 'allowed')
+    monkeypatch.setattr(scoping, 'scope_criteria', lambda model, current_user, claims: criteria)
+    session = _Session(result=[(1,)])
+
+    assert events.denied_events(_items(), USER, claims=None, session=session) == [1]
+
+    statement, = session.statements
+    sql = str(statement)
+    assert 'AS candidates (index, ' in sql
+    assert 'WHERE NOT coalesce(candidates.tenant_id = ' in sql
+    assert 'candidates.name = ' in sql
+    assert 'FROM events' not in sql
+    values = [v for k, v in statement.params.items() if k.startswith('param_')]
+    assert sorted(map(str, values)) == ['0', '1', 'allowed', 'denied', 'tenant', 'tenant']
+    assert not events.pending_events(session)
+
+
+def test_denied_events_without_claim_filters(monkeypatch):
+    monkeypatch.setattr(scoping, 'scope_criteria', lambda model, current_user, claims: None)
+    session = _Session()
+
+    assert events.denied_events(_items(), USER, claims=None, session=session) == []
+    assert not session.statements
@@ -0,0 +1,161 @@
+import datetime
+import enum
+import uuid
+
+import pytest
+import sqlalchemy as sa
+from flask import Flask, Response
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import declarative_base
+from techlock.common.api import BadRequestException
+
+from techlock.compass.api.filters import (
+    MAX_FILTER_VALUES,
+    compile_filters,
+    indexed_columns,
+    name_filter,
+    parse_filter,
+)
+from techlock.compass.models import Audit
+
+Base = declarative_base()
+
+
+def _sql(criteria) -> str:
+    return str(criteria.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.parametrize('mode, expected', [
+    ('prefix', 'audits.name LIKE %(name_1)s'),
+    ('iprefix', 'audits.name ILIKE %(name_1)s'),
+    ('contains', 'audits.name ILIKE %(name_1)s'),
+])
+def test_name_filter_modes(mode, expected):
+    criteria = name_filter(Audit.name, 'Access_', mode)
+
+    assert _sql(criteria).startswith(expected)
+    pattern = criteria.compile().params['name_1']
+    assert pattern == ('%Access\\_%' if mode == 'contains' else 'Access\\_%')
+
+
+def test_name_trgm_index():
+    index, = [index for index in Audit.__table__.indexes if index.name == 'ix_audits_name_trgm']
+
+    assert [column.key for column in index.columns] == ['name']
+    assert index.dialect_options['postgresql']['ops'] == {'name': 'gin_trgm_ops'}
+
+
+class Status(enum.Enum):
+    open = 0
+    closed = 1
+
+
+class Task(Base):
+    __tablename__ = 'tasks'
+
+    id = sa.Column(UUID, primary_key=True)
+    tenant_id = sa.Column(sa.String)
+    name = sa.Column(sa.String)
+    owner = sa.Column(sa.String, index=True)
+    status = sa.Column(sa.Enum(Status))
+    done = sa.Column(sa.Boolean)
+    priority = sa.Column(sa.Integer)
+    due_date = sa.Column(sa.Date)
+    changed_on = sa.Column(sa.DateTime)
+    details = sa.Column(JSONB)
+
+
+sa.Index('ix_tasks_due_date_priority', Task.due_date, Task.priority)
+sa.Index('ix_tasks_name_trgm', Task.name, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('priority:eq:3', 'tasks.priority = %(priority_1)s'),
+    ('priority:ne:3', 'tasks.priority != %(priority_1)s'),
+    ('priority:lt:3', 'tasks.priority < %(priority_1)s'),
+    ('priority:lte:3', 'tasks.priority <= %(priority_1)s'),
+    ('priority:gt:3', 'tasks.priority > %(priority_1)s'),
+    ('priority:gte:3', 'tasks.priority >= %(priority_1)s'),
+    ('priority:in:1,2', 'tasks.priority IN (__[POSTCOMPILE_priority_1])'),
+    ('priority:nin:1,2', '(tasks.priority NOT IN (__[POSTCOMPILE_priority_1]))'),
+    ('priority:isnull:true', 'tasks.priority IS NULL'),
+    ('priority:isnull:false', 'tasks.priority IS NOT NULL'),
+])
+def test_compile_filters_operators(expression, expected):
+    criteria, = compile_filters(Task, [expression])
+
+    assert _sql(criteria) == expected
+
+
+@pytest.mark.parametrize('expression, value', [
+    ('status:eq:open', Status.open),
+    ('status:in:open,closed', [Status.open, Status.closed]),
+    ('done:eq:True', True),
+    ('due_date:gte:2026-01-01', datetime.date(2026, 1, 1)),
+    ('changed_on:lt:2026-10-01T12:00:00', datetime.datetime(2026, 10, 1, 12)),
+    ('priority:in:1,2', [1, 2]),
+    ('name:eq:a:b', 'a:b'),
+])
+def test_parse_filter_values(expression, value):
+    field, op, parsed = parse_filter(Task, expression)
+
+    assert field.name == expression.split(':')[0]
+    assert parsed == value
+
+
+def test_parse_filter_normalizes_ids():
+    id = uuid.uuid4()
+
+    field, op, parsed = parse_filter(Task, f'id:eq:{str(id).upper()}')
+
+    assert parsed == str(id)
+
+
+@pytest.mark.parametrize('expression', [
+    'priority',
+    'priority:eq',
+    'missing:eq:1',
+    'tenant_id:eq:tenant',
+    'details:eq:{}',
+    'priority:like:1',
+    'status:lt:open',
+    'done:gte:true',
+    'id:gt:00000000-0000-0000-0000-000000000000',
+    'priority:eq:high',
+    'status:eq:pending',
+    'done:eq:yes',
+    'due_date:eq:2026-13-01',
+    'changed_on:eq:yesterday',
+    'id:eq:not-an-id',
+    'priority:isnull:maybe',
+    'priority:in:' + ','.join(str(i) for i in range(MAX_FILTER_VALUES + 1)),
+])
+def test_invalid_filters_are_bad_requests(expression):
+    with pytest.raises(BadRequestException):
+        compile_filters(Task, [expression])
+
+
+def test_indexed_columns():
+    assert indexed_columns(Task) == {'id', 'owner', 'due_date'}
+
+
+def test_unindexed_filters_add_a_warning():
+    app = Flask(__name__)
+    with app.test_request_context():
+        compile_filters(Task, ['due_date:gte:2026-01-01', 'owner:eq:me', 'priority:eq:1', 'done:eq:true', 'priority:gt:0'])
+        response = app.process_response(Response())
+
+    assert response.headers.getlist('Warning') == [
+        '199 compass "No index supports the filter on priority, it may be slow."',
+        '199 compass "No index supports the filter on done, it may be slow."',
+    ]
+
+
+def test_indexed_filters_add_no_warning():
+    app = Flask(__name__)
+    with app.test_request_context():
+        compile_filters(Task, ['due_date:gte:2026-01-01', 'owner:eq:me'])
+        response = app.process_response(Response())
+
+    assert 'Warning' not in response.headers
@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import pytest
+
+from techlock.compass.api import jwks
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = jwks.JWKSCache(['http://jwt/.well-known/jwks.json'])
+    # No background refreshes.
+    monkeypatch.setattr(cache, 'start', lambda: None)
+    return cache
+
+
+def test_requests_never_fetch_keys(cache, monkeypatch):
+    fetches = []
+    monkeypatch.setattr(cache, '_fetch', lambda: fetches.append(1) or {'kid': 'key'})
+
+    assert cache.get_key('kid') is None
+    assert fetches == []
+    assert cache._wakeup.is_set()
+
+
+def test_unknown_key_wakes_the_refresh_thread(cache, monkeypatch):
+    monkeypatch.setattr(cache, '_fetch', lambda: {'kid': 'key'})
+    cache.refresh()
+
+    assert cache.get_key('kid') == 'key'
+    assert not cache._wakeup.is_set()
+    assert cache.get_key('rotated') is None
+    assert cache._wakeup.is_set()
+
+
+def test_keys_are_fetched_at_startup(monkeypatch):
+    monkeypatch.setenv('JWKS_URLS', 'http://jwt/.well-known/jwks.json')
+    monkeypatch.setattr(jwks.JWKSCache, '_fetch', lambda self: {'kid': 'key'})
+    monkeypatch.setattr(jwks.JWKSCache, 'start', lambda self: None)
+    monkeypatch.setattr(jwks, '_register_cached_algorithms', lambda cache: None)
+    jwt_manager = SimpleNamespace(decode_key_loader=lambda func: func)
+
+    cache = jwks.init_jwks_cache(SimpleNamespace(config={}), jwt_manager)
+
+    assert cache.get_key('kid') == 'key'
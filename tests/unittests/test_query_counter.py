@@ -0,0 +1,37 @@
+import flask
+import sqlalchemy as sa
+
+from techlock.compass.orm import count_in_parent_request, init_query_counter
+
+
+def _app():
+    app = flask.Flask(__name__)
+    engine = sa.create_engine('sqlite://')
+    init_query_counter(app, mode='warn')
+
+    @app.route('/one')
+    def one():
+        with engine.connect() as connection:
+            connection.execute(sa.text('SELECT 1'))
+        return 'ok'
+
+    @app.route('/batch')
+    def batch():
+        for _ in range(2):
+            with app.test_request_context('/one'), count_in_parent_request():
+                app.full_dispatch_request()
+        return 'ok'
+
+    return app
+
+
+def test_requests_are_counted():
+    response = _app().test_client().get('/one')
+
+    assert response.headers['X-Query-Count'] == '1'
+
+
+def test_nested_requests_count_towards_their_parent():
+    response = _app().test_client().get('/batch')
+
+    assert response.headers['X-Query-Count'] == '2'
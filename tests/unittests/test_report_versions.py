@@ -0,0 +1,52 @@
+import uuid
+from types import SimpleNamespace
+
+from techlock.compass.models import ReportInstruction, ReportNode
+from techlock.compass.routes import report_versions
+
+VERSION = SimpleNamespace(id=uuid.uuid4(), changed_on=None)
+
+
+class _Query:
+
+    def __init__(self, filters):
+        self.filters = filters
+
+    def filter(self, *criteria):
+        self.filters.extend(criteria)
+        return self
+
+    def one(self):
+        return 3, None
+
+
+def _etag(monkeypatch, criteria):
+    filters = []
+    session = SimpleNamespace(query=lambda *columns: _Query(filters))
+    monkeypatch.setattr(report_versions, 'db', SimpleNamespace(session=session))
+
+    return report_versions.ReportVersionTree().get_etag(VERSION, criteria), filters
+
+
+def test_etag_depends_on_the_claim_scope(monkeypatch):
+    everything, _ = _etag(monkeypatch, {'report_node': None, 'report_instruction': None})
+    own, filters = _etag(monkeypatch, {
+        'report_node': ReportNode.created_by == 'user',
+        'report_instruction': ReportInstruction.created_by == 'user',
+    })
+    others, _ = _etag(monkeypatch, {
+        'report_node': ReportNode.created_by == 'other user',
+        'report_instruction': ReportInstruction.created_by == 'user',
+    })
+    no_instructions, _ = _etag(monkeypatch, {'report_node': None})
+
+    assert len({everything, own, others, no_instructions}) == 4
+    assert any('report_nodes.created_by' in str(criterion) for criterion in filters)
+    assert own == _etag(monkeypatch, {
+        'report_node': ReportNode.created_by == 'user',
+        'report_instruction': ReportInstruction.created_by == 'user',
+    })[0]
+
+
+def test_tree_is_empty_without_access_to_nodes():
+    assert report_versions.ReportVersionTree().get_nodes(VERSION, {'report_instruction': None}) == []
@@ -0,0 +1,96 @@
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from techlock.common.api import BadRequestException
+
+from techlock.compass.api import claims, decode_cursor, encode_cursor
+from techlock.compass.models import (
+    INSTRUCTION_SEARCH_TYPES,
+    JOURNAL_CLAIM_SPEC,
+    REPORT_NODE_CLAIM_SPEC,
+    SEARCH_TYPES,
+    Comment,
+    ReportNode,
+)
+from techlock.compass.routes import report_instructions
+from techlock.compass.routes import search as routes
+from techlock.compass.services import search
+
+USER = SimpleNamespace(tenant_id='tenant', user_id='user')
+
+
+def test_criteria_leave_out_kinds_the_user_can_not_read(monkeypatch):
+    monkeypatch.setattr(claims, 'resolve_claims', lambda spec, actions: None if spec is JOURNAL_CLAIM_SPEC else spec)
+    monkeypatch.setattr(claims, 'scope_criteria', lambda model, current_user, claims: model.created_by == 'user')
+
+    criteria = claims.claim_criteria(USER, search.NOTE_MODELS, routes._CLAIM_SPECS, list(SEARCH_TYPES))
+
+    assert sorted(criteria) == ['comment', 'summary_note']
+    assert 'summary_notes.created_by' in str(criteria['summary_note'])
+
+
+def test_search_without_readable_kinds_is_empty():
+    page = search.search_notes(None, 'tenant', 'firewall', {'audit_id': uuid.uuid4()}, criteria={})
+
+    assert page == {'items': [], 'limit': 20, 'next_cursor': None}
+
+
+def test_note_branch_is_filtered_by_the_claims_of_its_kind():
+    query = search.tsquery('firewall')
+    after = (Decimal('0.5'), uuid.uuid4())
+    branch = search._note_branch(
+        Session(), 'comment', 'tenant', Comment.created_by == 'user', {'audit_id': uuid.uuid4()}, query, after, 21,
+    )
+
+    sql = str(branch.statement.compile(dialect=postgresql.dialect()))
+    assert 'comments.tenant_id = ' in sql
+    assert 'comments.created_by = ' in sql
+    assert 'comments.audit_id = ' in sql
+    # The exact expression of the ix_comments_search index.
+    assert str(search.note_document(Comment)) + ' @@ websearch_to_tsquery(' in sql
+
+
+def test_instruction_criteria_leave_out_nodes_the_user_can_not_read(monkeypatch):
+    monkeypatch.setattr(claims, 'resolve_claims', lambda spec, actions: None if spec is REPORT_NODE_CLAIM_SPEC else spec)
+    monkeypatch.setattr(claims, 'scope_criteria', lambda model, current_user, claims: model.created_by == 'user')
+
+    criteria = claims.claim_criteria(
+        USER, search.INSTRUCTION_MODELS, report_instructions._SEARCH_CLAIM_SPECS, list(INSTRUCTION_SEARCH_TYPES),
+    )
+
+    assert list(criteria) == ['report_instruction']
+    assert 'report_instructions.created_by' in str(criteria['report_instruction'])
+
+
+def test_instruction_search_without_readable_kinds_is_empty():
+    page = search.search_report_instructions(None, 'firewall', criteria={})
+
+    assert page == {'items': [], 'offset': 0, 'limit': 20, 'total_count': 0}
+
+
+def test_node_branch_is_filtered_by_claims_and_versions():
+    version_id = uuid.uuid4()
+    branch = search._instruction_branch(
+        Session(), 'report_node', ReportNode.created_by == 'user', [version_id], search.tsquery('firewall'),
+    )
+
+    sql = str(branch.statement.compile(dialect=postgresql.dialect()))
+    assert 'report_nodes.search_vector @@ websearch_to_tsquery(' in sql
+    assert 'report_nodes.created_by = ' in sql
+    assert 'report_nodes.version_id IN (' in sql
+
+
+def test_cursor_round_trip():
+    rank, id = Decimal('0.123456'), uuid.uuid4()
+
+    assert decode_cursor(encode_cursor(rank, id), Decimal, uuid.UUID) == (rank, id)
+
+
+@pytest.mark.parametrize('cursor', ['not a cursor', encode_cursor('0.5'), encode_cursor('rank', uuid.uuid4())])
+def test_invalid_cursor(cursor):
+    with pytest.raises(BadRequestException):
+        decode_cursor(cursor, Decimal, uuid.UUID)
@@ -0,0 +1,124 @@
+import datetime
+import threading
+import time
+import uuid
+
+import pytest
+import sqlalchemy as sa
+import sqlalchemy.sql.sqltypes as st  # Prevent class name overlap.
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+import techlock.compass.api.serializers as serializers
+import techlock.compass.models as models
+from techlock.compass.api import compile_schema
+
+
+def _model_names():
+    names = []
+    for name in dir(models):
+        if name.endswith('PageableSchema'):
+            names.append(name[:-len('PageableSchema')])
+
+    return sorted(names)
+
+
+def _sample_value(column: sa.Column, index: int):
+    column_type = column.type
+    if isinstance(column_type, st.Enum) and column_type.enum_class is not None:
+        members = list(column_type.enum_class)
+        return members[index % len(members)]
+    if isinstance(column_type, UUID):
+        return str(uuid.UUID(int=index + 1))
+    if isinstance(column_type, JSONB):
+        return {'key': f'value-{index}', 'list': [1, 2, 3]}
+    if isinstance(column_type, st.ARRAY):
+        item = f'item-{index}'
+        if column_type.dimensions == 2:
+            return [[item, item], [item]]
+        return [item, item]
+    if isinstance(column_type, st.Boolean):
+        return index % 2 == 0
+    if isinstance(column_type, st.Integer):
+        return index
+    if isinstance(column_type, st.Float):
+        return index + 0.5
+    if isinstance(column_type, st.DateTime):
+        return datetime.datetime(2021, 1, 2, 3, 4, 5, 6) + datetime.timedelta(days=index)
+    if isinstance(column_type, st.Date):
+        return datetime.date(2021, 1, 2) + datetime.timedelta(days=index)
+    if isinstance(column_type, st.String):
+        return f'{column.key}-{index}'
+
+    return None
+
+
+def _instance(model, index: int = 0, depth: int = 1):
+    obj = model()
+    for column in sa.inspect(model).columns:
+        if index % 3 == 2 and column.nullable and not column.primary_key:
+            # Leave some nullable columns empty.
+            continue
+        setattr(obj, column.key, _sample_value(column, index))
+
+    if depth > 0:
+        for relationship in sa.inspect(model).relationships:
+            related = relationship.mapper.class_
+            if relationship.uselist:
+                value = [_instance(related, index + i + 1, depth - 1) for i in range(2)]
+            else:
+                value = _instance(related, index + 1, depth - 1)
+            setattr(obj, relationship.key, value)
+
+    return obj
+
+
+@pytest.mark.parametrize('name', _model_names())
+def test_compiled_serializer_matches_marshmallow(name):
+    model = getattr(models, name)
+    schema = getattr(models, f'{name}Schema')()
+    objects = [_instance(model, index) for index in range(3)]
+
+    for obj in objects:
+        assert compile_schema(schema)(obj) == schema.dump(obj)
+
+    schema = getattr(models, f'{name}Schema')(many=True)
+    assert compile_schema(schema)(objects) == schema.dump(objects)
+
+
+@pytest.mark.parametrize('name', _model_names())
+def test_compiled_serializer_matches_marshmallow_with_field_selection(name):
+    schema_cls = getattr(models, f'{name}Schema')
+    model = getattr(models, name)
+    obj = _instance(model)
+
+    schema = schema_cls(only=('id', 'name', 'changed_on'))
+    assert compile_schema(schema)(obj) == schema.dump(obj)
+
+    schema = schema_cls(exclude=('tags', 'created_on'))
+    assert compile_schema(schema)(obj) == schema.dump(obj)
+
+
+def test_compiled_serializer_is_cached_per_field_selection():
+    assert compile_schema(models.EventSchema()) is compile_schema(models.EventSchema())
+    assert compile_schema(models.EventSchema(only=('id',))) is not compile_schema(models.EventSchema())
+
+
+def test_other_threads_wait_for_the_compiled_serializer(monkeypatch):
+    schema = models.EventSchema(only=('id', 'name', 'description'))
+    compiling, compiled = threading.Event(), []
+    compile = serializers._Compiler.compile
+
+    def slow_compile(self, schema):
+        compiling.set()
+        time.sleep(0.05)
+        return compile(self, schema)
+
+    monkeypatch.setattr(serializers._Compiler, 'compile', slow_compile)
+    thread = threading.Thread(target=lambda: compiled.append(compile_schema(schema)))
+    thread.start()
+    compiling.wait()
+
+    func = compile_schema(schema)
+    thread.join()
+
+    assert func is compiled[0]
@@ -0,0 +1,39 @@
+from datetime import date
+from types import SimpleNamespace
+
+from techlock.compass.services import sweeper
+
+
+class FakeConnection:
+    def __init__(self, rowcount: int):
+        self.rowcount = rowcount
+        self.executed = []
+
+    def execute(self, statement, params):
+        self.executed.append((str(statement), params))
+        return SimpleNamespace(rowcount=self.rowcount)
+
+
+def test_rewind_waits_for_the_tenants_sweep():
+    connection = FakeConnection(rowcount=2)
+
+    assert sweeper.rewind_period_marks(connection, 'tenant', date(2026, 2, 15)) == 2
+
+    (lock, lock_params), (rewind, params) = connection.executed
+    assert 'pg_advisory_xact_lock' in lock
+    assert lock_params == {'tenant_id': 'tenant'}
+    assert 'SET high_water_mark = CAST(:end_date AS date) - 1' in rewind
+    assert 'high_water_mark >= :end_date' in rewind
+    assert params['sweeps'] == ['compliance_period_overdue', 'compliance_period_due_soon']
+    assert params['end_date'] == date(2026, 2, 15)
+
+
+def test_period_sweeps_are_named_like_their_marks():
+    names = [kind.name for kind in sweeper.SWEEPS if kind.statement == sweeper._PERIOD_EVENTS]
+
+    assert names == list(sweeper._PERIOD_SWEEPS)
+
+
+def test_periods_are_flagged_once_per_due_date():
+    assert "event.tags ->> 'due_date' = to_char(period.end_date, 'YYYY-MM-DD')" in sweeper._PERIOD_EVENTS
+    assert 'INSERT INTO events' in sweeper._PERIOD_EVENTS